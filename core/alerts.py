@@ -0,0 +1,139 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from .broker import publish_notification
+from .models import Budget, Debt, Goal, Notification
+from .versioning import bump_user_versions
+
+BUDGET_ALERT_RATIO = Decimal("0.80")
+DEBT_DUE_DAYS = 3
+# A goal is behind once its saved share trails the share of its time already elapsed by this much.
+GOAL_BEHIND_MARGIN = Decimal("0.10")
+ALERT_CHUNK_SIZE = 5000
+
+
+def budget_candidates(queryset, today):
+    return queryset.filter(
+        allocated_amount__gt=0,
+        spent_amount__gte=F("allocated_amount") * BUDGET_ALERT_RATIO,
+        start_date__lte=today,
+        end_date__gte=today,
+    ).values("id", "user_id", "category__name", "allocated_amount", "spent_amount")
+
+
+def budget_alert(row, today):
+    percent = int(row["spent_amount"] * 100 / row["allocated_amount"])
+    return Notification(
+        user_id=row["user_id"],
+        alert_key=f"budget:{row['id']}:spent-{int(BUDGET_ALERT_RATIO * 100)}",
+        message=f"You have spent {percent}% of your {row['category__name']} budget.",
+    )
+
+
+def debt_candidates(queryset, today):
+    return queryset.filter(
+        due_date__gte=today,
+        due_date__lte=today + timedelta(days=DEBT_DUE_DAYS),
+        amount__gt=F("paid_amount"),
+    ).values("id", "user_id", "creditor_name", "amount", "paid_amount", "due_date")
+
+
+def debt_alert(row, today):
+    return Notification(
+        user_id=row["user_id"],
+        alert_key=f"debt:{row['id']}:due-{row['due_date']}",
+        message=f"Your payment of ${row['amount'] - row['paid_amount']} to {row['creditor_name']} is due on {row['due_date']}.",
+    )
+
+
+def goal_candidates(queryset, today):
+    return queryset.filter(
+        target_amount__gt=0,
+        current_savings__lt=F("target_amount"),
+        due_date__gt=today,
+    ).values("id", "user_id", "name", "target_amount", "current_savings", "created_at", "due_date")
+
+
+def goal_alert(row, today):
+    start = timezone.localdate(row["created_at"])
+    if start >= today:
+        return None
+    elapsed = Decimal((today - start).days) / Decimal((row["due_date"] - start).days)
+    if row["current_savings"] / row["target_amount"] >= elapsed - GOAL_BEHIND_MARGIN:
+        return None
+    return Notification(
+        user_id=row["user_id"],
+        alert_key=f"goal:{row['id']}:behind-{row['due_date']}",
+        message=f"Your goal {row['name']} is behind schedule: ${row['current_savings']} of ${row['target_amount']} saved.",
+    )
+
+
+# Rule name -> (model, filter narrowing a queryset to rows that may alert, builder of the notification)
+ALERT_RULES = {
+    "budget": (Budget, budget_candidates, budget_alert),
+    "debt": (Debt, debt_candidates, debt_alert),
+    "goal": (Goal, goal_candidates, goal_alert),
+}
+
+
+def publish_notifications(notifications):
+    for notification in notifications:
+        publish_notification(notification)
+
+
+def send_alerts(notifications):
+    """
+    Insert the notifications whose alert_key has not been sent yet and publish them
+    once the transaction commits. Returns the notifications created.
+    """
+    keys = [notification.alert_key for notification in notifications]
+    sent = set(Notification.objects.filter(alert_key__in=keys).values_list("alert_key", flat=True))
+    new = [notification for notification in notifications if notification.alert_key not in sent]
+    if not new:
+        return []
+    try:
+        with transaction.atomic():
+            created = Notification.objects.bulk_create(new)
+    except IntegrityError:
+        # Another writer raised some of the same alerts since the check above.
+        return send_alerts(new)
+    # bulk_create() skips the signals that publish and version single saves.
+    bump_user_versions({notification.user_id for notification in created}, "notifications")
+    transaction.on_commit(lambda: publish_notifications(created))
+    return created
+
+
+def evaluate_rule(name, queryset=None, today=None, chunk_size=ALERT_CHUNK_SIZE):
+    """
+    Raise the alerts of one rule for every row of `queryset` (all rows by default).
+
+    Each chunk of candidates is one filtered query in id order, and its alerts are
+    checked and inserted in two more, so a sweep costs a few queries per chunk of
+    alerting rows rather than a few per user.
+    """
+    model, candidates, build = ALERT_RULES[name]
+    today = today or timezone.localdate()
+    queryset = model.objects.all() if queryset is None else queryset
+    created = 0
+    last_id = 0
+    while True:
+        rows = list(candidates(queryset.filter(id__gt=last_id), today).order_by("id")[:chunk_size])
+        alerts = [alert for alert in (build(row, today) for row in rows) if alert is not None]
+        if alerts:
+            created += len(send_alerts(alerts))
+        if len(rows) < chunk_size:
+            return created
+        last_id = rows[-1]["id"]
+
+
+def evaluate_alerts(today=None, chunk_size=ALERT_CHUNK_SIZE):
+    """The periodic sweep: every rule over every row. Returns {rule: notifications created}."""
+    return {name: evaluate_rule(name, today=today, chunk_size=chunk_size) for name in ALERT_RULES}
+
+
+def evaluate_budget_alerts(budget_ids, today=None):
+    """Alerts of the budgets a write just touched."""
+    if budget_ids:
+        evaluate_rule("budget", Budget.objects.filter(pk__in=budget_ids), today)
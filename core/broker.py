@@ -0,0 +1,105 @@
+import asyncio
+import json
+import threading
+from contextlib import asynccontextmanager
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def notification_channel(user_id):
+    return f"notifications:{user_id}"
+
+
+def deliver(queue, message):
+    # A subscriber that stopped reading loses its oldest messages rather than growing without bound.
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(message)
+
+
+class LocalBroker:
+    """
+    In-process publish/subscribe. Subscribers are asyncio queues on the event loop that
+    created them; publish() may be called from any thread and only schedules a put on
+    each subscriber's loop, so an idle subscriber costs one queue and a set entry.
+    """
+
+    def __init__(self, **options):
+        self.lock = threading.Lock()
+        self.subscribers = {}
+
+    def publish(self, channel, message):
+        self.fan_out(channel, message)
+
+    def fan_out(self, channel, message):
+        with self.lock:
+            targets = list(self.subscribers.get(channel, ()))
+        for loop, queue in targets:
+            try:
+                loop.call_soon_threadsafe(deliver, queue, message)
+            except RuntimeError:  # the subscriber's loop has shut down
+                pass
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE))
+        with self.lock:
+            self.subscribers.setdefault(channel, set()).add(subscriber)
+        try:
+            yield subscriber[1]
+        finally:
+            with self.lock:
+                channel_subscribers = self.subscribers.get(channel)
+                channel_subscribers.discard(subscriber)
+                if not channel_subscribers:
+                    del self.subscribers[channel]
+
+
+class RedisBroker(LocalBroker):
+    """
+    Publishes through Redis so every process sees every message. Each process keeps a
+    single pattern subscription on a background thread and fans messages out to its
+    own subscribers locally, so connections do not each hold a Redis connection.
+    """
+
+    def __init__(self, url="redis://localhost:6379/0", pattern="notifications:*", **options):
+        super().__init__()
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured("RedisBroker requires the redis package.")
+        self.client = redis.Redis.from_url(url)
+        self.pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self.pubsub.psubscribe(**{pattern: self.handle_message})
+        self.thread = self.pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def handle_message(self, item):
+        channel = item["channel"].decode() if isinstance(item["channel"], bytes) else item["channel"]
+        self.fan_out(channel, json.loads(item["data"]))
+
+    def publish(self, channel, message):
+        self.client.publish(channel, json.dumps(message))
+
+
+def get_broker():
+    """The process-wide broker configured by NOTIFICATION_BROKER and NOTIFICATION_BROKER_OPTIONS."""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            broker_class = import_string(getattr(settings, "NOTIFICATION_BROKER", "core.broker.LocalBroker"))
+            _broker = broker_class(**getattr(settings, "NOTIFICATION_BROKER_OPTIONS", {}))
+        return _broker
+
+
+def notification_payload(notification):
+    return {"id": notification.id, "message": notification.message, "created_at": notification.created_at.isoformat()}
+
+
+def publish_notification(notification):
+    get_broker().publish(notification_channel(notification.user_id), notification_payload(notification))
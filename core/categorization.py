@@ -0,0 +1,220 @@
+import re
+import threading
+from collections import OrderedDict, deque
+from .models import Budget, CategorizationRule, Expense
+from .versioning import get_versions
+
+try:  # Python 3.11+
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:
+    import sre_constants, sre_parse
+
+MATCHER_CACHE_SIZE = 1024
+# Patterns run against every description on the request path. At each position a match
+# may retry every combination of the pattern's repeats, optional parts and alternatives,
+# so their product is capped, with an unbounded repeat (*, + or {n,}) counting one choice
+# per character of the longest description; one such repeat is allowed.
+MAX_REGEX_REPEATS = 1
+MAX_REGEX_CHOICES = 2048
+DESCRIPTION_LENGTH = Expense._meta.get_field("description").max_length
+REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, getattr(sre_constants, "POSSESSIVE_REPEAT", None)}
+
+_matchers = OrderedDict()
+_matchers_lock = threading.Lock()
+
+
+class Automaton:
+    """
+    Aho-Corasick automaton over a set of substrings. search() reports the values of
+    every substring found in one pass over the text, however many substrings there are.
+    """
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+        for word, value in patterns:
+            node = 0
+            for char in word:
+                child = self.goto[node].get(char)
+                if child is None:
+                    child = len(self.goto)
+                    self.goto[node][char] = child
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                node = child
+            self.output[node] += (value,)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(char, 0)
+                self.output[child] += self.output[self.fail[child]]
+
+    def search(self, text):
+        goto, fail, output = self.goto, self.fail, self.output
+        found = set()
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                found.update(output[node])
+        return found
+
+
+def check_regex(pattern):
+    """
+    Raise ValueError unless `pattern` compiles and cannot backtrack catastrophically:
+    no lookarounds, backreferences, nested repeats or alternation inside a repeat, at
+    most MAX_REGEX_REPEATS unbounded repeats and at most MAX_REGEX_CHOICES combinations
+    of optional parts, bounded repeats and alternatives.
+    """
+    try:
+        tree = sre_parse.parse(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid regular expression: {e}")
+    unbounded = 0
+    choices = 1
+
+    def walk(items, repeated):
+        nonlocal unbounded, choices
+        for op, av in items:
+            if op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+                raise ValueError("Lookarounds are not supported.")
+            if op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS):
+                raise ValueError("Backreferences are not supported.")
+            if op in REPEATS:
+                low, high, body = av
+                if high > low:
+                    if repeated:
+                        raise ValueError("Nested repeats such as (a+)+ or (ab?)* are not supported.")
+                    unbounded += high == sre_constants.MAXREPEAT
+                    choices *= min(high, DESCRIPTION_LENGTH) - min(low, DESCRIPTION_LENGTH) + 1
+                walk(body, repeated or high > 1)
+            elif op is sre_constants.BRANCH:
+                if repeated:
+                    raise ValueError("Alternation inside a repeat such as (a|ab)* is not supported.")
+                choices *= len(av[1])
+                for branch in av[1]:
+                    walk(branch, repeated)
+            elif op is sre_constants.SUBPATTERN:
+                walk(av[-1], repeated)
+            elif op is getattr(sre_constants, "ATOMIC_GROUP", None):
+                walk(av, repeated)
+
+    walk(tree, False)
+    if unbounded > MAX_REGEX_REPEATS:
+        raise ValueError(f"At most {MAX_REGEX_REPEATS} unbounded repeat (*, + or {{n,}}) is allowed.")
+    if choices > MAX_REGEX_CHOICES:
+        raise ValueError("Too many repeats, optional parts or alternatives; the pattern could take too long to match.")
+
+
+def safe_regex(pattern):
+    try:
+        check_regex(pattern)
+    except ValueError:
+        return False
+    return True
+
+
+class RuleMatcher:
+    """A user's categorization rules compiled for matching many descriptions."""
+
+    def __init__(self, rules):
+        # Rules arrive in priority order, so a rule's index is its rank.
+        self.rules = rules
+        self.category_ids = {rule["category_id"] for rule in rules}
+        self.always = {rank for rank, rule in enumerate(rules) if rule["match_type"] == CategorizationRule.CONTAINS and not rule["pattern"]}
+        self.automaton = Automaton(
+            (rule["pattern"].casefold(), rank) for rank, rule in enumerate(rules)
+            if rule["match_type"] == CategorizationRule.CONTAINS and rule["pattern"]
+        )
+        # Rules saved before their pattern was checked never match rather than failing every lookup.
+        patterns = [
+            (rank, rule["pattern"]) for rank, rule in enumerate(rules)
+            if rule["match_type"] == CategorizationRule.REGEX and safe_regex(rule["pattern"])
+        ]
+        self.regexes = [(rank, re.compile(pattern, re.IGNORECASE)) for rank, pattern in patterns]
+        # One combined search rules out most descriptions before any regex is tried alone.
+        try:
+            self.regex_gate = re.compile("|".join(f"(?:{pattern})" for _, pattern in patterns), re.IGNORECASE)
+        except re.error:  # e.g. repeated group names across patterns
+            self.regex_gate = None
+
+    def match(self, description, amount):
+        """The category of the highest-priority rule matching the description and amount, or None."""
+        description = description[:DESCRIPTION_LENGTH]  # the length check_regex budgets for
+        ranks = self.automaton.search(description.casefold()) | self.always
+        if self.regexes and (self.regex_gate is None or self.regex_gate.search(description)):
+            ranks.update(rank for rank, regex in self.regexes if regex.search(description))
+        for rank in sorted(ranks):
+            rule = self.rules[rank]
+            if rule["min_amount"] is not None and amount < rule["min_amount"]:
+                continue
+            if rule["max_amount"] is not None and amount > rule["max_amount"]:
+                continue
+            return rule["category_id"]
+        return None
+
+
+def get_matcher(user_id):
+    """
+    The user's compiled rules, rebuilt only after a rule changes.
+
+    Matchers are kept per process and checked against the user's "rules" version
+    (see core.versioning), which every rule save and delete bumps.
+    """
+    version, = get_versions(user_id, ["rules"])
+    with _matchers_lock:
+        cached = _matchers.get(user_id)
+        if cached is not None and cached[0] == version:
+            _matchers.move_to_end(user_id)
+            return cached[1]
+    rules = list(
+        CategorizationRule.objects.filter(user_id=user_id).order_by("priority", "id")
+        .values("category_id", "match_type", "pattern", "min_amount", "max_amount")
+    )
+    matcher = RuleMatcher(rules)
+    with _matchers_lock:
+        _matchers[user_id] = (version, matcher)
+        _matchers.move_to_end(user_id)
+        while len(_matchers) > MATCHER_CACHE_SIZE:
+            _matchers.popitem(last=False)
+    return matcher
+
+
+class BudgetResolver:
+    """Picks the budget an expense belongs to from the owner's categorization rules."""
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.matcher = get_matcher(user_id)
+        self._budgets = None
+
+    def budgets(self):
+        # Loaded once, on the first match, for every category a rule can choose.
+        if self._budgets is None:
+            self._budgets = {}
+            queryset = Budget.objects.filter(user_id=self.user_id, category_id__in=self.matcher.category_ids)
+            for budget in queryset.select_related("category").order_by("-start_date", "-id"):
+                self._budgets.setdefault(budget.category_id, []).append(budget)
+        return self._budgets
+
+    def resolve(self, description, amount, day):
+        """The budget of the matching category covering `day`, else its latest one, else None."""
+        category_id = self.matcher.match(description, amount)
+        if category_id is None:
+            return None
+        budgets = self.budgets().get(category_id, ())
+        for budget in budgets:
+            if budget.start_date <= day <= budget.end_date:
+                return budget
+        return budgets[0] if budgets else None
@@ -0,0 +1,109 @@
+from decimal import Decimal
+from functools import lru_cache
+from itertools import islice
+import numpy as np
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from .models import ExchangeRate
+from .versioning import bump_versions, get_versions
+
+# Currencies whose rate history is kept in memory per process.
+RATE_CACHE_SIZE = 64
+LOAD_BATCH_SIZE = 1000
+
+
+class ExchangeRateError(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Exchange rates are not available."
+    default_code = "exchange_rate_unavailable"
+
+
+def base_currency():
+    return getattr(settings, "BASE_CURRENCY", "USD")
+
+
+def user_currency(user):
+    """The currency the user's summaries are shown in."""
+    return (user.currency_preference or base_currency()).upper()
+
+
+def rates_version():
+    version, = get_versions(None, ["exchange-rates"])
+    return version
+
+
+@lru_cache(maxsize=RATE_CACHE_SIZE)
+def _rate_series(currency, version):
+    # `version` only keys the cache: loading rates bumps it, so stale series are never hit again.
+    rows = ExchangeRate.objects.filter(currency=currency).order_by("date").values_list("date", "rate")
+    days, rates = zip(*rows) if rows else ((), ())
+    return np.array(days, dtype="datetime64[D]"), np.array(rates, dtype=float)
+
+
+def rates_on(currency, days):
+    """Units of `currency` per unit of the base currency on each of `days` (datetime64[D])."""
+    if currency == base_currency():
+        return np.ones(len(days))
+    dates, rates = _rate_series(currency, rates_version())
+    if not len(dates):
+        raise ExchangeRateError(f"No exchange rates loaded for {currency}.")
+    # The latest rate on or before each day; days before the first rate use the first.
+    index = np.searchsorted(dates, days, side="right") - 1
+    return rates[np.maximum(index, 0)]
+
+
+def conversion_factors(currencies, days, target):
+    """
+    What one unit of each row's currency is worth in `target` on the row's day.
+
+    The rates of every row are looked up at once per currency with a binary search over
+    its rate history, so the cost is one pass per currency rather than one per row.
+    """
+    currencies = np.array(currencies, dtype=object)
+    days = np.array(days, dtype="datetime64[D]")
+    factors = np.ones(len(currencies))
+    for currency in set(currencies) - {target}:
+        mask = currencies == currency
+        factors[mask] = rates_on(target, days[mask]) / rates_on(currency, days[mask])
+    return factors
+
+
+def convert(amounts, currencies, days, target):
+    """
+    Amounts in `target`, each converted at the rate of its day (see conversion_factors).
+    Amounts already in `target` are returned exactly.
+    """
+    result = list(amounts)
+    currencies = np.array(currencies, dtype=object)
+    foreign = np.flatnonzero(currencies != target)
+    if not len(foreign):
+        return result
+    factors = conversion_factors(currencies[foreign], np.array(days, dtype="datetime64[D]")[foreign], target)
+    values = np.array([float(amounts[index]) for index in foreign]) * factors
+    for index, value in zip(foreign, values):
+        result[index] = Decimal(f"{value:.2f}")
+    return result
+
+
+def convert_totals(totals, day, target):
+    """Sum {currency: amount} in `target` at the rates of `day`."""
+    currencies = list(totals)
+    converted = convert([totals[currency] for currency in currencies], currencies, [day] * len(currencies), target)
+    return sum(converted, Decimal("0.00"))
+
+
+def load_rates(rows):
+    """Insert or update (date, currency, rate) rows. Returns the number of rows written."""
+    written = 0
+    iterator = iter(rows)
+    while batch := list(islice(iterator, LOAD_BATCH_SIZE)):
+        # A row may not be upserted twice in one statement; the last rate given wins.
+        batch = {(currency, day): rate for day, currency, rate in batch}
+        ExchangeRate.objects.bulk_create(
+            [ExchangeRate(date=day, currency=currency, rate=rate) for (currency, day), rate in batch.items()],
+            update_conflicts=True, unique_fields=["currency", "date"], update_fields=["rate"],
+        )
+        written += len(batch)
+    bump_versions(None, "exchange-rates")
+    return written
@@ -0,0 +1,123 @@
+import csv
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+from asgiref.sync import sync_to_async
+from django.db import connection, transaction
+from .models import Goal, Budget, Income, Expense, Debt
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "columnar": ("application/x-ndjson", "columnar.jsonl"),
+}
+# Parts an async export pulls from its generator per trip to the sync thread.
+ASYNC_BATCH_SIZE = 256
+
+# (table name, model, lookup that scopes rows to the user)
+EXPORT_TABLES = [
+    ("income", Income, "user"),
+    ("expense", Expense, "budget__user"),
+    ("budget", Budget, "user"),
+    ("goal", Goal, "user"),
+    ("debt", Debt, "user"),
+]
+
+
+def plain(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def export_columns(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def snapshot_rows(user, chunk_size):
+    """
+    Yield (table, columns, row) for every exportable row of the user.
+
+    All tables are read inside one transaction; on PostgreSQL it is REPEATABLE READ so
+    every table sees the same snapshot, and rows are pulled through server-side cursors
+    `chunk_size` at a time. Called inside an outer transaction, the export reads in that
+    transaction as it is, since its isolation level can no longer be changed.
+    """
+    nested = connection.in_atomic_block
+    with transaction.atomic():
+        if connection.vendor == "postgresql" and not nested:
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+        for table, model, user_lookup in EXPORT_TABLES:
+            columns = export_columns(model)
+            rows = model.objects.filter(**{user_lookup: user}).order_by("pk").values_list(*columns)
+            for row in rows.iterator(chunk_size=chunk_size):
+                yield table, columns, row
+
+
+def export_csv(user, chunk_size=2000):
+    writer = csv.writer(Echo())
+    current = None
+    for table, columns, row in snapshot_rows(user, chunk_size):
+        if table != current:
+            current = table
+            yield writer.writerow(["table", *columns])
+        yield writer.writerow([table, *(plain(value) for value in row)])
+
+
+def export_jsonl(user, chunk_size=2000):
+    for table, columns, row in snapshot_rows(user, chunk_size):
+        record = {"table": table}
+        record.update(zip(columns, map(plain, row)))
+        yield json.dumps(record) + "\n"
+
+
+def export_columnar(user, chunk_size=2000):
+    """One line per row group: {"table", "rows", "columns": {name: [values...]}}, like a Parquet row group."""
+    group = []
+    group_table = group_columns = None
+
+    def flush():
+        columns = {name: [plain(row[i]) for row in group] for i, name in enumerate(group_columns)}
+        return json.dumps({"table": group_table, "rows": len(group), "columns": columns}) + "\n"
+
+    for table, columns, row in snapshot_rows(user, chunk_size):
+        if group and (table != group_table or len(group) >= chunk_size):
+            yield flush()
+            group = []
+        group_table, group_columns = table, columns
+        group.append(row)
+    if group:
+        yield flush()
+
+
+async def stream_async(parts, batch_size=ASYNC_BATCH_SIZE):
+    """
+    Yield the parts of an export generator to an async server as they are produced.
+
+    Every step runs through sync_to_async in the request's thread-sensitive thread, so
+    the snapshot transaction and its server-side cursors stay on the connection that
+    opened them; that includes closing the generator when the client goes away.
+    """
+    pull = sync_to_async(lambda: list(islice(parts, batch_size)))
+    try:
+        while batch := await pull():
+            for part in batch:
+                yield part
+    finally:
+        await sync_to_async(parts.close)()
+
+
+EXPORTERS = {
+    "csv": export_csv,
+    "jsonl": export_jsonl,
+    "columnar": export_columnar,
+}
@@ -0,0 +1,167 @@
+"""
+Serialization of values() rows without model instances or per-field to_representation().
+
+Each serializer field is compiled once into a values() lookup and a formatter whose
+output matches what the field itself would produce, so responses stay byte-identical.
+Serializers with fields that have no such equivalent keep the regular path.
+"""
+from decimal import Decimal
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+ISO_8601 = "iso-8601"
+
+
+def fast_serialization_enabled():
+    return getattr(settings, "FAST_SERIALIZATION", False)
+
+
+def identity(value):
+    return value
+
+
+def big_integer_formatter(field):
+    return str if getattr(field, "coerce_to_string", api_settings.COERCE_BIGINT_TO_STRING) else int
+
+
+def decimal_formatter(field):
+    coerce_to_string = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if field.decimal_places is None or not coerce_to_string or field.localize or field.normalize_output:
+        return field.to_representation
+    exponent = -field.decimal_places
+    max_digits = field.max_digits or float("inf")
+    slow = field.to_representation
+
+    def format_decimal(value):
+        # Column values already carry the field's scale, so quantizing would not change them.
+        if isinstance(value, Decimal):
+            sign, digits, value_exponent = value.as_tuple()
+            if value_exponent == exponent and len(digits) <= max_digits:
+                return f"{value:f}"
+        return slow(value)
+
+    return format_decimal
+
+
+def date_formatter(field):
+    if getattr(field, "format", api_settings.DATE_FORMAT) != ISO_8601:
+        return field.to_representation
+    return lambda value: value.isoformat()
+
+
+def datetime_formatter(field):
+    if getattr(field, "format", api_settings.DATETIME_FORMAT) != ISO_8601:
+        return field.to_representation
+    # Looked up once per response rather than per value as enforce_timezone() does.
+    field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if field_timezone is None:
+        return field.to_representation
+
+    def format_datetime(value):
+        if value.utcoffset() is None:
+            return field.to_representation(value)
+        try:
+            value = value.astimezone(field_timezone).isoformat()
+        except OverflowError:
+            return field.to_representation(value)
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+    return format_datetime
+
+
+def primary_key_formatter(field):
+    return identity  # the foreign key column already holds the pk
+
+
+def choice_formatter(field):
+    choices = field.choice_strings_to_values
+    return lambda value: choices.get(str(value), value) if value != "" else value
+
+
+# Field class -> factory of the field's formatter. Exact classes only: a subclass may
+# override to_representation().
+FORMATTERS = {
+    serializers.IntegerField: lambda field: int,
+    serializers.BigIntegerField: big_integer_formatter,
+    serializers.BooleanField: lambda field: identity,
+    serializers.CharField: lambda field: str,
+    serializers.ChoiceField: choice_formatter,
+    serializers.DecimalField: decimal_formatter,
+    serializers.DateField: date_formatter,
+    serializers.DateTimeField: datetime_formatter,
+}
+
+
+def field_lookup(model, source):
+    """The values() lookup reading `source` (a dotted attribute path), or None if it is not a column."""
+    parts = source.split(".")
+    current = model
+    for index, part in enumerate(parts):
+        try:
+            model_field = current._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+        if model_field.is_relation and index < len(parts) - 1:
+            current = model_field.related_model
+            continue
+        if index < len(parts) - 1:
+            return None
+        return "__".join(parts)
+    return None
+
+
+def compile_fields(serializer_class):
+    """
+    [(name, lookups, function, field, formatter factory)] for every readable field of the
+    serializer, or None if one of them cannot be read from values() rows.
+
+    Fields backed by model properties are listed in Meta.computed_fields as
+    {name: ((lookups...), function)}; the function receives the looked up values.
+    """
+    model = serializer_class.Meta.model
+    computed = getattr(serializer_class.Meta, "computed_fields", {})
+    compiled = []
+    for name, field in serializer_class().fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            if field.pk_field is not None:
+                return None
+            factory = primary_key_formatter
+        elif type(field) in FORMATTERS:
+            factory = FORMATTERS[type(field)]
+        else:
+            return None
+        if name in computed:
+            lookups, function = computed[name]
+            compiled.append((name, tuple(lookups), function, field, factory))
+            continue
+        lookup = field_lookup(model, field.source)
+        if lookup is None:
+            return None
+        compiled.append((name, (lookup,), None, field, factory))
+    return compiled
+
+
+def row_lookups(compiled):
+    """The values() lookups serialize_rows() reads."""
+    return list(dict.fromkeys(lookup for _, lookups, _, _, _ in compiled for lookup in lookups))
+
+
+def serialize_rows(compiled, rows):
+    """The serializer's `many=True` data for values() rows, as plain dicts in field order."""
+    # Formatters are built per call so they see the active timezone.
+    extractors = [(name, lookups, function, factory(field)) for name, lookups, function, field, factory in compiled]
+    data = []
+    for row in rows:
+        item = {}
+        for name, lookups, function, formatter in extractors:
+            value = row[lookups[0]] if function is None else function(*(row[lookup] for lookup in lookups))
+            # Like Serializer.to_representation(), None is passed through unformatted.
+            item[name] = None if value is None else formatter(value)
+        data.append(item)
+    return data
@@ -0,0 +1,138 @@
+from datetime import date
+import numpy as np
+from django.db.models import IntegerField, Sum, Value
+from .currency import base_currency, conversion_factors
+from .models import Goal, Income, Expense, Debt
+from .recurrence import add_months
+
+MAX_FORECAST_MONTHS = 60
+
+
+def signed_union(columns, income_query, expense_query):
+    incomes = income_query.annotate(sign=Value(1, output_field=IntegerField())).values_list(*columns)
+    expenses = expense_query.annotate(sign=Value(-1, output_field=IntegerField())).values_list(*columns)
+    return list(incomes.union(expenses, all=True))
+
+
+def load_history(user_id, currency):
+    """
+    The user's net cash flow per day in `currency` as columnar arrays.
+
+    Incomes and expenses are summed per date and currency in the database and fetched in
+    one UNION query, so the arrays hold one entry per active day rather than one per
+    transaction. Each day converts at its own rate, like the summaries.
+    """
+    incomes = Income.objects.filter(user_id=user_id).order_by().values("date", "currency")
+    expenses = Expense.objects.filter(budget__user_id=user_id).order_by().values("date", "currency")
+    rows = signed_union(
+        ("date", "currency", "total", "sign"),
+        incomes.annotate(total=Sum("amount")),
+        expenses.annotate(total=Sum("amount")),
+    )
+    if not rows:
+        return np.array([], dtype="datetime64[D]"), np.array([], dtype=float)
+    day, currencies, total, sign = zip(*rows)
+    days = np.array(day, dtype="datetime64[D]")
+    factors = conversion_factors(currencies, days, currency)
+    return days, np.array(total, dtype=float) * np.array(sign, dtype=float) * factors
+
+
+def load_templates(user_id, currency, today):
+    """
+    Recurring incomes and expenses that still generate rows, with their watermarks.
+    Future occurrences are valued at today's rates.
+    """
+    rows = signed_union(
+        ("date", "amount", "currency", "sign", "materialized_through"),
+        Income.objects.filter(user_id=user_id, recurring=True, recurrence_parent__isnull=True),
+        Expense.objects.filter(budget__user_id=user_id, recurring=True, recurrence_parent__isnull=True),
+    )
+    if not rows:
+        empty_dates = np.array([], dtype="datetime64[D]")
+        return empty_dates, np.array([], dtype=float), empty_dates
+    day, amount, currencies, sign, through = zip(*rows)
+    watermarks = [value or anchor for value, anchor in zip(through, day)]
+    factors = conversion_factors(currencies, [today] * len(currencies), currency)
+    return (
+        np.array(day, dtype="datetime64[D]"),
+        np.array(amount, dtype=float) * np.array(sign, dtype=float) * factors,
+        np.array(watermarks, dtype="datetime64[D]"),
+    )
+
+
+def recurring_overlay(dates, amounts, watermarks, start, end):
+    """
+    Project each recurring template monthly on its day of month into [start, end].
+
+    Occurrences up to the template's watermark already exist as rows, so only dates
+    after it are added. Returns (dates, amounts) of the projected occurrences.
+    """
+    if not len(dates):
+        return dates, amounts
+    months = np.arange(start.astype("datetime64[M]"), end.astype("datetime64[M]") + 1)
+    days_in_month = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(int)
+    anchor_day = (dates - dates.astype("datetime64[M]").astype("datetime64[D]")).astype(int) + 1
+
+    day_of_month = np.minimum(anchor_day[:, None], days_in_month[None, :]) - 1
+    occurrences = months.astype("datetime64[D]")[None, :] + day_of_month
+    after = np.maximum(watermarks, start - 1)
+    mask = (occurrences > after[:, None]) & (occurrences <= end) & (occurrences > dates[:, None])
+    return occurrences[mask], np.broadcast_to(amounts[:, None], occurrences.shape)[mask]
+
+
+def day_buckets(dates, amounts, start, days):
+    offsets = (dates - start).astype(int)
+    keep = (offsets >= 0) & (offsets < days)
+    return np.bincount(offsets[keep], weights=amounts[keep], minlength=days).astype(float, copy=False)
+
+
+def forecast(user_id, months=12, today=None, currency=None):
+    """Daily balance and the balance left after goal savings, in `currency` (the base currency by default)."""
+    today = today or date.today()
+    currency = currency or base_currency()
+    end = np.datetime64(add_months(today, months), "D")
+    today = np.datetime64(today, "D")
+    start = today + 1
+    days = int((end - start).astype(int)) + 1
+
+    dates, amounts = load_history(user_id, currency)
+    starting_balance = float(amounts[dates <= today].sum())
+    flows = day_buckets(dates, amounts, start, days)
+
+    template_dates, template_amounts, watermarks = load_templates(user_id, currency, today)
+    overlay_dates, overlay_amounts = recurring_overlay(template_dates, template_amounts, watermarks, start, end)
+    flows += day_buckets(overlay_dates, overlay_amounts, start, days)
+
+    debts = list(Debt.objects.filter(user_id=user_id).values_list("due_date", "amount", "paid_amount", "currency"))
+    if debts:
+        due, amount, paid, currencies = (np.array(column) for column in zip(*debts))
+        remaining = (amount.astype(float) - paid.astype(float)) * conversion_factors(currencies, [today] * len(debts), currency)
+        due = np.maximum(due.astype("datetime64[D]"), start)  # overdue debts fall on the first day
+        flows += day_buckets(due, -np.clip(remaining, 0, None), start, days)
+    balance = starting_balance + np.cumsum(flows)
+
+    reserved = np.zeros(days)
+    goals = list(Goal.objects.filter(user_id=user_id).values_list("due_date", "target_amount", "current_savings", "currency"))
+    if goals:
+        due, target, saved, currencies = (np.array(column) for column in zip(*goals))
+        factors = conversion_factors(currencies, [today] * len(goals), currency)
+        remaining = np.clip(target.astype(float) - saved.astype(float), 0, None) * factors
+        last_day = np.clip((due.astype("datetime64[D]") - start).astype(int), 0, days - 1)
+        # Each goal sets aside an equal share per day until its due date.
+        daily = remaining / (last_day + 1)
+        reserved_per_day = day_buckets(np.full(len(daily), start), daily, start, days)
+        reserved_per_day -= day_buckets(start + last_day + 1, daily, start, days)
+        reserved = np.cumsum(np.cumsum(reserved_per_day))
+    available = balance - reserved
+
+    lowest = int(np.argmin(available))
+    return {
+        "currency": currency,
+        "start_date": str(start),
+        "end_date": str(end),
+        "starting_balance": round(starting_balance, 2),
+        "balance": np.round(balance, 2).tolist(),
+        "available": np.round(available, 2).tolist(),
+        "lowest_available": round(float(available[lowest]), 2),
+        "lowest_available_date": str(start + lowest),
+    }
@@ -0,0 +1,147 @@
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+from .currency import base_currency, conversion_factors
+from .forecasting import signed_union
+from .models import Goal, Income, Expense
+from .recurrence import add_months
+
+HISTORY_MONTHS = 24
+DEFAULT_PATHS = 10_000
+MAX_PATHS = 100_000
+# Upper bound on normal draws held in memory at once while simulating a goal.
+BATCH_DRAWS = 1_000_000
+RESULT_TIMEOUT = 60 * 60
+PERCENTILES = (10, 50, 90)
+
+
+def monthly_net(user_id, today, currency=None):
+    """
+    Net income minus expenses for each completed month of the last HISTORY_MONTHS, in
+    `currency` (the base currency by default) at the rates of the first of each month.
+    """
+    current = today.replace(day=1)
+    since = add_months(current, -HISTORY_MONTHS)
+    incomes = Income.objects.filter(user_id=user_id, date__gte=since, date__lt=current)
+    expenses = Expense.objects.filter(budget__user_id=user_id, date__gte=since, date__lt=current)
+    rows = signed_union(
+        ("month", "currency", "total", "sign"),
+        incomes.order_by().annotate(month=TruncMonth("date")).values("month", "currency").annotate(total=Sum("amount")),
+        expenses.order_by().annotate(month=TruncMonth("date")).values("month", "currency").annotate(total=Sum("amount")),
+    )
+    if not rows:
+        return np.zeros(0)
+    month, currencies, total, sign = zip(*rows)
+    months = np.array(month, dtype="datetime64[M]")
+    factors = conversion_factors(currencies, months.astype("datetime64[D]"), currency or base_currency())
+    offsets = months - np.datetime64(since, "M")
+    net = np.bincount(offsets.astype(int), weights=np.array(total, dtype=float) * np.array(sign, dtype=float) * factors,
+                      minlength=HISTORY_MONTHS)
+    # Months before the first recorded one say nothing about volatility; later gaps are real zeros.
+    return net[np.flatnonzero(net)[0]:] if net.any() else net
+
+
+def months_between(today, due_date):
+    months = (due_date.year - today.year) * 12 + due_date.month - today.month
+    if due_date.day < today.day:
+        months -= 1
+    return max(months, 0)
+
+
+def simulate_goal(remaining, months, mean, std, paths, seed):
+    """
+    Fraction of `paths` random walks of monthly savings that reach `remaining` within
+    `months`, plus percentiles of the amount saved by the due date.
+    """
+    if remaining <= 0:
+        return 1.0, [0.0] * len(PERCENTILES)
+    if months == 0:
+        return 0.0, [0.0] * len(PERCENTILES)
+    rng = np.random.default_rng(seed)
+    batch = max(1, BATCH_DRAWS // months)
+    reached = 0
+    saved = np.empty(paths)
+    for start in range(0, paths, batch):
+        size = min(batch, paths - start)
+        savings = np.cumsum(rng.normal(mean, std, size=(size, months)), axis=1)
+        reached += int((savings.max(axis=1) >= remaining).sum())
+        saved[start:start + size] = savings[:, -1]
+    return reached / paths, np.percentile(saved, PERCENTILES).tolist()
+
+
+def run_simulations(jobs, workers):
+    if workers <= 1 or len(jobs) <= 1:
+        return [simulate_goal(*job) for job in jobs]
+    # NumPy releases the GIL while drawing and summing, so threads share the work without
+    # forking the web worker and its open database connections; the pool lives for one call.
+    with ThreadPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return list(pool.map(simulate_goal, *zip(*jobs)))
+
+
+def goal_probabilities(user_id, paths=DEFAULT_PATHS, today=None, currency=None):
+    """
+    Probability of reaching each goal by its due date.
+
+    Monthly savings are drawn from a normal distribution fitted to the user's recent
+    monthly net cash flow and shared between goals in proportion to what each still
+    needs, all in `currency` (the base currency by default). Results are cached under a
+    hash of every input, so they are recomputed exactly when the history, the goals,
+    the rates or the parameters change, and the RNG is seeded from the same hash so a
+    cached and a fresh answer agree.
+    """
+    today = today or date.today()
+    currency = currency or base_currency()
+    net = monthly_net(user_id, today, currency)
+    mean = float(net.mean()) if len(net) else 0.0
+    std = float(net.std(ddof=1)) if len(net) > 1 else 0.0
+    goals = list(
+        Goal.objects.filter(user_id=user_id).order_by("id")
+        .values_list("id", "name", "target_amount", "current_savings", "due_date", "currency")
+    )
+    factors = conversion_factors([goal[5] for goal in goals], [today] * len(goals), currency)
+    remaining = [
+        round(max(float(target - saved), 0.0) * factor, 2)
+        for (_, _, target, saved, _, _), factor in zip(goals, factors)
+    ]
+
+    inputs = json.dumps([round(mean, 2), round(std, 2), paths, today.isoformat(), currency, goals, remaining], default=str)
+    digest = hashlib.sha256(inputs.encode()).hexdigest()
+    key = f"goal-probability:{digest}"
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    outstanding = sum(remaining)
+    seeds = np.random.SeedSequence(int(digest[:16], 16)).spawn(len(goals))
+    jobs = []
+    for (goal_id, _, _, _, due_date, _), needed, seed in zip(goals, remaining, seeds):
+        share = needed / outstanding if outstanding else 0.0
+        jobs.append((needed, months_between(today, due_date), mean * share, std * share, paths, seed))
+    outcomes = run_simulations(jobs, getattr(settings, "GOAL_SIMULATION_WORKERS", 1))
+
+    result = {
+        "currency": currency,
+        "monthly_mean": round(mean, 2),
+        "monthly_std": round(std, 2),
+        "history_months": len(net),
+        "paths": paths,
+        "goals": [
+            {
+                "id": goal_id,
+                "name": name,
+                "remaining": round(needed, 2),
+                "months_left": job[1],
+                "probability": round(probability, 4),
+                "projected_savings": {f"p{pct}": round(value, 2) for pct, value in zip(PERCENTILES, projected)},
+            }
+            for (goal_id, name, *_), needed, job, (probability, projected) in zip(goals, remaining, jobs, outcomes)
+        ],
+    }
+    cache.set(key, result, RESULT_TIMEOUT)
+    return result
@@ -0,0 +1,271 @@
+import csv
+import re
+import time
+from collections import Counter, namedtuple
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from django.db import transaction
+from django.db.models import Max
+from .categorization import BudgetResolver
+from .currency import user_currency
+from .models import Income, Expense
+from .rollups import record_expense_rollups, record_income_rollups
+from .spending import expenses_created
+from .summaries import invalidate_spending_summary
+from .versioning import bump_versions
+
+Transaction = namedtuple("Transaction", ["date", "amount", "description", "external_id"])
+
+DATE_COLUMNS = ("date", "posted date", "transaction date", "posting date")
+DESCRIPTION_COLUMNS = ("description", "payee", "name", "memo", "details")
+AMOUNT_COLUMNS = ("amount", "transaction amount")
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y%m%d", "%m/%d/%y")
+OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+# Amounts must fit the amount column (expenses and incomes share its precision).
+_amount_field = Expense._meta.get_field("amount")
+AMOUNT_LIMIT = Decimal(10) ** (_amount_field.max_digits - _amount_field.decimal_places)
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(filename):
+    name = (filename or "").lower()
+    if name.endswith((".ofx", ".qfx")):
+        return "ofx"
+    return "csv"
+
+
+def _column(fieldnames, candidates):
+    lookup = {name.strip().lower(): name for name in fieldnames}
+    for candidate in candidates:
+        if candidate in lookup:
+            return lookup[candidate]
+    return None
+
+
+def parse_csv(lines):
+    """Yield (date, amount, description, external id) strings from a CSV statement, one row at a time."""
+    try:
+        yield from _parse_csv(lines)
+    except csv.Error as e:  # e.g. a field over csv.field_size_limit()
+        raise ImportFormatError(f"Malformed CSV: {e}")
+
+
+def _parse_csv(lines):
+    reader = csv.DictReader(lines)
+    if not reader.fieldnames:
+        return
+    date_column = _column(reader.fieldnames, DATE_COLUMNS)
+    description_column = _column(reader.fieldnames, DESCRIPTION_COLUMNS)
+    amount_column = _column(reader.fieldnames, AMOUNT_COLUMNS)
+    debit_column = _column(reader.fieldnames, ("debit", "withdrawal"))
+    credit_column = _column(reader.fieldnames, ("credit", "deposit"))
+    if not date_column or not (amount_column or debit_column or credit_column):
+        raise ImportFormatError("CSV needs a date column and an amount (or debit/credit) column.")
+
+    for row in reader:
+        if amount_column:
+            amount = row.get(amount_column)
+        elif (row.get(debit_column) or "").strip():
+            amount = "-" + row[debit_column].strip().lstrip("-")
+        else:
+            amount = row.get(credit_column)
+        description = row.get(description_column) if description_column else ""
+        yield row.get(date_column), amount, description, ""
+
+
+def parse_ofx(lines):
+    """Yield (date, amount, description, FITID) strings from the STMTTRN blocks of an OFX statement."""
+    current = None
+    for line in lines:
+        for closing, tag, value in OFX_TAG.findall(line):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if closing and current is not None:
+                    description = current.get("NAME") or current.get("MEMO") or ""
+                    yield current.get("DTPOSTED"), current.get("TRNAMT"), description, current.get("FITID", "")
+                    current = None
+                elif not closing:
+                    current = {}
+            elif current is not None and not closing:
+                current[tag] = value.strip()
+
+
+def parse_date(value):
+    value = (value or "").strip()
+    if len(value) > 8 and value[:8].isdigit():
+        value = value[:8]  # OFX timestamps such as 20250101120000[-5:EST]
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_amount(value):
+    value = (value or "").strip().replace(",", "").replace("$", "")
+    if value.startswith("(") and value.endswith(")"):
+        value = "-" + value[1:-1]
+    try:
+        amount = Decimal(value)
+        # NaN and infinity parse, but compare or quantize with an error later on.
+        if not amount.is_finite():
+            return None
+        amount = amount.quantize(Decimal("0.01"))
+    except InvalidOperation:
+        return None
+    return amount if abs(amount) < AMOUNT_LIMIT else None
+
+
+def normalize(rows, stats):
+    for raw_date, raw_amount, raw_description, external_id in rows:
+        stats["rows_read"] += 1
+        date = parse_date(raw_date)
+        amount = parse_amount(raw_amount)
+        if date is None or amount is None or amount == 0:
+            stats["skipped"] += 1
+            continue
+        description = " ".join((raw_description or "").split())[:255] or "Imported transaction"
+        yield Transaction(date, amount, description, external_id[:255])
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Deduplicator:
+    """
+    Drops the transactions of a statement that the user already has.
+
+    Transactions with a bank id (OFX FITID) are matched on it. Others are matched on
+    (date, amount, description), counting rather than just looking up: a statement may
+    hold identical transactions, such as two coffees on one day, so the n-th occurrence
+    is a duplicate only while the user had at least n such rows before the import began.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        # Rows stored from here on belong to this import and are not counted.
+        self.last_expense_id = Expense.objects.aggregate(last=Max("id"))["last"] or 0
+        self.last_income_id = Income.objects.aggregate(last=Max("id"))["last"] or 0
+        # Occurrences seen so far of the keys the user already had rows for.
+        self.occurrences = Counter()
+
+    def stored(self, batch):
+        """Bank ids the user has, and counts of their rows from before the import by key."""
+        external_ids = {item.external_id for item in batch if item.external_id}
+        expenses = Expense.objects.filter(budget__user=self.user)
+        incomes = Income.objects.filter(user=self.user)
+        known = set()
+        if external_ids:
+            known.update(expenses.filter(external_id__in=external_ids).values_list("external_id", flat=True))
+            known.update(incomes.filter(external_id__in=external_ids).values_list("external_id", flat=True))
+
+        dates = (min(item.date for item in batch), max(item.date for item in batch))
+        rows = Counter()
+        without_id = Counter()  # rows a bank id cannot match, e.g. from CSV statements
+        stored = [
+            *(((date, -amount, description), external_id) for date, amount, description, external_id in (
+                expenses.filter(date__range=dates, id__lte=self.last_expense_id)
+                .values_list("date", "amount", "description", "external_id")
+            )),
+            *(((date, amount, description), external_id) for date, amount, description, external_id in (
+                incomes.filter(date__range=dates, id__lte=self.last_income_id)
+                .values_list("date", "amount", "description", "external_id")
+            )),
+        ]
+        for key, external_id in stored:
+            rows[key] += 1
+            if not external_id:
+                without_id[key] += 1
+        return known, rows, without_id
+
+    def __call__(self, batch):
+        known, rows, without_id = self.stored(batch)
+        for item in batch:
+            key = (item.date, item.amount, item.description)
+            if item.external_id:
+                if item.external_id in known:
+                    continue
+                known.add(item.external_id)
+                # Rows stored with a bank id would have matched on it above.
+                limit = without_id[key]
+            else:
+                limit = rows[key]
+            if limit:
+                self.occurrences[key] += 1
+                if self.occurrences[key] <= limit:
+                    continue
+            yield item
+
+
+def categorize(items, resolver, budget, stats):
+    """Expenses for the debits among `items`, on the budget their rules pick or else on `budget`."""
+    for item in items:
+        if item.amount > 0:
+            continue
+        target = resolver.resolve(item.description, -item.amount, item.date)
+        if target is not None:
+            stats["categorized"] += 1
+        elif budget is not None:
+            target = budget
+        else:
+            stats["uncategorized"] += 1
+            continue
+        yield Expense(
+            budget=target, date=item.date, amount=-item.amount, currency=target.currency,
+            description=item.description, external_id=item.external_id,
+        )
+
+
+def import_transactions(lines, file_format, user, budget=None, batch_size=1000):
+    """
+    Stream a CSV or OFX statement into the user's Income and Expense tables.
+
+    Rows flow through parse -> normalize -> dedupe -> bulk insert one batch at a time, so
+    memory use depends on batch_size rather than the file size. Debits become expenses on
+    the budget the user's categorization rules pick, falling back to `budget` (and being
+    skipped without one); credits become incomes.
+    """
+    parser = parse_ofx if file_format == "ofx" else parse_csv
+    stats = {
+        "rows_read": 0, "skipped": 0, "duplicates": 0, "categorized": 0, "uncategorized": 0,
+        "expenses_created": 0, "incomes_created": 0,
+    }
+    started = time.perf_counter()
+    resolver = BudgetResolver(user.id)
+    dedupe = Deduplicator(user)
+    currency = user_currency(user)  # statements carry no currency; credits are taken to be in the user's
+
+    for batch in batched(normalize(parser(lines), stats), batch_size):
+        fresh = list(dedupe(batch))
+        stats["duplicates"] += len(batch) - len(fresh)
+        expenses = list(categorize(fresh, resolver, budget, stats))
+        incomes = [
+            Income(
+                user=user, date=item.date, amount=item.amount, currency=currency,
+                source=item.description[:100], description=item.description, external_id=item.external_id,
+            )
+            for item in fresh if item.amount > 0
+        ]
+        with transaction.atomic():
+            Expense.objects.bulk_create(expenses)
+            Income.objects.bulk_create(incomes)
+            expenses_created(expenses)
+            record_expense_rollups(expenses)
+            record_income_rollups(incomes)
+        stats["expenses_created"] += len(expenses)
+        stats["incomes_created"] += len(incomes)
+
+    invalidate_spending_summary(user.id)
+    bump_versions(user.id, "incomes", "expenses")
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = round(elapsed, 3)
+    stats["rows_per_second"] = round(stats["rows_read"] / elapsed, 1) if elapsed else None
+    return stats
@@ -0,0 +1,103 @@
+import json
+import statistics
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, get_resolver
+from rest_framework.test import APIClient
+from core.synthetic import delete_synthetic_users, generate_dataset
+
+SKIPPED_PREFIXES = ("admin/", "api/token/")
+
+
+def benchmarkable_endpoints():
+    """GET endpoints from the root URLconf that take no path arguments."""
+    for pattern in get_resolver().url_patterns:
+        route = str(pattern.pattern)
+        if not isinstance(pattern, URLPattern) or route.startswith(SKIPPED_PREFIXES) or "<" in route:
+            continue
+        view_class = getattr(pattern.callback, "view_class", None)
+        # Async views hold long-lived streams and have nothing to time.
+        if view_class is not None and hasattr(view_class, "get") and not view_class.view_is_async:
+            yield f"/{route}"
+
+
+def benchmark_host():
+    # With DEBUG on and no ALLOWED_HOSTS Django only accepts localhost.
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != "*" and not host.startswith(".")]
+    return hosts[0] if hosts else "localhost"
+
+
+def percentile(timings, pct):
+    if len(timings) == 1:
+        return timings[0]
+    return statistics.quantiles(timings, n=100, method="inclusive")[pct - 1]
+
+
+class Command(BaseCommand):
+    help = "Grow a seeded synthetic dataset through several scales and record latency, query counts and sizes for every GET endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scales", default="1000,100000,1000000", help="Comma separated row counts.")
+        parser.add_argument("--requests", type=int, default=30, help="Timed requests per endpoint.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", default="benchmark_results.json")
+        parser.add_argument("--cleanup", action="store_true", help="Delete the synthetic users once the run is done.")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG:
+            raise CommandError(
+                "benchmark_api loads synthetic users into the default database; "
+                "it only runs with DEBUG on, against a scratch database."
+            )
+        self.stdout.write(f"Benchmarking against {connection.settings_dict['NAME']}")
+        scales = sorted(int(scale) for scale in options["scales"].split(","))
+        endpoints = list(benchmarkable_endpoints())
+        client = APIClient(SERVER_NAME=benchmark_host())
+        results = {"seed": options["seed"], "requests": options["requests"], "scales": []}
+
+        loaded = 0
+        for step, scale in enumerate(scales):
+            self.stdout.write(self.style.MIGRATE_HEADING(f"Loading up to {scale} rows"))
+            owners = generate_dataset(scale - loaded, seed=options["seed"] + step)
+            loaded = scale
+            client.force_authenticate(owners[0].user)
+            cache.clear()
+
+            measurements = {}
+            for url in endpoints:
+                measurements[url] = self.measure(client, url, options["requests"])
+                self.stdout.write(f"{url}: p50 {measurements[url]['p50_ms']} ms, {measurements[url]['queries']} queries")
+            results["scales"].append({"rows": scale, "endpoints": measurements})
+
+        with open(options["output"], "w") as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        if options["cleanup"]:
+            self.stdout.write(f"Deleted {delete_synthetic_users()} synthetic users")
+
+    def measure(self, client, url, requests):
+        reset_queries()  # the capture compares lengths of a bounded log, so start from empty
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+            size = len(b"".join(response.streaming_content) if response.streaming else response.content)
+
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = client.get(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        return {
+            "status": response.status_code,
+            "queries": len(queries.captured_queries),
+            "bytes": size,
+            "p50_ms": round(percentile(timings, 50), 3),
+            "p95_ms": round(percentile(timings, 95), 3),
+            "p99_ms": round(percentile(timings, 99), 3),
+        }
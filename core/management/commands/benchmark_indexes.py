@@ -0,0 +1,97 @@
+import statistics
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from core.models import Income, Expense, Notification
+from core.synthetic import generate_dataset
+
+# (label, model, index name, queryset factory) for the access paths the indexes target.
+INDEXED_QUERIES = [
+    (
+        "incomes by user, newest first",
+        Income,
+        "income_user_date_idx",
+        lambda user, budget: Income.objects.filter(user=user).order_by("-date", "-id")[:100],
+    ),
+    (
+        "expenses of a budget in a date range",
+        Expense,
+        "expense_budget_date_idx",
+        lambda user, budget: Expense.objects.filter(budget=budget, date__range=("2022-01-01", "2022-03-31")).order_by("-date", "-id"),
+    ),
+    (
+        "unread notifications",
+        Notification,
+        "notification_unread_idx",
+        lambda user, budget: Notification.objects.filter(user=user, is_read=False).order_by("-created_at", "-id"),
+    ),
+]
+
+
+class Command(BaseCommand):
+    help = "Load synthetic rows and compare EXPLAIN plans and latency with and without the query indexes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000, help="Total synthetic rows, e.g. 10000000.")
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--skip-load", action="store_true", help="Reuse rows from a previous run.")
+
+    def handle(self, *args, **options):
+        # The run drops live indexes and loads fake users, so keep it off real databases.
+        if not settings.DEBUG:
+            raise CommandError(
+                "benchmark_indexes drops indexes and loads synthetic users into the default database; "
+                "it only runs with DEBUG on, against a scratch database."
+            )
+        self.stdout.write(f"Benchmarking against {connection.settings_dict['NAME']}")
+        if options["skip_load"]:
+            budget = Expense.objects.order_by("-id").values_list("budget", flat=True).first()
+            user = Income.objects.order_by("-id").values_list("user", flat=True).first()
+        else:
+            heaviest = generate_dataset(options["rows"], users=options["users"], seed=options["seed"], stdout=self.stdout)[0]
+            user, budget = heaviest.user.id, heaviest.budgets[0][0].id
+        self.analyze()
+
+        indexes = {index.name: (model, index) for _, model, name, _ in INDEXED_QUERIES for index in model._meta.indexes if index.name == name}
+        with connection.schema_editor() as editor:
+            for model, index in indexes.values():
+                editor.remove_index(model, index)
+        try:
+            self.analyze()
+            before = self.measure(user, budget, options["repeat"])
+        finally:
+            # Put the indexes back even when the measurement fails or is interrupted.
+            with connection.schema_editor() as editor:
+                for model, index in indexes.values():
+                    editor.add_index(model, index)
+        self.analyze()
+        after = self.measure(user, budget, options["repeat"])
+
+        for label, _, _, _ in INDEXED_QUERIES:
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            for phase, results in (("without index", before), ("with index", after)):
+                plan, median = results[label]
+                self.stdout.write(f"  {phase}: median {median:.2f} ms")
+                for line in plan.splitlines():
+                    self.stdout.write(f"    {line}")
+
+    def analyze(self):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                for _, model, _, _ in INDEXED_QUERIES:
+                    cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+    def measure(self, user, budget, repeat):
+        results = {}
+        for label, _, _, build in INDEXED_QUERIES:
+            plan = build(user, budget).explain()
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(build(user, budget))
+                timings.append((time.perf_counter() - started) * 1000)
+            results[label] = (plan, statistics.median(timings))
+        return results
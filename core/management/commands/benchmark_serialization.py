@@ -0,0 +1,55 @@
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from core.fast_serialization import row_lookups, serialize_rows
+from core.models import Expense
+from core.serializers import ExpenseSerializer
+from core.synthetic import build_row, create_users
+
+
+class Command(BaseCommand):
+    help = "Time rendering one large expense list through the serializer fields and through the values() extractors."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=50_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        row_fields = ExpenseSerializer.get_row_fields()
+        if row_fields is None:
+            raise CommandError("ExpenseSerializer has fields the fast path cannot render.")
+        rng = random.Random(options["seed"])
+        renderer = JSONRenderer()
+
+        # The rows only exist for the run.
+        with transaction.atomic():
+            owner, = create_users(1, rng, batch_size=1000)
+            Expense.objects.bulk_create([build_row(Expense, owner, rng) for _ in range(options["rows"])], batch_size=1000)
+            queryset = ExpenseSerializer.optimize_queryset(Expense.objects.filter(budget__user=owner.user)).order_by("-date", "-id")
+
+            def fields():
+                return renderer.render(ExpenseSerializer(list(queryset), many=True).data)
+
+            def extractors():
+                return renderer.render(serialize_rows(row_fields, queryset.values(*row_lookups(row_fields))))
+
+            timings = {}
+            for label, render in (("serializer fields", fields), ("values() extractors", extractors)):
+                runs = []
+                for _ in range(options["repeat"]):
+                    start = time.perf_counter()
+                    body = render()
+                    runs.append(time.perf_counter() - start)
+                timings[label] = (statistics.median(runs), body)
+            transaction.set_rollback(True)
+
+        (slow, slow_body), (fast, fast_body) = timings.values()
+        if slow_body != fast_body:
+            raise CommandError("The two paths rendered different JSON.")
+        for label, (median, body) in timings.items():
+            self.stdout.write(f"{label}: median {median * 1000:.1f} ms for {len(body)} bytes")
+        self.stdout.write(self.style.SUCCESS(f"{options['rows']} expenses: {slow / fast:.1f}x faster, identical output"))
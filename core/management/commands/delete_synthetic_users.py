@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from core.synthetic import SYNTHETIC_PREFIX, delete_synthetic_users
+
+
+class Command(BaseCommand):
+    help = f"Delete the users the benchmarks created (usernames starting with {SYNTHETIC_PREFIX!r}) and everything they own."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Users deleted per transaction.")
+
+    def handle(self, *args, **options):
+        deleted = delete_synthetic_users(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} synthetic users"))
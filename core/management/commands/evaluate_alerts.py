@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from core.alerts import ALERT_CHUNK_SIZE, ALERT_RULES, evaluate_rule
+
+
+class Command(BaseCommand):
+    help = "Raise budget, debt and goal alerts for every user. Alerts already sent are skipped."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rule", choices=list(ALERT_RULES), action="append", help="Only evaluate these rules.")
+        parser.add_argument("--chunk-size", type=int, default=ALERT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        total = 0
+        for name in options["rule"] or ALERT_RULES:
+            created = evaluate_rule(name, chunk_size=options["chunk_size"])
+            total += created
+            self.stdout.write(f"{name}: {created} alerts")
+        self.stdout.write(self.style.SUCCESS(f"Created {total} notifications"))
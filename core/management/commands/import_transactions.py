@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from core.importers import import_transactions, detect_format, ImportFormatError
+from core.models import Budget
+
+
+class Command(BaseCommand):
+    help = "Stream a CSV or OFX bank statement into a user's expenses and incomes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--user", required=True, help="Username that owns the transactions.")
+        parser.add_argument("--budget", type=int, help="Budget id that receives expenses no categorization rule matches.")
+        parser.add_argument("--format", choices=["csv", "ofx"])
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.filter(username=options["user"]).first()
+        if not user:
+            raise CommandError(f"User {options['user']} not found")
+        budget = None
+        if options["budget"]:
+            budget = Budget.objects.filter(id=options["budget"], user=user).first()
+            if not budget:
+                raise CommandError(f"Budget {options['budget']} not found for {user}")
+
+        file_format = options["format"] or detect_format(options["path"])
+        with open(options["path"], encoding="utf-8-sig", errors="replace", newline="") as lines:
+            try:
+                result = import_transactions(lines, file_format, user, budget, batch_size=options["batch_size"])
+            except ImportFormatError as e:
+                raise CommandError(str(e))
+
+        self.stdout.write(
+            f"Read {result['rows_read']} rows: {result['expenses_created']} expenses, "
+            f"{result['incomes_created']} incomes, {result['duplicates']} duplicates, {result['skipped']} skipped, "
+            f"{result['categorized']} categorized by rules, {result['uncategorized']} uncategorized"
+        )
+        self.stdout.write(self.style.SUCCESS(f"{result['rows_per_second']} rows/s in {result['seconds']}s"))
@@ -0,0 +1,28 @@
+import csv
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from django.core.management.base import BaseCommand, CommandError
+from core.currency import base_currency, load_rates
+
+
+class Command(BaseCommand):
+    help = "Load historical exchange rates from a CSV file with date, currency and rate columns."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+
+    def handle(self, *args, **options):
+        with open(options["path"], newline="") as lines:
+            written = load_rates(self.parse(csv.DictReader(lines)))
+        self.stdout.write(self.style.SUCCESS(f"Loaded {written} rates against {base_currency()}"))
+
+    def parse(self, reader):
+        for line, row in enumerate(reader, start=2):
+            try:
+                day = datetime.strptime(row["date"].strip(), "%Y-%m-%d").date()
+                rate = Decimal(row["rate"].strip())
+            except (KeyError, AttributeError, ValueError, InvalidOperation):
+                raise CommandError(f"Line {line}: expected a YYYY-MM-DD date and a decimal rate")
+            if rate <= 0:
+                raise CommandError(f"Line {line}: rate must be positive")
+            yield day, row["currency"].strip().upper(), rate
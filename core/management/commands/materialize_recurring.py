@@ -0,0 +1,25 @@
+from datetime import date
+from django.core.management.base import BaseCommand
+from core.recurrence import materialize_all
+
+
+class Command(BaseCommand):
+    help = "Expand recurring incomes, expenses and budgets into concrete rows up to a horizon."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--horizon-days", type=int, default=60)
+        parser.add_argument("--chunk-size", type=int, default=500, help="Users per batch.")
+        parser.add_argument("--workers", type=int, default=1, help="Processes to spread batches over.")
+        parser.add_argument("--today", type=date.fromisoformat, default=None, help="Override the current date (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        totals = materialize_all(
+            today=options["today"],
+            horizon_days=options["horizon_days"],
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {totals['incomes_created']} incomes, {totals['expenses_created']} expenses "
+            f"and {totals['budgets_created']} budgets"
+        ))
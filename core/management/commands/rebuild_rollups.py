@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from core.recurrence import user_id_chunks
+from core.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the monthly income and expense rollups from raw rows, one chunk of users at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, action="append", help="Only rebuild these user ids.")
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        chunks = [options["user"]] if options["user"] else user_id_chunks(options["chunk_size"])
+        written = 0
+        for user_ids in chunks:
+            written += rebuild_rollups(user_ids)
+            self.stdout.write(f"Rebuilt rollups up to user id {user_ids[-1]}")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} rollup rows"))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from core.models import Budget
+from core.spending import reconcile_spent_amounts
+from core.summaries import invalidate_spending_summary
+
+
+class Command(BaseCommand):
+    help = "Recompute Budget.spent_amount from expense rows, one chunk of budgets at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        last_id = 0
+        updated = 0
+        while True:
+            chunk = list(
+                Budget.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", "user_id")[:chunk_size]
+            )
+            if not chunk:
+                break
+            budget_ids = [budget_id for budget_id, _ in chunk]
+            with transaction.atomic():
+                updated += reconcile_spent_amounts(budget_ids)
+            for user_id in {user_id for _, user_id in chunk}:
+                invalidate_spending_summary(user_id)
+            last_id = budget_ids[-1]
+            self.stdout.write(f"Reconciled budgets up to id {last_id}")
+
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {updated} budgets"))
@@ -0,0 +1,100 @@
+import threading
+from collections import defaultdict
+
+# Eight linear sub-buckets per power of two keeps every recorded value within 12.5%
+# of its bucket's lower bound, the same trade-off an HDR histogram makes.
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def bucket_index(value):
+    if value < SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return ((shift + 1) << SUB_BUCKET_BITS) + (value >> shift) - SUB_BUCKETS
+
+
+def bucket_value(index):
+    if index < SUB_BUCKETS:
+        return index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    return ((index & (SUB_BUCKETS - 1)) + SUB_BUCKETS) << shift
+
+
+class Histogram:
+    """Log-linear histogram of non-negative integers (microseconds or counts)."""
+
+    def __init__(self):
+        self.counts = defaultdict(int)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value):
+        value = max(0, int(value))
+        self.counts[bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        if not self.count:
+            return 0
+        if q >= 1:
+            return self.max
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(bucket_value(index), self.max)
+        return self.max
+
+
+class MetricsRegistry:
+    """Per-view histograms kept in process memory, rendered in Prometheus text format."""
+
+    # metric name -> (help text, divisor that converts recorded integers to the exported unit)
+    METRICS = {
+        "request_seconds": ("Total time spent handling the request.", 1_000_000),
+        "db_seconds": ("Time spent executing SQL.", 1_000_000),
+        "render_seconds": ("Time spent rendering the response body.", 1_000_000),
+        "db_queries": ("Number of SQL queries executed.", 1),
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = defaultdict(Histogram)
+
+    def observe(self, view, values):
+        with self.lock:
+            for metric, value in values.items():
+                self.histograms[(metric, view)].record(value)
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+
+    def render(self):
+        with self.lock:
+            snapshot = {key: (histogram.count, histogram.total, [histogram.quantile(q) for q in QUANTILES])
+                        for key, histogram in self.histograms.items()}
+
+        lines = []
+        for metric, (help_text, divisor) in self.METRICS.items():
+            name = f"financial_planner_view_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for (recorded, view), (count, total, quantiles) in sorted(snapshot.items()):
+                if recorded != metric:
+                    continue
+                for q, value in zip(QUANTILES, quantiles):
+                    lines.append(f'{name}{{view="{view}",quantile="{q}"}} {value / divisor:g}')
+                lines.append(f'{name}_sum{{view="{view}"}} {total / divisor:g}')
+                lines.append(f'{name}_count{{view="{view}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,92 @@
+import cProfile
+import os
+import random
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+from .metrics import registry
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class RequestMetricsMiddleware:
+    """
+    Records query count, DB time, render time and total time per view class into the
+    in-process histograms served at /metrics/.
+
+    With PROFILE_SAMPLE_RATE > 0 a sample of requests also runs under cProfile, and
+    those slower than PROFILE_SLOW_REQUEST_MS are dumped as pstats files to PROFILE_DIR.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+        self.slow_request_ms = getattr(settings, "PROFILE_SLOW_REQUEST_MS", 500)
+        self.profile_dir = getattr(settings, "PROFILE_DIR", None)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request._metrics_render = 0.0
+        profiler = self.start_profiler()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        view = getattr(request, "_metrics_view", "unresolved")
+        if profiler is not None:
+            profiler.disable()
+            if elapsed * 1000 >= self.slow_request_ms:
+                self.dump_profile(profiler, view)
+
+        registry.observe(view, {
+            "request_seconds": elapsed * 1_000_000,
+            "db_seconds": recorder.duration * 1_000_000,
+            "render_seconds": request._metrics_render * 1_000_000,
+            "db_queries": recorder.count,
+        })
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        request._metrics_view = view_class.__name__ if view_class else view_func.__name__
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; time that step separately.
+        started = time.perf_counter()
+
+        def rendered(response):
+            request._metrics_render = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def start_profiler(self):
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another profiler is already active
+            return None
+        return profiler
+
+    def dump_profile(self, profiler, view):
+        directory = self.profile_dir or os.path.join(settings.BASE_DIR, "profiles")
+        os.makedirs(directory, exist_ok=True)
+        profiler.dump_stats(os.path.join(directory, f"{view}-{time.time_ns()}.pstats"))
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:26
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_recurrence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='debt',
+            name='interest_rate',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=5),
+        ),
+        migrations.AddField(
+            model_name='debt',
+            name='minimum_payment',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_sync_tracking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='alert_key',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('alert_key__isnull', False)), fields=('alert_key',), name='notification_alert_unique'),
+        ),
+    ]
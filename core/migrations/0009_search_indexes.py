@@ -0,0 +1,49 @@
+from django.db import migrations
+
+# Searchable text of each table; core.search queries these same expressions.
+SEARCH_TEXT = {
+    "core_expense": "description",
+    "core_income": "source || ' ' || coalesce(description, '')",
+    "core_debt": "creditor_name",
+}
+# Owner column each index leads with, so a user's search never reads other users' rows.
+OWNER_COLUMN = {
+    "core_expense": "budget_id",
+    "core_income": "user_id",
+    "core_debt": "user_id",
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    # Full-text search is PostgreSQL only; core.search keeps an in-memory index elsewhere.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    for table, text in SEARCH_TEXT.items():
+        owner = OWNER_COLUMN[table]
+        schema_editor.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, {text})) STORED"
+        )
+        schema_editor.execute(f"CREATE INDEX {table}_search_idx ON {table} USING gin ({owner}, search_vector)")
+        schema_editor.execute(f"CREATE INDEX {table}_trgm_idx ON {table} USING gin ({owner}, ({text}) gin_trgm_ops)")
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in SEARCH_TEXT:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_trgm_idx")
+        schema_editor.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_categorization_rules'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,65 @@
+from django.db import migrations, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+USER_CHUNK_SIZE = 500
+
+
+def backfill_rollups(apps, schema_editor):
+    """
+    Rebuild the rollups of every user from their incomes and expenses, like
+    core.rollups.rebuild_rollups() but with the historical models. The summaries read
+    only the rollups, so rows written before they existed would otherwise count as zero.
+    """
+    User = apps.get_model("core", "CustomUser")
+    Income = apps.get_model("core", "Income")
+    Expense = apps.get_model("core", "Expense")
+    MonthlyRollup = apps.get_model("core", "MonthlyRollup")
+    database = schema_editor.connection.alias
+
+    last_id = 0
+    while True:
+        user_ids = list(
+            User.objects.using(database).filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:USER_CHUNK_SIZE]
+        )
+        if not user_ids:
+            return
+        last_id = user_ids[-1]
+        incomes = (
+            Income.objects.using(database).filter(user_id__in=user_ids).order_by()
+            .annotate(month=TruncMonth("date")).values("user_id", "month", "currency")
+            .annotate(total=Sum("amount"), count=Count("id"))
+        )
+        expenses = (
+            Expense.objects.using(database).filter(budget__user_id__in=user_ids).order_by()
+            .annotate(month=TruncMonth("date")).values("budget__user_id", "budget__category_id", "month", "currency")
+            .annotate(total=Sum("amount"), count=Count("id"))
+        )
+        rows = [
+            MonthlyRollup(
+                user_id=row["user_id"], kind="income", month=row["month"], currency=row["currency"],
+                total=row["total"], count=row["count"],
+            )
+            for row in incomes
+        ]
+        rows.extend(
+            MonthlyRollup(
+                user_id=row["budget__user_id"], kind="expense", category_id=row["budget__category_id"],
+                month=row["month"], currency=row["currency"], total=row["total"], count=row["count"],
+            )
+            for row in expenses
+        )
+        with transaction.atomic(using=database):
+            MonthlyRollup.objects.using(database).filter(user_id__in=user_ids).delete()
+            MonthlyRollup.objects.using(database).bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_currencies'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
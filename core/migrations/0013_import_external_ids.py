@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_tombstone_watermarks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expense',
+            name='external_id',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='income',
+            name='external_id',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(condition=models.Q(('external_id', ''), _negated=True), fields=['external_id'], name='expense_external_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(condition=models.Q(('external_id', ''), _negated=True), fields=['user', 'external_id'], name='income_external_id_idx'),
+        ),
+    ]
@@ -1,9 +1,13 @@
 from datetime import date, timedelta
 from decimal import Decimal
+from django.core.validators import RegexValidator
 from django.db import models
 from django.contrib.auth.models import User
 from django.contrib.auth.models import AbstractUser
 
+# ISO 4217 code of the currency an amount is recorded in.
+currency_code = RegexValidator(r"^[A-Z]{3}$", "Enter a three-letter ISO 4217 currency code.")
+
 
 def default_end_date():
     return date.today() + timedelta(days=30)
@@ -21,6 +25,12 @@ class BudgetCategory(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "updated_at"], name="category_user_updated_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -30,10 +40,28 @@ class Income(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="incomes")
     source = models.CharField(max_length=100)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
+    currency = models.CharField(max_length=3, default="USD", validators=[currency_code])
     date = models.DateField()
     recurring = models.BooleanField(default=False)
     description = models.TextField(blank=True, null=True)
+    # Rows materialized from a recurring income point back at it; the template keeps
+    # the last date it has been expanded through.
+    recurrence_parent = models.ForeignKey("self", on_delete=models.SET_NULL, null=True, blank=True, related_name="occurrences")
+    materialized_through = models.DateField(null=True, blank=True)
+    # The bank's id for imported transactions (OFX FITID); re-imports are matched on it.
+    external_id = models.CharField(max_length=255, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "date"], name="income_user_date_idx"),
+            models.Index(fields=["user", "updated_at"], name="income_user_updated_idx"),
+            models.Index(fields=["user", "external_id"], name="income_external_id_idx", condition=~models.Q(external_id="")),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["recurrence_parent", "date"], name="income_occurrence_unique"),
+        ]
 
     def __str__(self):
         return f"{self.source} - ${self.amount}"
@@ -44,11 +72,19 @@ class Budget(models.Model):
     category = models.ForeignKey(BudgetCategory, on_delete=models.CASCADE, related_name="budgets")
     allocated_amount = models.DecimalField(max_digits=10, decimal_places=2)
     spent_amount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"))
+    currency = models.CharField(max_length=3, default="USD", validators=[currency_code])
     start_date = models.DateField(default=date.today)
     end_date = models.DateField(default=default_end_date)
     is_recurring = models.BooleanField(default=False)
+    previous_period = models.OneToOneField("self", on_delete=models.SET_NULL, null=True, blank=True, related_name="next_period")
     shared_with = models.ManyToManyField(CustomUser, related_name="shared_budgets", blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "updated_at"], name="budget_user_updated_idx"),
+        ]
 
     @property
     def remaining(self):
@@ -62,9 +98,26 @@ class Expense(models.Model):
     budget = models.ForeignKey(Budget, on_delete=models.CASCADE, related_name="expenses")
     description = models.CharField(max_length=255)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
+    # Always the budget's currency, so spent_amount adds up without conversion.
+    currency = models.CharField(max_length=3, default="USD", validators=[currency_code])
     date = models.DateField()
     recurring = models.BooleanField(default=False)
+    recurrence_parent = models.ForeignKey("self", on_delete=models.SET_NULL, null=True, blank=True, related_name="occurrences")
+    materialized_through = models.DateField(null=True, blank=True)
+    # The bank's id for imported transactions (OFX FITID); re-imports are matched on it.
+    external_id = models.CharField(max_length=255, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["budget", "date"], name="expense_budget_date_idx"),
+            models.Index(fields=["budget", "updated_at"], name="expense_budget_updated_idx"),
+            models.Index(fields=["external_id"], name="expense_external_id_idx", condition=~models.Q(external_id="")),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["recurrence_parent", "date"], name="expense_occurrence_unique"),
+        ]
 
     def __str__(self):
         return f"{self.description} - ${self.amount}"
@@ -75,8 +128,15 @@ class Goal(models.Model):
     name = models.CharField(max_length=255)
     target_amount = models.DecimalField(max_digits=10, decimal_places=2)
     current_savings = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"))
+    currency = models.CharField(max_length=3, default="USD", validators=[currency_code])
     due_date = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "updated_at"], name="goal_user_updated_idx"),
+        ]
 
     @property
     def remaining(self):
@@ -90,10 +150,19 @@ class Debt(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="debts")
     creditor_name = models.CharField(max_length=255)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
+    currency = models.CharField(max_length=3, default="USD", validators=[currency_code])
     due_date = models.DateField()
     paid_amount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"))
+    interest_rate = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal("0.00"))  # APR in percent
+    minimum_payment = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"))
     description = models.TextField(null=True, blank=True)  
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "updated_at"], name="debt_user_updated_idx"),
+        ]
 
     @property
     def remaining(self):
@@ -103,11 +172,139 @@ class Debt(models.Model):
         return f"Debt to {self.creditor_name} - ${self.amount}"
 
 
+class CategorizationRule(models.Model):
+    """Assigns expenses whose description and amount match to a budget of `category`."""
+
+    CONTAINS = "contains"
+    REGEX = "regex"
+    MATCH_CHOICES = [(CONTAINS, "Contains"), (REGEX, "Regular expression")]
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="categorization_rules")
+    category = models.ForeignKey(BudgetCategory, on_delete=models.CASCADE, related_name="categorization_rules")
+    match_type = models.CharField(max_length=8, choices=MATCH_CHOICES, default=CONTAINS)
+    # Matched case-insensitively; an empty substring matches every description.
+    pattern = models.CharField(max_length=255, blank=True)
+    min_amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    priority = models.IntegerField(default=0)  # lower values win when several rules match
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "priority"], name="rule_user_priority_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.match_type} {self.pattern!r} -> {self.category_id}"
+
+
 class Notification(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="notifications")
     message = models.TextField()
     is_read = models.BooleanField(default=False)
+    # Set on notifications raised by core.alerts; each alert is sent at most once.
+    alert_key = models.CharField(max_length=100, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["alert_key"], condition=models.Q(alert_key__isnull=False), name="notification_alert_unique"),
+        ]
+        indexes = [
+            # Only unread rows are ever listed, so the index stays small as the table grows.
+            models.Index(fields=["user", "created_at"], condition=models.Q(is_read=False), name="notification_unread_idx"),
+            models.Index(fields=["user", "updated_at"], name="notification_user_updated_idx"),
+        ]
 
     def __str__(self):
         return self.message
+
+
+class MonthlyRollup(models.Model):
+    """Per-user, per-category monthly totals of incomes and expenses, kept up to date on write."""
+
+    INCOME = "income"
+    EXPENSE = "expense"
+    KIND_CHOICES = [(INCOME, "Income"), (EXPENSE, "Expense")]
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="monthly_rollups")
+    kind = models.CharField(max_length=7, choices=KIND_CHOICES)
+    # Incomes have no category.
+    category = models.ForeignKey(BudgetCategory, on_delete=models.CASCADE, null=True, blank=True, related_name="monthly_rollups")
+    month = models.DateField()  # first day of the month
+    currency = models.CharField(max_length=3, default="USD")  # totals are kept per currency and converted on read
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # NULLs never collide in a unique constraint, so uncategorized rows get their own.
+            models.UniqueConstraint(
+                fields=["user", "kind", "category", "month", "currency"], condition=models.Q(category__isnull=False),
+                name="rollup_category_month_unique",
+            ),
+            models.UniqueConstraint(
+                fields=["user", "kind", "month", "currency"], condition=models.Q(category__isnull=True),
+                name="rollup_month_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["user", "month"], name="rollup_user_month_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.month:%Y-%m}: ${self.total}"
+
+
+class ExchangeRate(models.Model):
+    """Units of `currency` one unit of settings.BASE_CURRENCY bought on `date`."""
+
+    currency = models.CharField(max_length=3, validators=[currency_code])
+    date = models.DateField()
+    rate = models.DecimalField(max_digits=18, decimal_places=8)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["currency", "date"], name="exchange_rate_currency_date_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.currency} {self.date}: {self.rate}"
+
+
+class Tombstone(models.Model):
+    """Marks a deleted row so /sync/ can tell clients to drop their copy."""
+
+    # No database constraint: tombstones are written while a user's rows are being
+    # cascade-deleted and are only ever removed by pruning.
+    user = models.ForeignKey(CustomUser, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+")
+    model = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "model", "id"], name="tombstone_user_model_idx"),
+            models.Index(fields=["deleted_at"], name="tombstone_deleted_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} deleted {self.deleted_at}"
+
+
+class TombstoneWatermark(models.Model):
+    """The newest tombstone pruned for a user and resource; sync cursors before it missed deletions."""
+
+    user = models.ForeignKey(CustomUser, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+")
+    model = models.CharField(max_length=50)
+    pruned_through = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "model"], name="tombstone_watermark_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.model} pruned through {self.pruned_through}"
@@ -0,0 +1,91 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a (field, id) pair, newest first.
+
+    Each page is fetched with a `WHERE (field, id) < (last_field, last_id)` predicate
+    instead of an OFFSET, so page N costs the same as page 1. The response body stays a
+    plain list and the opaque cursor for the next page is sent in a `Link` header.
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def __init__(self, ordering_field="created_at"):
+        self.ordering_field = ordering_field
+        self.page_size = api_settings.PAGE_SIZE or 100
+        self.next_cursor = None
+        self.request = None
+
+    def get_page_size(self, request):
+        value = request.query_params.get(self.page_size_query_param)
+        if value is None:
+            return self.page_size
+        try:
+            page_size = int(value)
+        except ValueError:
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def encode_cursor(self, value, pk):
+        raw = json.dumps([value.isoformat(), pk]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, queryset, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            field = queryset.model._meta.get_field(self.ordering_field)
+            value = field.to_python(value)
+            if value is None:  # `field__lt=None` is not a valid filter
+                raise ValueError
+            if type(pk) is not int:  # int() would take floats, including 1e400 (OverflowError)
+                raise ValueError
+            return value, pk
+        except (TypeError, ValueError, OverflowError, ValidationError):
+            raise NotFound("Invalid cursor.")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        field = self.ordering_field
+
+        queryset = queryset.order_by(f"-{field}", "-id")
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            value, pk = self.decode_cursor(queryset, cursor)
+            queryset = queryset.filter(Q(**{f"{field}__lt": value}) | Q(**{field: value, "id__lt": pk}))
+
+        rows = list(queryset[:page_size + 1])
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            if isinstance(last, dict):  # values() rows
+                self.next_cursor = self.encode_cursor(last[field], last["id"])
+            else:
+                self.next_cursor = self.encode_cursor(getattr(last, field), last.id)
+        return rows
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        headers = {}
+        next_link = self.get_next_link()
+        if next_link:
+            headers["Link"] = f'<{next_link}>; rel="next"'
+        return Response(data, headers=headers)
@@ -0,0 +1,125 @@
+from datetime import date
+import numpy as np
+from .currency import base_currency, conversion_factors
+from .models import Debt
+from .recurrence import add_months
+
+# Balances below half a cent count as paid off.
+PAID_OFF = 0.005
+
+
+def load_debts(user_id, currency, today):
+    """
+    Outstanding debts of the user as (ids, balances, annual rates, minimum payments),
+    with balances and payments in `currency` at today's rates.
+    """
+    rows = [
+        row for row in Debt.objects.filter(user_id=user_id).order_by("id")
+        .values_list("id", "amount", "paid_amount", "interest_rate", "minimum_payment", "currency")
+        if row[1] > row[2]
+    ]
+    if not rows:
+        return np.array([], dtype=int), np.zeros(0), np.zeros(0), np.zeros(0)
+    ids, amount, paid, rate, minimum, currencies = (np.array(column) for column in zip(*rows))
+    factors = conversion_factors(currencies, [today] * len(rows), currency)
+    balances = (amount.astype(float) - paid.astype(float)) * factors
+    return ids.astype(int), balances, rate.astype(float), minimum.astype(float) * factors
+
+
+def priority_order(strategy, ids, balances, rates, custom_order=()):
+    """Debt positions in the order extra money is thrown at them."""
+    if strategy == "avalanche":
+        return np.lexsort((balances, -rates))
+    if strategy == "snowball":
+        return np.lexsort((-rates, balances))
+    position = {debt_id: index for index, debt_id in enumerate(custom_order)}
+    # Debts left out of a custom order follow it, highest rate first.
+    rank = np.array([position.get(debt_id, len(position)) for debt_id in ids.tolist()])
+    return np.lexsort((-rates, rank))
+
+
+def simulate(balances, rates, minimums, orders, extra_payments, max_months=360):
+    """
+    Amortize every scenario at once: balances are a (scenarios, debts) array.
+
+    Each month interest accrues, every open debt gets its minimum payment and whatever
+    remains of the scenario's budget (the sum of all minimums plus its extra payment)
+    pays down debts in the scenario's priority order. Minimums freed by paid-off debts
+    therefore roll over to the next debt in line. Months depend on each other, so only
+    the month loop runs in Python.
+
+    Returns (remaining balance per scenario and month, interest paid per scenario,
+    payoff month per scenario and debt, -1 where unpaid after max_months).
+    """
+    scenarios, debts = len(orders), len(balances)
+    orders = np.asarray(orders, dtype=int).reshape(scenarios, debts)
+    balance = np.tile(balances, (scenarios, 1))
+    monthly_rate = rates / 1200
+    budget = minimums.sum() + np.asarray(extra_payments, dtype=float)
+    interest_paid = np.zeros(scenarios)
+    payoff_month = np.full((scenarios, debts), -1)
+    remaining = []
+
+    for month in range(1, max_months + 1):
+        open_debts = balance > PAID_OFF
+        if not open_debts.any():
+            break
+        interest = balance * monthly_rate
+        balance += interest
+        interest_paid += interest.sum(axis=1)
+
+        minimum = np.minimum(minimums, balance)
+        balance -= minimum
+        leftover = np.maximum(budget - minimum.sum(axis=1), 0)
+
+        # Walk the priority order: each debt takes what is left after the ones before it.
+        ordered = np.take_along_axis(balance, orders, axis=1)
+        ahead = np.cumsum(ordered, axis=1) - ordered
+        payment = np.clip(leftover[:, None] - ahead, 0, ordered)
+        np.put_along_axis(balance, orders, ordered - payment, axis=1)
+
+        cleared = open_debts & (balance <= PAID_OFF)
+        payoff_month[cleared] = month
+        balance[balance <= PAID_OFF] = 0
+        remaining.append(balance.sum(axis=1))
+
+    history = np.array(remaining).T if remaining else np.zeros((scenarios, 0))
+    return history, interest_paid, payoff_month
+
+
+def payoff_plans(user_id, scenarios, max_months=360, today=None, currency=None):
+    """
+    Simulate each scenario ({strategy, extra_payment, order}) over the user's open debts,
+    with every amount, extra payments included, in `currency` (the base currency by default).
+    """
+    today = today or date.today()
+    ids, balances, rates, minimums = load_debts(user_id, currency or base_currency(), today)
+    orders = [priority_order(s["strategy"], ids, balances, rates, s.get("order", ())) for s in scenarios]
+    extra = [float(s.get("extra_payment", 0)) for s in scenarios]
+    history, interest_paid, payoff_month = simulate(balances, rates, minimums, orders, extra, max_months)
+
+    plans = []
+    for index, scenario in enumerate(scenarios):
+        months = payoff_month[index]
+        paid_off = bool((months > 0).all())
+        # Scenarios finish at different months; trim the trailing zeros of early finishers.
+        last = int(months.max()) if paid_off and len(months) else history.shape[1]
+        plans.append({
+            "strategy": scenario["strategy"],
+            "extra_payment": round(extra[index], 2),
+            "paid_off": paid_off,
+            "months": last if paid_off else None,
+            "payoff_date": add_months(today, last).isoformat() if paid_off else None,
+            "total_interest": round(float(interest_paid[index]), 2),
+            "total_paid": round(float(balances.sum() + interest_paid[index] - history[index, -1:].sum()), 2),
+            "debts": [
+                {
+                    "id": int(debt_id),
+                    "payoff_month": int(month) if month > 0 else None,
+                    "payoff_date": add_months(today, int(month)).isoformat() if month > 0 else None,
+                }
+                for debt_id, month in zip(ids, months)
+            ],
+            "remaining_balance": np.round(history[index, :last], 2).tolist(),
+        })
+    return plans
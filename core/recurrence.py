@@ -0,0 +1,181 @@
+import calendar
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from itertools import repeat
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from .models import Budget, Income, Expense, default_end_date
+from .rollups import record_expense_rollups, record_income_rollups
+from .spending import batched_spent_updates, expenses_created
+from .summaries import invalidate_spending_summary
+from .versioning import bump_versions
+
+
+def add_months(day, months):
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def occurrence_dates(anchor, after, through):
+    """Monthly dates on the anchor's day of month, strictly after `after` and up to `through`."""
+    months = 1
+    day = add_months(anchor, months)
+    while day <= through:
+        if day > after:
+            yield day
+        months += 1
+        day = add_months(anchor, months)
+
+
+def expand(templates, through, build):
+    """Create occurrence rows for each template and advance its watermark to `through`."""
+    rows = []
+    for template in templates:
+        after = template.materialized_through or template.date
+        rows.extend(build(template, day) for day in occurrence_dates(template.date, after, through))
+        template.materialized_through = through
+    return rows
+
+
+def roll_over_budgets(user_ids, through):
+    """Create the next period for recurring budgets ending within the horizon, catching up as needed."""
+    period = default_end_date() - date.today()
+    created = 0
+    while True:
+        due = list(
+            Budget.objects.filter(user_id__in=user_ids, is_recurring=True, end_date__lte=through, next_period__isnull=True)
+        )
+        if not due:
+            return created
+        Budget.objects.bulk_create([
+            Budget(
+                user_id=budget.user_id,
+                category_id=budget.category_id,
+                allocated_amount=budget.allocated_amount,
+                currency=budget.currency,
+                start_date=budget.end_date + timedelta(days=1),
+                end_date=budget.end_date + timedelta(days=1) + period,
+                is_recurring=True,
+                previous_period=budget,
+            )
+            for budget in due
+        ])
+        created += len(due)
+
+
+def budget_periods(user_ids):
+    """{budget id: [(id, start_date, end_date) of it and every later period]} for the users' budgets."""
+    rows = list(Budget.objects.filter(user_id__in=user_ids).values_list("id", "previous_period_id", "start_date", "end_date"))
+    following = {previous: pk for pk, previous, _, _ in rows if previous is not None}
+    spans = {pk: (pk, start, end) for pk, _, start, end in rows}
+    chains = {}
+
+    def periods(budget_id):
+        if budget_id not in chains:
+            chain = [spans[budget_id]]
+            while chain[-1][0] in following:
+                chain.append(spans[following[chain[-1][0]]])
+            chains[budget_id] = chain
+        return chains[budget_id]
+
+    return periods
+
+
+def period_covering(periods, day):
+    """The id of the period covering `day`, else the latest one starting on or before it."""
+    covering = periods[0][0]
+    for pk, start, end in periods:
+        if start <= day <= end:
+            return pk
+        if start <= day:
+            covering = pk
+    return covering
+
+
+def materialize_users(user_ids, today, horizon_days):
+    """
+    Expand every recurring income, expense and budget of `user_ids` up to today + horizon.
+
+    Templates are locked and their watermark advanced in the same transaction as the
+    inserts, so re-running only does the work that appeared since the previous run.
+    """
+    through = today + timedelta(days=horizon_days)
+    stats = Counter()
+    with transaction.atomic(), batched_spent_updates():
+        incomes = list(
+            Income.objects.select_for_update(of=("self",))
+            .filter(user_id__in=user_ids, recurring=True, recurrence_parent__isnull=True)
+            .exclude(materialized_through__gte=through)
+        )
+        new_incomes = expand(incomes, through, lambda template, day: Income(
+            user_id=template.user_id, source=template.source, amount=template.amount, currency=template.currency,
+            description=template.description, date=day, recurrence_parent=template,
+        ))
+        Income.objects.bulk_create(new_incomes, batch_size=1000)
+        Income.objects.bulk_update(incomes, ["materialized_through"], batch_size=1000)
+        record_income_rollups(new_incomes)
+
+        # Occurrences are booked to the budget period covering their date, so the periods
+        # up to the horizon have to exist first.
+        stats["budgets_created"] = roll_over_budgets(user_ids, through)
+        periods = budget_periods(user_ids)
+        expenses = list(
+            Expense.objects.select_for_update(of=("self",))
+            .filter(budget__user_id__in=user_ids, recurring=True, recurrence_parent__isnull=True)
+            .exclude(materialized_through__gte=through)
+        )
+        new_expenses = expand(expenses, through, lambda template, day: Expense(
+            budget_id=period_covering(periods(template.budget_id), day), description=template.description,
+            amount=template.amount, currency=template.currency, date=day, recurrence_parent=template,
+        ))
+        Expense.objects.bulk_create(new_expenses, batch_size=1000)
+        Expense.objects.bulk_update(expenses, ["materialized_through"], batch_size=1000)
+        expenses_created(new_expenses)
+        record_expense_rollups(new_expenses)
+    stats["incomes_created"] = len(new_incomes)
+    stats["expenses_created"] = len(new_expenses)
+
+    if new_expenses or stats["budgets_created"]:
+        for user_id in user_ids:
+            invalidate_spending_summary(user_id)
+    if new_incomes or new_expenses:
+        for user_id in user_ids:
+            bump_versions(user_id, "incomes", "expenses")
+    return stats
+
+
+def user_id_chunks(chunk_size):
+    last_id = 0
+    User = get_user_model()
+    while True:
+        chunk = list(User.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def materialize_all(today=None, horizon_days=60, chunk_size=500, workers=1):
+    """Run materialize_users() over every user in chunks, optionally across a process pool."""
+    today = today or date.today()
+    totals = Counter()
+    if workers <= 1:
+        for chunk in user_id_chunks(chunk_size):
+            totals.update(materialize_users(chunk, today, horizon_days))
+        return totals
+
+    chunks = list(user_id_chunks(chunk_size))
+    # Children must open their own connections rather than share the parent's sockets.
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for stats in pool.map(materialize_users, chunks, repeat(today), repeat(horizon_days)):
+            totals.update(stats)
+    return totals
@@ -0,0 +1,146 @@
+import random
+import threading
+import time
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+PIN_KEY = "replica-pin:{user_id}"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Seconds the newest replayed transaction trails the primary; 0 once caught up.
+LAG_SQL = """
+SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0) END
+"""
+
+# The replica alias reads of the current request go to; None reads from the primary.
+_read_alias = ContextVar("read_alias", default=None)
+_lags = {}
+_lags_lock = threading.Lock()
+
+
+def replica_aliases():
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def pin_users(user_ids):
+    """
+    Send the reads of these users to the primary until the replicas have caught up
+    with a write they just made ("all" pins every user).
+    """
+    if replica_aliases():
+        timeout = getattr(settings, "REPLICA_PIN_SECONDS", 10)
+        cache.set_many({PIN_KEY.format(user_id=user_id): True for user_id in user_ids}, timeout)
+
+
+def is_pinned(user_id):
+    return bool(cache.get_many([PIN_KEY.format(user_id=user_id), PIN_KEY.format(user_id="all")]))
+
+
+def measure_lag(alias):
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(LAG_SQL)
+        lag, = cursor.fetchone()
+    return float(lag)
+
+
+def replica_lag(alias):
+    """The replica's lag in seconds, measured at most once per REPLICA_LAG_CHECK_SECONDS per process."""
+    interval = getattr(settings, "REPLICA_LAG_CHECK_SECONDS", 1)
+    now = time.monotonic()
+    with _lags_lock:
+        checked = _lags.get(alias)
+        if checked is not None and now - checked[0] < interval:
+            return checked[1]
+    try:
+        lag = measure_lag(alias)
+    except DatabaseError:
+        lag = float("inf")  # unreachable replicas are skipped like lagging ones
+    with _lags_lock:
+        _lags[alias] = (now, lag)
+    return lag
+
+
+def choose_replica():
+    """A replica within REPLICA_MAX_LAG_SECONDS of the primary, or None."""
+    max_lag = getattr(settings, "REPLICA_MAX_LAG_SECONDS", 5)
+    healthy = [alias for alias in replica_aliases() if replica_lag(alias) <= max_lag]
+    return random.choice(healthy) if healthy else None
+
+
+def token_user_id(request):
+    """The user id of the request's access token, read without touching the database."""
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    # Runs outside DRF's exception handling: bad headers are left for the view to reject.
+    try:
+        raw_token = authentication.get_raw_token(header)
+        if raw_token is None:
+            return None
+        return authentication.get_validated_token(raw_token).get(jwt_settings.USER_ID_CLAIM)
+    except (AuthenticationFailed, TokenError):
+        return None
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of safe requests to the replica ReplicaMiddleware picked, and
+    everything else to the primary. Once a request writes, or while a transaction is
+    open on the primary, its reads go to the primary too.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        if _read_alias.get() is not None:
+            _read_alias.set(None)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the primary's rows, so objects read from either may be related.
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaMiddleware:
+    """
+    Picks the database a request reads from. Safe requests of a user that is not pinned
+    read from a replica that is not lagging; a user's own writes pin them to the primary
+    for REPLICA_PIN_SECONDS, so they always read what they just wrote.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_aliases():
+            return self.get_response(request)
+        user_id = token_user_id(request)
+        alias = None
+        if request.method in SAFE_METHODS and user_id is not None and not is_pinned(user_id):
+            alias = choose_replica()
+        token = _read_alias.set(alias)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        if request.method not in SAFE_METHODS and user_id is not None:
+            pin_users([user_id])
+        return response
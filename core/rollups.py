@@ -0,0 +1,171 @@
+from collections import defaultdict
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+from .currency import convert
+from .models import Budget, Income, Expense, MonthlyRollup
+
+MAX_REPORT_MONTHS = 120
+
+
+def shift_month(month, offset):
+    index = month.month - 1 + offset
+    return month.replace(year=month.year + index // 12, month=index % 12 + 1)
+
+
+def to_month(model, value):
+    return model._meta.get_field("date").to_python(value).replace(day=1)
+
+
+class RollupDeltas(defaultdict):
+    """Pending [total, count] changes keyed by (user_id, kind, category_id, month, currency)."""
+
+    def __init__(self):
+        super().__init__(lambda: [Decimal("0.00"), 0])
+
+    def add(self, model, user_id, category_id, day, amount, count, currency):
+        kind = MonthlyRollup.INCOME if model is Income else MonthlyRollup.EXPENSE
+        amount = model._meta.get_field("amount").to_python(amount)
+        entry = self[(user_id, kind, category_id, to_month(model, day), currency)]
+        entry[0] += amount
+        entry[1] += count
+
+    def apply(self):
+        for (user_id, kind, category_id, month, currency), (total, count) in self.items():
+            if total or count:
+                apply_rollup_delta(user_id, kind, category_id, month, currency, total, count)
+
+
+def apply_rollup_delta(user_id, kind, category_id, month, currency, total, count):
+    rows = MonthlyRollup.objects.filter(user_id=user_id, kind=kind, category_id=category_id, month=month, currency=currency)
+    changes = {"total": F("total") + total, "count": F("count") + count}
+    if rows.update(**changes) or count <= 0:
+        # A removal with no row to subtract from happens when the rollups went first in a
+        # cascading delete of the user or category.
+        return
+    try:
+        with transaction.atomic():
+            MonthlyRollup.objects.create(
+                user_id=user_id, kind=kind, category_id=category_id, month=month, currency=currency,
+                total=total, count=count,
+            )
+    except IntegrityError:  # created concurrently
+        rows.update(**changes)
+
+
+def cached_budgets(expenses):
+    return [expense.budget for expense in expenses if Expense.budget.is_cached(expense) and expense.budget is not None]
+
+
+def budget_owners(budget_ids, cached=()):
+    """{budget_id: (user_id, category_id)}, using the already loaded budgets in `cached`."""
+    owners = {budget.pk: (budget.user_id, budget.category_id) for budget in cached}
+    missing = {budget_id for budget_id in budget_ids if budget_id is not None and budget_id not in owners}
+    if missing:
+        owners.update(
+            (budget_id, (user_id, category_id))
+            for budget_id, user_id, category_id in Budget.objects.filter(pk__in=missing).values_list("id", "user_id", "category_id")
+        )
+    return owners
+
+
+def record_expense_rollups(expenses):
+    """Add expenses inserted without signals, e.g. through bulk_create(), to the rollups."""
+    owners = budget_owners({expense.budget_id for expense in expenses}, cached_budgets(expenses))
+    deltas = RollupDeltas()
+    for expense in expenses:
+        user_id, category_id = owners[expense.budget_id]
+        deltas.add(Expense, user_id, category_id, expense.date, expense.amount, 1, expense.currency)
+    deltas.apply()
+
+
+def record_income_rollups(incomes):
+    """Add incomes inserted without signals to the rollups."""
+    deltas = RollupDeltas()
+    for income in incomes:
+        deltas.add(Income, income.user_id, None, income.date, income.amount, 1, income.currency)
+    deltas.apply()
+
+
+def move_budget_rollups(budget_id, user_id, old_category_id, new_category_id):
+    """Move a budget's expense totals to its new category."""
+    deltas = RollupDeltas()
+    months = (
+        Expense.objects.filter(budget_id=budget_id).order_by()
+        .annotate(month=TruncMonth("date")).values("month", "currency")
+        .annotate(total=Sum("amount"), count=Count("id"))
+    )
+    for row in months:
+        deltas.add(Expense, user_id, old_category_id, row["month"], -row["total"], -row["count"], row["currency"])
+        deltas.add(Expense, user_id, new_category_id, row["month"], row["total"], row["count"], row["currency"])
+    deltas.apply()
+
+
+def rebuild_rollups(user_ids):
+    """Recompute the rollups of the given users from their income and expense rows."""
+    incomes = (
+        Income.objects.filter(user_id__in=user_ids).order_by()
+        .annotate(month=TruncMonth("date")).values("user_id", "month", "currency")
+        .annotate(total=Sum("amount"), count=Count("id"))
+    )
+    expenses = (
+        Expense.objects.filter(budget__user_id__in=user_ids).order_by()
+        .annotate(month=TruncMonth("date")).values("budget__user_id", "budget__category_id", "month", "currency")
+        .annotate(total=Sum("amount"), count=Count("id"))
+    )
+    rows = [
+        MonthlyRollup(
+            user_id=row["user_id"], kind=MonthlyRollup.INCOME, month=row["month"], currency=row["currency"],
+            total=row["total"], count=row["count"],
+        )
+        for row in incomes
+    ]
+    rows.extend(
+        MonthlyRollup(
+            user_id=row["budget__user_id"], kind=MonthlyRollup.EXPENSE, category_id=row["budget__category_id"],
+            month=row["month"], currency=row["currency"], total=row["total"], count=row["count"],
+        )
+        for row in expenses
+    )
+    with transaction.atomic():
+        MonthlyRollup.objects.filter(user_id__in=user_ids).delete()
+        MonthlyRollup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def monthly_report(user_id, months, today, currency):
+    """
+    Income, expense and per-category totals for the last `months` months, read from the
+    rollups and converted to `currency` at each month's first-day rate. The cost depends
+    on months x categories, not on the number of transactions.
+    """
+    current = today.replace(day=1)
+    labels = [shift_month(current, offset) for offset in range(1 - months, 1)]
+    position = {month: index for index, month in enumerate(labels)}
+    series = {MonthlyRollup.INCOME: [Decimal("0.00")] * months, MonthlyRollup.EXPENSE: [Decimal("0.00")] * months}
+    categories = {}
+
+    rows = list(
+        MonthlyRollup.objects.filter(user_id=user_id, month__gte=labels[0], month__lte=current)
+        .values_list("kind", "category_id", "category__name", "month", "currency", "total", "count")
+    )
+    totals = convert([row[5] for row in rows], [row[4] for row in rows], [row[3] for row in rows], currency)
+    for (kind, category_id, name, month, _, _, count), total in zip(rows, totals):
+        index = position[month]
+        series[kind][index] += total
+        if category_id is not None:
+            category = categories.setdefault(
+                category_id, {"id": category_id, "name": name, "totals": [Decimal("0.00")] * months, "counts": [0] * months}
+            )
+            category["totals"][index] += total
+            category["counts"][index] += count
+
+    return {
+        "currency": currency,
+        "months": [month.strftime("%Y-%m") for month in labels],
+        "income": series[MonthlyRollup.INCOME],
+        "expense": series[MonthlyRollup.EXPENSE],
+        "net": [income - expense for income, expense in zip(series[MonthlyRollup.INCOME], series[MonthlyRollup.EXPENSE])],
+        "categories": sorted(categories.values(), key=lambda category: category["name"]),
+    }
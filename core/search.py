@@ -0,0 +1,183 @@
+import base64
+import bisect
+import json
+import math
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from django.db import connections, router
+from rest_framework.exceptions import ParseError
+from .models import Income, Expense, Debt
+from .versioning import get_versions
+
+SEARCH_PAGE_SIZE = 50
+MAX_SEARCH_PAGE_SIZE = 200
+MAX_QUERY_LENGTH = 200
+INDEX_CACHE_SIZE = 256
+
+# Result kinds in tie-break order; the position is what cursors and the SQL store.
+SEARCH_KINDS = ("expense", "income", "debt")
+TOKEN = re.compile(r"\w+")
+
+# Each kind's searchable text as SQL. The generated search_vector columns and the trigram
+# indexes (migration 0009) are built from these same expressions, so keep them in step.
+SEARCH_SQL = """
+WITH query AS (SELECT websearch_to_tsquery('simple', %(q)s) AS q)
+SELECT kind, id, text, amount, day, rank FROM (
+    SELECT 1 AS kind, e.id, e.description AS text, e.amount, e.date AS day,
+           ts_rank_cd(e.search_vector, query.q) + word_similarity(%(q)s, e.description) AS rank
+    FROM core_expense e, query
+    WHERE e.budget_id IN (SELECT id FROM core_budget WHERE user_id = %(user_id)s)
+      AND (e.search_vector @@ query.q OR %(q)s <%% e.description)
+    UNION ALL
+    SELECT 2, i.id, i.source || ' ' || coalesce(i.description, ''), i.amount, i.date,
+           ts_rank_cd(i.search_vector, query.q) + word_similarity(%(q)s, i.source || ' ' || coalesce(i.description, ''))
+    FROM core_income i, query
+    WHERE i.user_id = %(user_id)s
+      AND (i.search_vector @@ query.q OR %(q)s <%% (i.source || ' ' || coalesce(i.description, '')))
+    UNION ALL
+    SELECT 3, d.id, d.creditor_name, d.amount, d.due_date,
+           ts_rank_cd(d.search_vector, query.q) + word_similarity(%(q)s, d.creditor_name)
+    FROM core_debt d, query
+    WHERE d.user_id = %(user_id)s
+      AND (d.search_vector @@ query.q OR %(q)s <%% d.creditor_name)
+) hits
+{after}
+ORDER BY rank DESC, kind DESC, id DESC
+LIMIT %(limit)s
+"""
+AFTER_SQL = "WHERE (rank, kind, id) < (%(rank)s, %(kind)s, %(id)s)"
+
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def encode_cursor(rank, kind, pk):
+    raw = json.dumps([rank, kind, pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, kind, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        # int() takes floats too, and 1e400 parses as infinity (OverflowError in int()).
+        if type(kind) is not int or type(pk) is not int or type(rank) not in (int, float) or not math.isfinite(rank):
+            raise ValueError
+        return float(rank), kind, pk
+    except (TypeError, ValueError, OverflowError):
+        raise ParseError("Invalid search cursor.")
+
+
+def tokenize(text):
+    return TOKEN.findall((text or "").casefold())
+
+
+def search_postgres(user_id, query, after, limit):
+    params = {"q": query, "user_id": user_id, "limit": limit}
+    if after is not None:
+        params.update(zip(("rank", "kind", "id"), after))
+    # Raw SQL bypasses the database routers, so ask them which database to read.
+    with connections[router.db_for_read(Expense)].cursor() as cursor:
+        cursor.execute(SEARCH_SQL.format(after=AFTER_SQL if after is not None else ""), params)
+        return [(float(rank), kind, pk, text, amount, day) for kind, pk, text, amount, day, rank in cursor.fetchall()]
+
+
+class InvertedIndex:
+    """
+    In-memory token index of one user's searchable rows, standing in for the PostgreSQL
+    indexes on other databases. Exact tokens are ranked by how often they occur; prefixes
+    stand in for trigram matches and count for half.
+    """
+
+    def __init__(self, documents):
+        # documents: (kind, id, text, amount, day)
+        self.documents = {(kind, pk): (text, amount, day) for kind, pk, text, amount, day in documents}
+        self.postings = defaultdict(lambda: defaultdict(int))
+        for kind, pk, text, _, _ in documents:
+            for token in tokenize(text):
+                self.postings[token][(kind, pk)] += 1
+        self.tokens = sorted(self.postings)
+
+    def prefixed(self, prefix):
+        index = bisect.bisect_left(self.tokens, prefix)
+        while index < len(self.tokens) and self.tokens[index].startswith(prefix):
+            yield self.tokens[index]
+            index += 1
+
+    def search(self, query):
+        """{(kind, id): rank} of the documents containing every query token, or a prefix of it."""
+        ranks = None
+        for term in tokenize(query):
+            scores = defaultdict(float)
+            for token in self.prefixed(term):
+                weight = 1.0 if token == term else 0.5
+                for key, count in self.postings[token].items():
+                    scores[key] += weight * count
+            ranks = scores if ranks is None else {key: ranks[key] + score for key, score in scores.items() if key in ranks}
+            if not ranks:
+                return {}
+        return ranks or {}
+
+
+def load_documents(user_id):
+    kind = {name: position for position, name in enumerate(SEARCH_KINDS, 1)}
+    documents = [
+        (kind["expense"], pk, description, amount, day)
+        for pk, description, amount, day in Expense.objects.filter(budget__user_id=user_id).values_list("id", "description", "amount", "date")
+    ]
+    documents += [
+        (kind["income"], pk, f"{source} {description or ''}", amount, day)
+        for pk, source, description, amount, day in Income.objects.filter(user_id=user_id).values_list("id", "source", "description", "amount", "date")
+    ]
+    documents += [
+        (kind["debt"], pk, creditor_name, amount, day)
+        for pk, creditor_name, amount, day in Debt.objects.filter(user_id=user_id).values_list("id", "creditor_name", "amount", "due_date")
+    ]
+    return documents
+
+
+def get_index(user_id):
+    """The user's InvertedIndex, rebuilt after any expense, income or debt changes."""
+    versions = tuple(get_versions(user_id, ["expenses", "incomes", "debts"]))
+    with _indexes_lock:
+        cached = _indexes.get(user_id)
+        if cached is not None and cached[0] == versions:
+            _indexes.move_to_end(user_id)
+            return cached[1]
+    index = InvertedIndex(load_documents(user_id))
+    with _indexes_lock:
+        _indexes[user_id] = (versions, index)
+        _indexes.move_to_end(user_id)
+        while len(_indexes) > INDEX_CACHE_SIZE:
+            _indexes.popitem(last=False)
+    return index
+
+
+def search_fallback(user_id, query, after, limit):
+    index = get_index(user_id)
+    hits = sorted(((rank, kind, pk) for (kind, pk), rank in index.search(query).items()), reverse=True)
+    if after is not None:
+        hits = [hit for hit in hits if hit < after]
+    return [(rank, kind, pk, *index.documents[(kind, pk)]) for rank, kind, pk in hits[:limit]]
+
+
+def search(user_id, query, cursor=None, page_size=SEARCH_PAGE_SIZE):
+    """
+    One page of the user's expenses, incomes and debts matching `query`, best first.
+
+    Returns (results, next_cursor). PostgreSQL answers from the full-text and trigram
+    indexes; other databases search an in-memory index of the user's rows.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    backend = search_postgres if connections[router.db_for_read(Expense)].vendor == "postgresql" else search_fallback
+    hits = backend(user_id, query, after, page_size + 1)
+    next_cursor = None
+    if len(hits) > page_size:
+        hits = hits[:page_size]
+        next_cursor = encode_cursor(*hits[-1][:3])
+    results = [
+        {"kind": SEARCH_KINDS[kind - 1], "id": pk, "text": text, "amount": amount, "date": day, "rank": rank}
+        for rank, kind, pk, text, amount, day in hits
+    ]
+    return results, next_cursor
@@ -1,6 +1,81 @@
+import operator
 from rest_framework import serializers
-from .models import Goal, Budget, Income, Expense, Debt, BudgetCategory, Notification
+from .models import Goal, Budget, Income, Expense, Debt, BudgetCategory, Notification, CategorizationRule
 from django.contrib.auth.models import User
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from .categorization import BudgetResolver, check_regex
+from .fast_serialization import compile_fields, fast_serialization_enabled, row_lookups, serialize_rows
+from .rollups import record_expense_rollups
+from .spending import expenses_created
+from .summaries import invalidate_spending_summary
+from .versioning import bump_versions
+
+
+class QueryOptimizedMixin:
+    """
+    Builds the queryset a serializer needs to render without extra queries.
+
+    Serializers list the relations they traverse in `Meta.select_related`; the `only()`
+    projection is derived from the declared fields, so the two cannot drift apart.
+    """
+
+    @classmethod
+    def get_projection(cls):
+        if "_projection" not in cls.__dict__:
+            model = cls.Meta.model
+            related = list(getattr(cls.Meta, "select_related", []))
+            names = {model._meta.pk.name}
+            for path in related:
+                parts = path.split("__")
+                names.update("__".join(parts[:i]) for i in range(1, len(parts) + 1))
+
+            for field in cls().fields.values():
+                if field.write_only or field.source == "*":
+                    continue
+                parts = field.source.split(".")
+                current = model
+                for i, part in enumerate(parts):
+                    try:
+                        model_field = current._meta.get_field(part)
+                    except FieldDoesNotExist:
+                        break  # properties such as `remaining` read already-loaded columns
+                    if not model_field.concrete or model_field.many_to_many:
+                        break
+                    if model_field.is_relation and i < len(parts) - 1:
+                        current = model_field.related_model
+                        continue
+                    names.add("__".join(parts[:i + 1]))
+            cls._projection = (related, sorted(names))
+        return cls._projection
+
+    @classmethod
+    def optimize_queryset(cls, queryset, extra_fields=()):
+        related, names = cls.get_projection()
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*names, *extra_fields)
+
+    @classmethod
+    def get_row_fields(cls):
+        # None when some field cannot be rendered from values() rows.
+        if "_row_fields" not in cls.__dict__:
+            cls._row_fields = compile_fields(cls)
+        return cls._row_fields
+
+    @classmethod
+    def paginated_data(cls, queryset, paginator, request):
+        """
+        The serialized page of `queryset`. With settings.FAST_SERIALIZATION the page is
+        fetched with values() and rendered by precompiled extractors (see
+        core.fast_serialization) instead of model instances and field objects.
+        """
+        row_fields = cls.get_row_fields() if fast_serialization_enabled() else None
+        if row_fields is None:
+            return cls(paginator.paginate_queryset(queryset, request), many=True).data
+        lookups = dict.fromkeys([*row_lookups(row_fields), "id", paginator.ordering_field])
+        rows = paginator.paginate_queryset(queryset.values(*lookups), request)
+        return serialize_rows(row_fields, rows)
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -21,7 +96,63 @@ class UserSerializer(serializers.ModelSerializer):
         user.save()
         return user
 
-class BudgetCategorySerializer(serializers.ModelSerializer):
+class OwnedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Accepts only primary keys of rows owned by the requesting user. Inside a bulk
+    payload the rows are looked up once for the whole batch instead of per item.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = self.context.get("request")
+        if request is not None:
+            queryset = queryset.filter(user=request.user)
+        return queryset
+
+    def to_internal_value(self, data):
+        prefetched = self.context.get("prefetched", {}).get(self.field_name)
+        if prefetched is None:
+            return super().to_internal_value(data)
+        try:
+            return prefetched[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
+class BulkCreateListSerializer(serializers.ListSerializer):
+    """Validates a batch with one lookup per related field and inserts it with bulk_create()."""
+    batch_size = 1000
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            prefetched = {}
+            for name, field in self.child.fields.items():
+                if isinstance(field, OwnedPrimaryKeyRelatedField) and not field.read_only:
+                    pks = set()
+                    for item in data:
+                        try:
+                            pks.add(int(item.get(name)))
+                        except (AttributeError, TypeError, ValueError):
+                            continue
+                    prefetched[name] = field.get_queryset().in_bulk(pks)
+            self.context["prefetched"] = prefetched
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        instances = [model(**attrs) for attrs in validated_data]
+        with transaction.atomic():
+            for start in range(0, len(instances), self.batch_size):
+                model.objects.bulk_create(instances[start:start + self.batch_size])
+            bulk_created = getattr(self.child, "bulk_created", None)
+            if bulk_created is not None:
+                bulk_created(instances)
+        return instances
+
+
+class BudgetCategorySerializer(QueryOptimizedMixin, serializers.ModelSerializer):
     class Meta:
         model = BudgetCategory
         fields = ['id', 'name', 'user']
@@ -30,60 +161,146 @@ class BudgetCategorySerializer(serializers.ModelSerializer):
         }
 
 
-class BudgetSerializer(serializers.ModelSerializer):
+class BudgetSerializer(QueryOptimizedMixin, serializers.ModelSerializer):
     category_name = serializers.CharField(source='category.name', read_only=True)
     remaining = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
 
     class Meta:
         model = Budget
-        fields = ['id', 'category', 'category_name', 'allocated_amount', 'spent_amount', 'remaining', 'user', 'created_at']
+        fields = ['id', 'category', 'category_name', 'allocated_amount', 'spent_amount', 'remaining', 'currency', 'user', 'created_at']
+        select_related = ['category']
+        computed_fields = {'remaining': (('allocated_amount', 'spent_amount'), operator.sub)}
         extra_kwargs = {
-            'user': {'read_only': True}
+            'user': {'read_only': True},
+            'spent_amount': {'read_only': True},
         }
 
+    def validate_currency(self, value):
+        # Expenses are recorded in their budget's currency.
+        if self.instance is not None and value != self.instance.currency and self.instance.expenses.exists():
+            raise serializers.ValidationError('The currency of a budget with expenses cannot change.')
+        return value
+
 
-class GoalSerializer(serializers.ModelSerializer):
+class GoalSerializer(QueryOptimizedMixin, serializers.ModelSerializer):
     remaining = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
 
     class Meta:
         model = Goal
-        fields = ['id', 'name', 'target_amount', 'current_savings', 'remaining', 'due_date', 'user', 'created_at']
+        fields = ['id', 'name', 'target_amount', 'current_savings', 'remaining', 'currency', 'due_date', 'user', 'created_at']
+        list_serializer_class = BulkCreateListSerializer
+        computed_fields = {'remaining': (('target_amount', 'current_savings'), operator.sub)}
         extra_kwargs = {
             'user': {'read_only': True}
         }
 
+    def bulk_created(self, goals):
+        for user_id in {goal.user_id for goal in goals}:
+            bump_versions(user_id, "goals")
 
-class IncomeSerializer(serializers.ModelSerializer):
+
+class IncomeSerializer(QueryOptimizedMixin, serializers.ModelSerializer):
     class Meta:
         model = Income
-        fields = ['id', 'amount', 'source', 'description', 'date', 'user', 'created_at']
+        fields = ['id', 'amount', 'currency', 'source', 'description', 'date', 'user', 'created_at']
         extra_kwargs = {
             'user': {'read_only': True}
         }
 
 
-class ExpenseSerializer(serializers.ModelSerializer):
+class ExpenseSerializer(QueryOptimizedMixin, serializers.ModelSerializer):
+    # Left out, the budget is picked by the user's categorization rules.
+    budget = OwnedPrimaryKeyRelatedField(queryset=Budget.objects.all(), required=False)
     budget_name = serializers.CharField(source='budget.category.name', read_only=True)
 
     class Meta:
         model = Expense
-        fields = ['id', 'amount', 'description', 'budget', 'budget_name', 'date', 'created_at', 'recurring']
+        fields = ['id', 'amount', 'currency', 'description', 'budget', 'budget_name', 'date', 'created_at', 'recurring']
+        select_related = ['budget__category']
+        list_serializer_class = BulkCreateListSerializer
         extra_kwargs = {
             'user': {'read_only': True},
-            'budget': {'required': True},
+            'currency': {'read_only': True},  # always the budget's
         }
 
+    def validate(self, data):
+        if self.instance is None and data.get('budget') is None:
+            request = self.context.get('request')
+            budget = None
+            if request is not None:
+                # Shared by every item of a bulk payload, so the rules are compiled once.
+                resolver = self.context.get('budget_resolver')
+                if resolver is None:
+                    resolver = self.context['budget_resolver'] = BudgetResolver(request.user.id)
+                budget = resolver.resolve(data.get('description', ''), data['amount'], data['date'])
+            if budget is None:
+                raise serializers.ValidationError({'budget': 'No budget given and no categorization rule matched.'})
+            data['budget'] = budget
+        if data.get('budget') is not None:
+            data['currency'] = data['budget'].currency
+        return data
+
+    def bulk_created(self, expenses):
+        expenses_created(expenses)
+        record_expense_rollups(expenses)
+        for user_id in {expense.budget.user_id for expense in expenses}:
+            invalidate_spending_summary(user_id)
+            bump_versions(user_id, "expenses")
 
-class DebtSerializer(serializers.ModelSerializer):
+
+class DebtSerializer(QueryOptimizedMixin, serializers.ModelSerializer):
     class Meta:
         model = Debt
-        fields = ['id', 'amount', 'creditor_name', 'description', 'due_date', 'user', 'created_at']
+        fields = ['id', 'amount', 'currency', 'creditor_name', 'description', 'due_date', 'interest_rate', 'minimum_payment', 'user', 'created_at']
         extra_kwargs = {
             'user': {'read_only': True}
         }
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(QueryOptimizedMixin, serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = ['id', 'message', 'is_read', 'created_at']
+
+
+class CategorizationRuleSerializer(QueryOptimizedMixin, serializers.ModelSerializer):
+    category = OwnedPrimaryKeyRelatedField(queryset=BudgetCategory.objects.all())
+
+    class Meta:
+        model = CategorizationRule
+        fields = ['id', 'category', 'match_type', 'pattern', 'min_amount', 'max_amount', 'priority', 'created_at']
+
+    def validate(self, data):
+        # A partial update is checked against the stored values it leaves in place.
+        match_type = data.get('match_type', getattr(self.instance, 'match_type', CategorizationRule.CONTAINS))
+        if match_type == CategorizationRule.REGEX:
+            try:
+                check_regex(data.get('pattern', getattr(self.instance, 'pattern', '')))
+            except ValueError as e:
+                raise serializers.ValidationError({'pattern': str(e)})
+        min_amount = data.get('min_amount', getattr(self.instance, 'min_amount', None))
+        max_amount = data.get('max_amount', getattr(self.instance, 'max_amount', None))
+        if min_amount is not None and max_amount is not None and min_amount > max_amount:
+            raise serializers.ValidationError({'max_amount': 'Must not be less than min_amount.'})
+        return data
+
+
+class PayoffScenarioSerializer(serializers.Serializer):
+    strategy = serializers.ChoiceField(choices=['avalanche', 'snowball', 'custom'], default='avalanche')
+    extra_payment = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, default=0)
+    order = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+
+    def validate(self, data):
+        if data['strategy'] == 'custom' and not data['order']:
+            raise serializers.ValidationError({'order': 'Custom strategy needs the debt ids in payoff order.'})
+        return data
+
+
+class PayoffPlanSerializer(serializers.Serializer):
+    scenarios = PayoffScenarioSerializer(many=True, required=False)
+    max_months = serializers.IntegerField(min_value=1, max_value=600, default=360)
+
+    def validate_scenarios(self, scenarios):
+        if len(scenarios) > 100:
+            raise serializers.ValidationError('At most 100 scenarios per request.')
+        return scenarios
@@ -0,0 +1,161 @@
+from django.db import transaction
+from django.db.models.signals import post_init, pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from .alerts import evaluate_budget_alerts
+from .broker import publish_notification
+from .models import Goal, Budget, Income, Expense, Debt, BudgetCategory, Notification, CategorizationRule
+from .rollups import RollupDeltas, budget_owners, cached_budgets, move_budget_rollups
+from .spending import record_spent_delta, to_amount
+from .summaries import invalidate_spending_summary
+from .sync import record_tombstone
+from .versioning import bump_versions
+
+# Stored values each model remembers so a save or delete can undo what it previously counted.
+TRACKED_FIELDS = {
+    Expense: ("budget_id", "amount", "date", "currency"),
+    Income: ("user_id", "amount", "date", "currency"),
+    Budget: ("category_id",),
+}
+
+# Versioned resources (see core.versioning) whose contents change with a row of the model.
+VERSIONED_RESOURCES = {
+    Goal: ("goals",),
+    Budget: ("budgets", "expenses"),  # expenses show their budget's category
+    Income: ("incomes",),
+    Debt: ("debts",),
+    BudgetCategory: ("categories", "budgets", "expenses"),
+    Notification: ("notifications",),
+    CategorizationRule: ("rules",),  # also invalidates compiled matchers, see core.categorization
+}
+
+
+def track(instance):
+    # Read through __dict__ so deferred fields are not loaded just to be tracked.
+    instance._tracked = tuple(instance.__dict__.get(name) for name in TRACKED_FIELDS[type(instance)])
+
+
+@receiver(post_init, sender=Budget)
+@receiver(post_init, sender=Income)
+@receiver(post_init, sender=Expense)
+def tracked_loaded(sender, instance, **kwargs):
+    track(instance)
+
+
+@receiver(pre_save, sender=Income)
+@receiver(pre_save, sender=Expense)
+@receiver(pre_delete, sender=Income)
+@receiver(pre_delete, sender=Expense)
+def tracked_writing(sender, instance, **kwargs):
+    if instance._state.adding or None not in instance._tracked:
+        return
+    # The instance was loaded without some tracked fields, so read the stored values.
+    fields = TRACKED_FIELDS[sender]
+    instance._tracked = sender.objects.filter(pk=instance.pk).values_list(*fields).first() or (None,) * len(fields)
+
+
+@receiver(post_save, sender=Budget)
+def budget_saved(sender, instance, created, **kwargs):
+    old_category_id, = instance._tracked
+    if not created and old_category_id is not None and old_category_id != instance.category_id:
+        move_budget_rollups(instance.pk, instance.user_id, old_category_id, instance.category_id)
+    track(instance)
+    invalidate_spending_summary(instance.user_id)
+    if not created:  # a new budget has spent nothing yet
+        evaluate_budget_alerts([instance.pk])
+
+
+@receiver(post_delete, sender=Budget)
+def budget_deleted(sender, instance, **kwargs):
+    invalidate_spending_summary(instance.user_id)
+
+
+@receiver(post_delete, sender=Goal)
+@receiver(post_delete, sender=Budget)
+@receiver(post_delete, sender=Income)
+@receiver(post_delete, sender=Debt)
+@receiver(post_delete, sender=BudgetCategory)
+@receiver(post_delete, sender=Notification)
+def owned_row_deleted(sender, instance, **kwargs):
+    record_tombstone(instance, instance.user_id)
+
+
+@receiver(post_save, sender=Goal)
+@receiver(post_save, sender=Budget)
+@receiver(post_save, sender=Income)
+@receiver(post_save, sender=Debt)
+@receiver(post_save, sender=BudgetCategory)
+@receiver(post_save, sender=Notification)
+@receiver(post_save, sender=CategorizationRule)
+@receiver(post_delete, sender=Goal)
+@receiver(post_delete, sender=Budget)
+@receiver(post_delete, sender=Income)
+@receiver(post_delete, sender=Debt)
+@receiver(post_delete, sender=BudgetCategory)
+@receiver(post_delete, sender=Notification)
+@receiver(post_delete, sender=CategorizationRule)
+def owned_row_changed(sender, instance, **kwargs):
+    bump_versions(instance.user_id, *VERSIONED_RESOURCES[sender])
+
+
+@receiver(post_save, sender=Expense)
+def expense_saved(sender, instance, created, **kwargs):
+    old_budget_id, old_amount, old_date, old_currency = (None,) * 4 if created else instance._tracked
+    owners = budget_owners((old_budget_id, instance.budget_id), cached_budgets([instance]))
+    deltas = RollupDeltas()
+    if old_budget_id is not None:
+        record_spent_delta(old_budget_id, -to_amount(old_amount))
+        if old_budget_id in owners:
+            deltas.add(Expense, *owners[old_budget_id], old_date, -to_amount(old_amount), -1, old_currency)
+    record_spent_delta(instance.budget_id, to_amount(instance.amount))
+    if instance.budget_id in owners:
+        deltas.add(Expense, *owners[instance.budget_id], instance.date, instance.amount, 1, instance.currency)
+    deltas.apply()
+    track(instance)
+    for user_id in {user_id for user_id, _ in owners.values()}:
+        invalidate_spending_summary(user_id)
+        bump_versions(user_id, "expenses")
+
+
+@receiver(post_delete, sender=Expense)
+def expense_deleted(sender, instance, **kwargs):
+    budget_id, amount, day, currency = instance._tracked
+    if budget_id is None:
+        return
+    record_spent_delta(budget_id, -to_amount(amount))
+    owners = budget_owners((budget_id,), cached_budgets([instance]))
+    if budget_id in owners:
+        user_id, category_id = owners[budget_id]
+        deltas = RollupDeltas()
+        deltas.add(Expense, user_id, category_id, day, -to_amount(amount), -1, currency)
+        deltas.apply()
+        record_tombstone(instance, user_id)
+        invalidate_spending_summary(user_id)
+        bump_versions(user_id, "expenses")
+
+
+@receiver(post_save, sender=Income)
+def income_saved(sender, instance, created, **kwargs):
+    deltas = RollupDeltas()
+    if not created:
+        old_user_id, old_amount, old_date, old_currency = instance._tracked
+        if old_user_id is not None:
+            deltas.add(Income, old_user_id, None, old_date, -to_amount(old_amount), -1, old_currency)
+    deltas.add(Income, instance.user_id, None, instance.date, instance.amount, 1, instance.currency)
+    deltas.apply()
+    track(instance)
+
+
+@receiver(post_delete, sender=Income)
+def income_deleted(sender, instance, **kwargs):
+    user_id, amount, day, currency = instance._tracked
+    if user_id is not None:
+        deltas = RollupDeltas()
+        deltas.add(Income, user_id, None, day, -to_amount(amount), -1, currency)
+        deltas.apply()
+
+
+@receiver(post_save, sender=Notification)
+def notification_saved(sender, instance, created, **kwargs):
+    if created:
+        # Subscribers may fetch the row as soon as they hear of it, so wait for the commit.
+        transaction.on_commit(lambda: publish_notification(instance))
@@ -0,0 +1,75 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Now
+from .alerts import evaluate_budget_alerts
+from .models import Budget, Expense
+
+_pending_deltas = ContextVar("pending_spent_deltas", default=None)
+
+
+def to_amount(value):
+    return Expense._meta.get_field("amount").to_python(value)
+
+
+def apply_spent_deltas(deltas):
+    """
+    Add each {budget_id: amount} delta to Budget.spent_amount with one atomic UPDATE per
+    budget, then raise the alerts of the budgets whose spending grew.
+    """
+    for budget_id, delta in deltas.items():
+        if delta:
+            Budget.objects.filter(pk=budget_id).update(spent_amount=F("spent_amount") + delta, updated_at=Now())
+    evaluate_budget_alerts([budget_id for budget_id, delta in deltas.items() if delta > 0])
+
+
+def record_spent_delta(budget_id, delta):
+    pending = _pending_deltas.get()
+    if pending is None:
+        apply_spent_deltas({budget_id: delta})
+    else:
+        pending[budget_id] += delta
+
+
+def expenses_created(expenses):
+    """Account for expenses inserted without signals, e.g. through bulk_create()."""
+    deltas = defaultdict(Decimal)
+    for expense in expenses:
+        deltas[expense.budget_id] += to_amount(expense.amount)
+    for budget_id, delta in deltas.items():
+        record_spent_delta(budget_id, delta)
+
+
+@contextmanager
+def batched_spent_updates():
+    """
+    Collect spent_amount deltas from the expense signals and flush them once per budget
+    on exit. Wrap in transaction.atomic() together with the writes it batches.
+    """
+    if _pending_deltas.get() is not None:
+        yield
+        return
+    pending = defaultdict(Decimal)
+    token = _pending_deltas.set(pending)
+    try:
+        yield
+    finally:
+        _pending_deltas.reset(token)
+    apply_spent_deltas(pending)
+
+
+def reconcile_spent_amounts(budget_ids):
+    """Recompute spent_amount from the expense rows of the given budgets."""
+    spent = (
+        Expense.objects.filter(budget=OuterRef("pk"))
+        .order_by()
+        .values("budget")
+        .annotate(total=Sum("amount"))
+        .values("total")
+    )
+    return Budget.objects.filter(pk__in=budget_ids).update(
+        spent_amount=Coalesce(Subquery(spent), Value(Decimal("0.00"))),
+        updated_at=Now(),
+    )
@@ -0,0 +1,105 @@
+from datetime import date
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+from .currency import convert, convert_totals
+from .models import Goal, Budget, Debt, MonthlyRollup, Notification
+from .versioning import bump_versions
+
+SPENDING_SUMMARY_KEY = "spending-summary:{user_id}"
+# Invalidation reaches every worker only through a shared cache (see the core.W001
+# check); the timeout bounds how stale a process-local copy can get without one.
+SPENDING_SUMMARY_TIMEOUT = 60 * 5
+
+
+def compute_spending_summary(user_id):
+    """Allocated and spent totals of the user's budgets as {currency: total}."""
+    rows = (
+        Budget.objects.filter(user_id=user_id).order_by().values("currency")
+        .annotate(total_allocated=Sum("allocated_amount"), total_spent=Sum("spent_amount"))
+    )
+    return {
+        "allocated": {row["currency"]: row["total_allocated"] for row in rows},
+        "spent": {row["currency"]: row["total_spent"] for row in rows},
+    }
+
+
+def get_spending_summary(user_id, currency):
+    # The cache holds totals per currency, so today's rates apply without recomputing.
+    key = SPENDING_SUMMARY_KEY.format(user_id=user_id)
+    totals = cache.get(key)
+    if totals is None:
+        totals = compute_spending_summary(user_id)
+        cache.set(key, totals, SPENDING_SUMMARY_TIMEOUT)
+    today = date.today()
+    total_allocated = convert_totals(totals["allocated"], today, currency)
+    total_spent = convert_totals(totals["spent"], today, currency)
+    return {
+        "currency": currency,
+        "total_allocated": total_allocated,
+        "total_spent": total_spent,
+        "remaining_budget": total_allocated - total_spent,
+    }
+
+
+def invalidate_spending_summary(user_id):
+    # After the commit, or a concurrent read could cache the old totals again.
+    transaction.on_commit(lambda: cache.delete(SPENDING_SUMMARY_KEY.format(user_id=user_id)))
+    # Allocated and spent amounts are shown in the budget list as well.
+    bump_versions(user_id, "spending", "budgets")
+
+
+def compute_income_expense_summary(user_id, currency):
+    # Summing the monthly rollups reads a few rows per month instead of every transaction,
+    # and each month converts at its own rate.
+    rows = list(
+        MonthlyRollup.objects.filter(user_id=user_id).order_by().values("kind", "currency", "month")
+        .annotate(total=Sum("total")).values_list("kind", "currency", "month", "total")
+    )
+    converted = convert([row[3] for row in rows], [row[1] for row in rows], [row[2] for row in rows], currency)
+    totals = {MonthlyRollup.INCOME: Decimal("0.00"), MonthlyRollup.EXPENSE: Decimal("0.00")}
+    for (kind, _, _, _), total in zip(rows, converted):
+        totals[kind] += total
+    total_income = totals[MonthlyRollup.INCOME]
+    total_expense = totals[MonthlyRollup.EXPENSE]
+    return {
+        "currency": currency,
+        "total_income": total_income,
+        "total_expense": total_expense,
+        "balance": total_income - total_expense,
+    }
+
+
+def compute_debt_summary(user_id, currency):
+    rows = (
+        Debt.objects.filter(user_id=user_id).order_by().values("currency")
+        .annotate(total_debt=Sum("amount"), total_paid=Sum("paid_amount"))
+    )
+    today = date.today()
+    total_debt = convert_totals({row["currency"]: row["total_debt"] for row in rows}, today, currency)
+    total_paid = convert_totals({row["currency"]: row["total_paid"] for row in rows}, today, currency)
+    return {
+        "currency": currency,
+        "total_debt": total_debt,
+        "total_paid": total_paid,
+        "remaining_debt": total_debt - total_paid,
+    }
+
+
+def build_dashboard(user_id, currency, goal_limit=100):
+    from .serializers import GoalSerializer  # serializers import this module
+
+    goals = GoalSerializer.optimize_queryset(Goal.objects.filter(user_id=user_id)).order_by("-created_at", "-id")
+    notifications = (
+        Notification.objects.filter(user_id=user_id, is_read=False)
+        .order_by("-created_at", "-id")
+        .values("id", "message", "created_at")
+    )
+    return {
+        "spending": get_spending_summary(user_id, currency),
+        "income_expense": compute_income_expense_summary(user_id, currency),
+        "debts": compute_debt_summary(user_id, currency),
+        "goals": GoalSerializer(goals[:goal_limit], many=True).data,
+        "notifications": list(notifications),
+    }
@@ -0,0 +1,138 @@
+import base64
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import DateTimeField, Max, Min, Q
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from .models import Goal, Budget, Income, Expense, Debt, BudgetCategory, Notification, Tombstone, TombstoneWatermark
+from .serializers import (
+    GoalSerializer, BudgetSerializer, IncomeSerializer, ExpenseSerializer, DebtSerializer,
+    BudgetCategorySerializer, NotificationSerializer,
+)
+
+# Query parameter -> (model, serializer, lookup of the owning user)
+SYNC_RESOURCES = {
+    "goals": (Goal, GoalSerializer, "user_id"),
+    "budgets": (Budget, BudgetSerializer, "user_id"),
+    "incomes": (Income, IncomeSerializer, "user_id"),
+    "expenses": (Expense, ExpenseSerializer, "budget__user_id"),
+    "debts": (Debt, DebtSerializer, "user_id"),
+    "categories": (BudgetCategory, BudgetCategorySerializer, "user_id"),
+    "notifications": (Notification, NotificationSerializer, "user_id"),
+}
+SYNC_MODELS = {model: name for name, (model, _, _) in SYNC_RESOURCES.items()}
+SYNC_PAGE_SIZE = 500
+
+
+def encode_cursor(updated_at, pk, tombstone_id):
+    raw = json.dumps([updated_at.isoformat() if updated_at else None, pk, tombstone_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, pk, tombstone_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        updated_at = DateTimeField().to_python(updated_at) if updated_at else None
+        if not isinstance(pk, int) or not isinstance(tombstone_id, int):
+            raise ValueError
+        return updated_at, pk, tombstone_id
+    except (TypeError, ValueError, ValidationError):
+        raise ParseError("Invalid sync cursor.")
+
+
+def record_tombstone(instance, user_id):
+    Tombstone.objects.create(user_id=user_id, model=SYNC_MODELS[type(instance)], object_id=instance.pk)
+
+
+def settled(items, horizon, timestamp):
+    """The leading items whose timestamp is at or before `horizon`."""
+    count = 0
+    for item in items:
+        if timestamp(item) > horizon:
+            break
+        count += 1
+    return items[:count]
+
+
+def sync_resource(user_id, name, cursor, pruned_through, horizon, page_size=SYNC_PAGE_SIZE):
+    """
+    Rows of one resource changed or deleted after `cursor`.
+
+    Changed rows are read in (updated_at, id) order and deletions in tombstone id order,
+    both capped at page_size, so a client that sees has_more simply asks again with the
+    returned cursor. Timestamps and ids are taken before a write commits, so a later
+    sync can still see older ones: the cursor only moves past rows and tombstones from
+    before `horizon`, and newer ones are sent again next time. A cursor older than the
+    deletions pruned for this user (`pruned_through`) may have missed some, and the
+    client is told to reset and gets a full copy.
+    """
+    model, serializer_class, owner = SYNC_RESOURCES[name]
+    updated_at, pk, tombstone_id = decode_cursor(cursor) if cursor else (None, 0, 0)
+    reset = cursor is not None and tombstone_id < pruned_through
+    full_copy = cursor is None or reset
+    if reset:
+        updated_at, pk = None, 0
+
+    queryset = model.objects.filter(**{owner: user_id})
+    if updated_at is not None:
+        queryset = queryset.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=pk))
+    queryset = serializer_class.optimize_queryset(queryset, extra_fields=["updated_at"]).order_by("updated_at", "id")
+    rows = list(queryset[:page_size + 1])
+    more_rows = len(rows) > page_size
+    rows = rows[:page_size]
+    settled_rows = settled(rows, horizon, lambda row: row.updated_at)
+    if settled_rows:
+        updated_at, pk = settled_rows[-1].updated_at, settled_rows[-1].id
+
+    tombstones = Tombstone.objects.filter(user_id=user_id, model=name)
+    deleted = settled_deleted = []
+    more_deleted = False
+    if full_copy:
+        # The copy already lacks every deleted row, so start after the settled tombstones.
+        bounds = tombstones.aggregate(last=Max("id"), pending=Min("id", filter=Q(deleted_at__gt=horizon)))
+        tombstone_id = max(pruned_through, bounds["pending"] - 1 if bounds["pending"] else bounds["last"] or 0)
+    else:
+        deleted = list(tombstones.filter(id__gt=tombstone_id).order_by("id").values_list("id", "object_id", "deleted_at")[:page_size + 1])
+        more_deleted = len(deleted) > page_size
+        deleted = deleted[:page_size]
+        settled_deleted = settled(deleted, horizon, lambda tombstone: tombstone[2])
+        if settled_deleted:
+            tombstone_id = settled_deleted[-1][0]
+
+    # Rows past the horizon are sent again, so only a page that settled entirely can end early.
+    has_more = (more_rows and len(settled_rows) == len(rows)) or (more_deleted and len(settled_deleted) == len(deleted))
+    return {
+        "updated": serializer_class(rows, many=True).data,
+        "deleted": [object_id for _, object_id, _ in deleted],
+        "cursor": encode_cursor(updated_at, pk, tombstone_id),
+        "has_more": has_more,
+        "reset": reset,
+    }
+
+
+def sync(user_id, cursors):
+    """Changes for every resource; `cursors` maps resource names to the cursors the client holds."""
+    horizon = timezone.now() - timedelta(seconds=getattr(settings, "SYNC_SETTLE_SECONDS", 300))
+    pruned = dict(TombstoneWatermark.objects.filter(user_id=user_id).values_list("model", "pruned_through"))
+    return {
+        name: sync_resource(user_id, name, cursors.get(name), pruned.get(name, 0), horizon)
+        for name in SYNC_RESOURCES
+    }
+
+
+def prune_tombstones(older_than):
+    """Delete old tombstones, recording the newest one pruned for each user and resource."""
+    with transaction.atomic():
+        pruned = Tombstone.objects.filter(deleted_at__lt=older_than)
+        watermarks = [
+            TombstoneWatermark(user_id=row["user_id"], model=row["model"], pruned_through=row["last"])
+            for row in pruned.order_by().values("user_id", "model").annotate(last=Max("id"))
+        ]
+        TombstoneWatermark.objects.bulk_create(
+            watermarks, update_conflicts=True, unique_fields=["user", "model"], update_fields=["pruned_through"]
+        )
+        return pruned.delete()[0]
@@ -0,0 +1,170 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from .models import Goal, Budget, Income, Expense, Debt, BudgetCategory, Notification, Tombstone, TombstoneWatermark
+from .rollups import rebuild_rollups
+from .spending import reconcile_spent_amounts
+
+SYNTHETIC_PREFIX = "synthetic-"
+START_DATE = date(2020, 1, 1)
+HISTORY_DAYS = 5 * 365
+
+CATEGORIES = ["Groceries", "Rent", "Transport", "Dining", "Utilities", "Entertainment", "Health", "Travel"]
+MERCHANTS = {
+    "Groceries": ["Whole Foods", "Trader Joe's", "Costco", "Safeway"],
+    "Rent": ["Landlord LLC", "Property Management"],
+    "Transport": ["Uber", "Shell", "Metro Card", "Lyft"],
+    "Dining": ["Starbucks", "Chipotle", "Local Diner", "Pizza Place"],
+    "Utilities": ["PG&E", "Comcast", "Water Dept"],
+    "Entertainment": ["Netflix", "Spotify", "Cinema", "Steam"],
+    "Health": ["CVS Pharmacy", "Gym Membership", "Dental Care"],
+    "Travel": ["Delta Airlines", "Airbnb", "Marriott"],
+}
+INCOME_SOURCES = ["Salary", "Freelance", "Dividends", "Refund", "Gift"]
+GOALS = ["Emergency Fund", "Vacation", "New Car", "House Deposit", "Wedding"]
+CREDITORS = ["Chase Visa", "Student Loan", "Car Loan", "Amex", "Mortgage"]
+
+# Share of transactional rows that go to each table.
+MIX = {Expense: 0.6, Income: 0.25, Notification: 0.15}
+
+
+def random_amount(rng, low, high):
+    return Decimal(rng.randint(int(low * 100), int(high * 100))) / 100
+
+
+def random_date(rng, days=HISTORY_DAYS):
+    return START_DATE + timedelta(days=rng.randrange(days))
+
+
+class SyntheticUser:
+    def __init__(self, user, budgets, weight):
+        self.user = user
+        self.budgets = budgets  # list of (budget, category name)
+        self.weight = weight
+
+
+def create_users(count, rng, batch_size):
+    """Create users with categories, budgets, goals and debts; activity follows a heavy-tailed weight."""
+    User = get_user_model()
+    start = User.objects.filter(username__startswith=SYNTHETIC_PREFIX).count()
+    users = User.objects.bulk_create(
+        [User(username=f"{SYNTHETIC_PREFIX}{start + i}", email=f"{SYNTHETIC_PREFIX}{start + i}@example.com") for i in range(count)],
+        batch_size=batch_size,
+    )
+
+    plans = [(user, rng.sample(CATEGORIES, rng.randint(3, 6))) for user in users]
+    categories = BudgetCategory.objects.bulk_create(
+        [BudgetCategory(user=user, name=name) for user, names in plans for name in names], batch_size=batch_size
+    )
+    budgets = Budget.objects.bulk_create(
+        [Budget(user=category.user, category=category, allocated_amount=random_amount(rng, 100, 2000)) for category in categories],
+        batch_size=batch_size,
+    )
+    Goal.objects.bulk_create(
+        [
+            Goal(
+                user=user,
+                name=name,
+                target_amount=random_amount(rng, 1000, 50000),
+                current_savings=random_amount(rng, 0, 1000),
+                due_date=date.today() + timedelta(days=rng.randint(30, 5 * 365)),
+            )
+            for user in users for name in rng.sample(GOALS, rng.randint(1, 3))
+        ],
+        batch_size=batch_size,
+    )
+    Debt.objects.bulk_create(
+        [
+            Debt(
+                user=user,
+                creditor_name=name,
+                amount=random_amount(rng, 500, 30000),
+                due_date=date.today() + timedelta(days=rng.randint(1, 365)),
+            )
+            for user in users for name in rng.sample(CREDITORS, rng.randint(0, 3))
+        ],
+        batch_size=batch_size,
+    )
+
+    by_user = {}
+    for budget in budgets:
+        by_user.setdefault(budget.user_id, []).append((budget, budget.category.name))
+    return [SyntheticUser(user, by_user[user.id], rng.paretovariate(1.2)) for user in users]
+
+
+def build_row(model, owner, rng):
+    if model is Expense:
+        budget, category = rng.choice(owner.budgets)
+        return Expense(
+            budget=budget,
+            description=rng.choice(MERCHANTS[category]),
+            amount=random_amount(rng, 1, 300),
+            date=random_date(rng),
+            recurring=category in ("Rent", "Utilities") and rng.random() < 0.5,
+        )
+    if model is Income:
+        source = rng.choice(INCOME_SOURCES)
+        return Income(
+            user=owner.user,
+            source=source,
+            amount=random_amount(rng, 2000, 6000) if source == "Salary" else random_amount(rng, 10, 1500),
+            date=random_date(rng),
+            recurring=source == "Salary",
+        )
+    return Notification(user=owner.user, message="Budget reminder", is_read=rng.random() < 0.9)
+
+
+def generate_dataset(rows, users=None, seed=0, batch_size=10000, stdout=None):
+    """
+    Create `rows` synthetic transactional rows (expenses, incomes, notifications) for new users.
+
+    The same seed always produces the same data. Everything is written with bulk_create
+    and spent_amount and the monthly rollups are rebuilt at the end, so loading millions
+    of rows stays fast.
+    Returns the SyntheticUser list, heaviest user first.
+    """
+    if not settings.DEBUG:
+        raise ImproperlyConfigured("Synthetic data is only loaded with DEBUG on, into a scratch database.")
+    rng = random.Random(seed)
+    users = users or max(1, rows // 1000)
+    owners = create_users(users, rng, batch_size)
+    weights = [owner.weight for owner in owners]
+
+    for model, share in MIX.items():
+        total = int(rows * share)
+        for start in range(0, total, batch_size):
+            size = min(batch_size, total - start)
+            batch_owners = rng.choices(owners, weights=weights, k=size)
+            model.objects.bulk_create([build_row(model, owner, rng) for owner in batch_owners])
+            if stdout is not None:
+                stdout.write(f"{model.__name__}: {start + size}/{total}")
+
+    budget_ids = [budget.id for owner in owners for budget, _ in owner.budgets]
+    for start in range(0, len(budget_ids), batch_size):
+        reconcile_spent_amounts(budget_ids[start:start + batch_size])
+    user_ids = [owner.user.id for owner in owners]
+    for start in range(0, len(user_ids), batch_size):
+        rebuild_rollups(user_ids[start:start + batch_size])
+    return sorted(owners, key=lambda owner: owner.weight, reverse=True)
+
+
+def delete_synthetic_users(batch_size=100):
+    """
+    Delete the synthetic users, a chunk at a time, together with everything they own
+    and the sync tombstones and watermarks their rows left behind. Returns the number of users deleted.
+    """
+    User = get_user_model()
+    deleted = 0
+    while True:
+        user_ids = list(User.objects.filter(username__startswith=SYNTHETIC_PREFIX).values_list("id", flat=True)[:batch_size])
+        if not user_ids:
+            return deleted
+        with transaction.atomic():
+            User.objects.filter(id__in=user_ids).delete()
+            Tombstone.objects.filter(user_id__in=user_ids).delete()
+            TombstoneWatermark.objects.filter(user_id__in=user_ids).delete()
+        deleted += len(user_ids)
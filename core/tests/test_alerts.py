@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from core.alerts import evaluate_alerts, evaluate_rule
+from core.models import Goal, Budget, Expense, Debt, BudgetCategory, Notification
+from core.versioning import get_versions
+
+User = get_user_model()
+
+
+class AlertTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.category = BudgetCategory.objects.create(user=self.user, name="Food")
+        self.today = timezone.localdate()
+        self.budget = Budget.objects.create(
+            user=self.user, category=self.category, allocated_amount=Decimal("100.00"),
+            start_date=self.today - timedelta(days=5), end_date=self.today + timedelta(days=25),
+        )
+
+    def spend(self, amount):
+        Expense.objects.create(budget=self.budget, description="Groceries", amount=Decimal(amount), date=self.today)
+
+    def test_budget_alert_raised_once_when_spending_crosses_threshold(self):
+        self.spend("50.00")
+        self.assertFalse(Notification.objects.exists())
+
+        versions = get_versions(self.user.id, ["notifications"])
+        with mock.patch("core.alerts.publish_notification") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.spend("35.00")
+        notification = Notification.objects.get()
+        self.assertEqual(notification.alert_key, f"budget:{self.budget.id}:spent-80")
+        self.assertEqual(notification.message, "You have spent 85% of your Food budget.")
+        publish.assert_called_once_with(notification)
+        self.assertNotEqual(get_versions(self.user.id, ["notifications"]), versions)
+
+        self.spend("10.00")
+        evaluate_alerts()
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_lowering_allocation_raises_budget_alert(self):
+        self.spend("60.00")
+        self.budget.refresh_from_db()
+        self.budget.allocated_amount = Decimal("70.00")
+        self.budget.save()
+        self.assertEqual(Notification.objects.get().message, "You have spent 85% of your Food budget.")
+
+    def test_sweep_raises_debt_and_goal_alerts_once(self):
+        Debt.objects.create(user=self.user, creditor_name="Bank", amount=Decimal("300.00"), paid_amount=Decimal("100.00"), due_date=self.today + timedelta(days=2))
+        Debt.objects.create(user=self.user, creditor_name="Later", amount=Decimal("300.00"), due_date=self.today + timedelta(days=10))
+        Debt.objects.create(user=self.user, creditor_name="Paid", amount=Decimal("300.00"), paid_amount=Decimal("300.00"), due_date=self.today)
+        behind = Goal.objects.create(user=self.user, name="Car", target_amount=Decimal("1000.00"), current_savings=Decimal("100.00"), due_date=self.today + timedelta(days=50))
+        on_track = Goal.objects.create(user=self.user, name="Trip", target_amount=Decimal("1000.00"), current_savings=Decimal("600.00"), due_date=self.today + timedelta(days=50))
+        Goal.objects.filter(pk__in=[behind.pk, on_track.pk]).update(created_at=timezone.now() - timedelta(days=50))
+
+        self.assertEqual(evaluate_alerts(), {"budget": 0, "debt": 1, "goal": 1})
+        messages = set(Notification.objects.values_list("message", flat=True))
+        self.assertEqual(messages, {
+            f"Your payment of $200.00 to Bank is due on {self.today + timedelta(days=2)}.",
+            "Your goal Car is behind schedule: $100.00 of $1000.00 saved.",
+        })
+        self.assertEqual(evaluate_alerts(), {"budget": 0, "debt": 0, "goal": 0})
+
+    def test_sweep_pages_through_chunks(self):
+        for index in range(5):
+            Debt.objects.create(user=self.user, creditor_name=f"Bank {index}", amount=Decimal("10.00"), due_date=self.today)
+        self.assertEqual(evaluate_rule("debt", chunk_size=2), 5)
+        call_command("evaluate_alerts", chunk_size=2, stdout=mock.Mock())
+        self.assertEqual(Notification.objects.count(), 5)
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import threading
+from unittest import mock
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from core.broker import LocalBroker, get_broker, notification_channel
+from core.models import Notification
+from core.views import NotificationStreamView
+
+User = get_user_model()
+
+
+class LocalBrokerTestCase(TestCase):
+    async def test_publish_from_another_thread_reaches_subscribers(self):
+        broker = LocalBroker()
+        async with broker.subscribe("notifications:1") as first, broker.subscribe("notifications:1") as second:
+            thread = threading.Thread(target=broker.publish, args=("notifications:1", {"id": 1}))
+            thread.start()
+            thread.join()
+            self.assertEqual(await asyncio.wait_for(first.get(), 1), {"id": 1})
+            self.assertEqual(await asyncio.wait_for(second.get(), 1), {"id": 1})
+        self.assertEqual(broker.subscribers, {})
+
+    async def test_slow_subscriber_drops_oldest(self):
+        broker = LocalBroker()
+        async with broker.subscribe("channel") as queue:
+            for index in range(queue.maxsize + 5):
+                broker.publish("channel", index)
+            await asyncio.sleep(0)
+            self.assertEqual(queue.qsize(), queue.maxsize)
+            self.assertEqual(queue.get_nowait(), 5)
+
+
+class NotificationStreamTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.backlog = Notification.objects.create(user=self.user, message="Welcome")
+        self.token = str(AccessToken.for_user(self.user))
+
+    def create_notification(self, message):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Notification.objects.create(user=self.user, message=message)
+
+    async def test_stream_endpoint_sends_backlog(self):
+        # The response's wrapper does not close the stream it wraps; a server cancels it
+        # on disconnect, so keep hold of it here and close it the same way.
+        streams = []
+        original = NotificationStreamView.events
+
+        def events(view, *args, **kwargs):
+            streams.append(original(view, *args, **kwargs))
+            return streams[-1]
+
+        with mock.patch.object(NotificationStreamView, "events", events):
+            response = await self.async_client.get("/notifications/stream/", headers={"Authorization": f"Bearer {self.token}"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        first = await asyncio.wait_for(anext(aiter(response.streaming_content)), 1)
+        await streams[0].aclose()
+        self.assertEqual(first.decode(), (
+            f"id: 0:{self.backlog.id}\nevent: notification\n"
+            f'data: {{"id": {self.backlog.id}, "message": "Welcome", "created_at": "{self.backlog.created_at.isoformat()}"}}\n\n'
+        ))
+
+    async def test_malformed_authorization_is_rejected(self):
+        response = await self.async_client.get("/notifications/stream/", headers={"Authorization": "Bearer"})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_events_push_new_notifications_and_heartbeats(self):
+        view = NotificationStreamView()
+        view.heartbeat_seconds = 0.01
+        events = view.events(self.user.id, floor=self.backlog.id)
+        self.assertEqual(await asyncio.wait_for(anext(events), 1), ": keepalive\n\n")
+
+        created = await sync_to_async(self.create_notification)("Budget exceeded")
+        event = await asyncio.wait_for(anext(events), 1)
+        while event.startswith(":"):
+            event = await asyncio.wait_for(anext(events), 1)
+        self.assertTrue(event.startswith(f"id: {self.backlog.id}:{created.id}\n"))
+        self.assertIn('"message": "Budget exceeded"', event)
+
+        await events.aclose()
+        self.assertNotIn(notification_channel(self.user.id), get_broker().subscribers)
+
+    async def test_notifications_committed_out_of_id_order_are_sent(self):
+        view = NotificationStreamView()
+        view.resume_ids = 2
+        base = self.backlog.id
+        events = view.events(self.user.id, floor=base)
+        pending = asyncio.ensure_future(anext(events))
+        await asyncio.sleep(0.01)  # let the stream subscribe
+        for offset in (3, 2, 3, 4, 1):  # 2 and 1 commit after 3; the second 3 is a repeat
+            get_broker().publish(notification_channel(self.user.id), {"id": base + offset, "message": "m"})
+
+        sent = [await asyncio.wait_for(pending, 1)]
+        for _ in range(3):
+            sent.append(await asyncio.wait_for(anext(events), 1))
+        await events.aclose()
+        self.assertEqual([json.loads(event.split("data: ")[1])["id"] for event in sent], [base + 3, base + 2, base + 4, base + 1])
+        # Ids above the floor are listed until more than resume_ids were sent.
+        self.assertEqual([event.split("\n")[0] for event in sent], [
+            f"id: {base}:{base + 3}",
+            f"id: {base}:{base + 2},{base + 3}",
+            f"id: {base + 2}:{base + 3},{base + 4}",
+            f"id: {base + 2}:{base + 3},{base + 4}",
+        ])
+
+    async def test_reconnect_sends_what_the_client_missed(self):
+        notifications = [await sync_to_async(Notification.objects.create)(user=self.user, message=f"n{index}") for index in range(3)]
+        low, middle, high = (notification.id for notification in notifications)
+        # The client saw everything up to the backlog, then `high` before `middle` committed.
+        events = NotificationStreamView().events(self.user.id, *NotificationStreamView.parse_event_id(f"{self.backlog.id}:{high}"))
+        event = await asyncio.wait_for(anext(events), 1)
+        self.assertTrue(event.startswith(f"id: {self.backlog.id}:{low},{high}\n"))
+        event = await asyncio.wait_for(anext(events), 1)
+        self.assertTrue(event.startswith(f"id: {self.backlog.id}:{low},{middle},{high}\n"))
+        await events.aclose()
+        self.assertEqual(NotificationStreamView.parse_event_id("12"), (12, set()))
+        self.assertEqual(NotificationStreamView.parse_event_id("bad:1"), (0, set()))
+
+    async def test_rejects_missing_or_bad_token(self):
+        self.assertEqual((await self.async_client.get("/notifications/stream/")).status_code, 401)
+        self.assertEqual((await self.async_client.get("/notifications/stream/?token=nope")).status_code, 401)
@@ -0,0 +1,58 @@
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import Goal, Budget, Expense, BudgetCategory
+from core.tests.test_query_counts import QueryCountMixin
+
+User = get_user_model()
+
+
+class BulkCreateTestCase(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.client.force_authenticate(self.user)
+        category = BudgetCategory.objects.create(user=self.user, name="Food")
+        self.budget = Budget.objects.create(user=self.user, category=category, allocated_amount=Decimal("1000.00"))
+
+        other_user = User.objects.create_user(username="other", password="testpass")
+        other_category = BudgetCategory.objects.create(user=other_user, name="Rent")
+        self.foreign_budget = Budget.objects.create(user=other_user, category=other_category, allocated_amount=Decimal("10.00"))
+
+    def expense_payload(self, count, budget=None):
+        budget = budget or self.budget
+        return [
+            {"budget": budget.id, "amount": "1.00", "description": f"Item {i}", "date": "2025-01-01"}
+            for i in range(count)
+        ]
+
+    def test_expense_query_count_does_not_grow_with_batch(self):
+        # The rollup for the batch's single month costs an UPDATE plus a savepointed INSERT,
+        # and the budget alert check one SELECT. SQLite's bound-parameter limit splits the
+        # insert into three statements; the count is fixed for a given column set.
+        with self.assertMaxQueries(12):
+            response = self.client.post("/expenses/bulk-create/", self.expense_payload(200), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 200)
+        self.assertEqual(set(response.data), set(Expense.objects.values_list("id", flat=True)))
+        self.budget.refresh_from_db()
+        self.assertEqual(self.budget.spent_amount, Decimal("200.00"))
+
+    def test_rejects_budgets_owned_by_someone_else(self):
+        payload = self.expense_payload(2) + self.expense_payload(1, budget=self.foreign_budget)
+        response = self.client.post("/expenses/bulk-create/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("budget", response.data[2])
+        self.assertFalse(Expense.objects.exists())
+
+    def test_goal_bulk_create_returns_ids(self):
+        goals = [
+            {"name": f"Goal {i}", "target_amount": str(Decimal("100.00")), "due_date": "2025-12-31"}
+            for i in range(50)
+        ]
+        with self.assertMaxQueries(3):
+            response = self.client.post("/goals/bulk-create/", goals, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(sorted(response.data), sorted(Goal.objects.filter(user=self.user).values_list("id", flat=True)))
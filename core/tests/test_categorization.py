@@ -0,0 +1,137 @@
+import time
+from datetime import date
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.categorization import Automaton, RuleMatcher, check_regex, get_matcher
+from core.models import Budget, Expense, BudgetCategory, CategorizationRule
+
+User = get_user_model()
+
+
+def rule(category_id, pattern, match_type=CategorizationRule.CONTAINS, min_amount=None, max_amount=None):
+    return {"category_id": category_id, "match_type": match_type, "pattern": pattern, "min_amount": min_amount, "max_amount": max_amount}
+
+
+class MatcherTestCase(TestCase):
+    def test_automaton_reports_overlapping_substrings(self):
+        automaton = Automaton([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+        self.assertEqual(automaton.search("ushers"), {1, 2, 4})
+        self.assertEqual(automaton.search("this"), {3})
+        self.assertEqual(automaton.search("xyz"), set())
+
+    def test_first_rule_matching_description_and_amount_wins(self):
+        matcher = RuleMatcher([
+            rule(1, "amazon", max_amount=Decimal("20.00")),
+            rule(2, r"^uber\b", CategorizationRule.REGEX),
+            rule(3, "AMAZON"),
+            rule(4, "", min_amount=Decimal("1000.00")),
+        ])
+        self.assertEqual(matcher.match("AMZN Amazon Marketplace", Decimal("12.00")), 1)
+        self.assertEqual(matcher.match("amazon.com", Decimal("45.00")), 3)
+        self.assertEqual(matcher.match("Uber trip", Decimal("45.00")), 2)
+        self.assertIsNone(matcher.match("An uber trip", Decimal("45.00")))
+        self.assertEqual(matcher.match("Rent", Decimal("1500.00")), 4)
+
+    def test_patterns_that_can_backtrack_catastrophically_are_rejected(self):
+        check_regex(r"^uber\b.* trip \d{1,3}(\.\d{2})?$")
+        for pattern in [
+            r"(a+)+$", r"(a|ab)*c", r"(ab?)*c", r"(\w)\1", r"(?=a)a", r"(",
+            r".*trip \d+", r"\s*\s*\s*x", r"\s*\s?\s?\s?\s?x", r"\s{0,200}\s{0,200}x",
+        ]:
+            with self.subTest(pattern=pattern), self.assertRaises(ValueError):
+                check_regex(pattern)
+
+    def test_accepted_patterns_match_worst_case_descriptions_quickly(self):
+        # The most backtracking check_regex still allows, against the longest description
+        # that never matches.
+        description = " " * 255
+        for pattern in [r"\s*\s?\s?\s?x", r"\s{0,255}\s?\s?\s?x", r"(\s|\s)(\s|\s)\s?\s*x"]:
+            check_regex(pattern)
+            matcher = RuleMatcher([rule(1, pattern, CategorizationRule.REGEX)])
+            started = time.perf_counter()
+            self.assertIsNone(matcher.match(description + " " * 1000, Decimal("1.00")))
+            self.assertLess(time.perf_counter() - started, 0.2, pattern)
+
+    def test_unsafe_stored_patterns_never_match(self):
+        matcher = RuleMatcher([rule(1, r"(a+)+$", CategorizationRule.REGEX), rule(2, "(", CategorizationRule.REGEX), rule(3, "aaa")])
+        self.assertEqual(matcher.match("aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa!", Decimal("1.00")), 3)
+
+
+class CategorizationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.food = BudgetCategory.objects.create(user=self.user, name="Food")
+        self.travel = BudgetCategory.objects.create(user=self.user, name="Travel")
+        self.food_budget = Budget.objects.create(user=self.user, category=self.food, allocated_amount=Decimal("500.00"), start_date=date(2025, 1, 1), end_date=date(2025, 1, 31))
+        self.next_food_budget = Budget.objects.create(user=self.user, category=self.food, allocated_amount=Decimal("500.00"), start_date=date(2025, 2, 1), end_date=date(2025, 2, 28))
+        self.travel_budget = Budget.objects.create(user=self.user, category=self.travel, allocated_amount=Decimal("500.00"))
+
+    def test_rule_crud_invalidates_cached_matcher(self):
+        response = self.client.post("/categorization-rules/", {"category": self.food.id, "pattern": "grocer"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        matcher = get_matcher(self.user.id)
+        self.assertIs(get_matcher(self.user.id), matcher)
+        self.assertEqual(matcher.match("Corner Grocery", Decimal("5.00")), self.food.id)
+
+        rule_id = response.data["id"]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(f"/categorization-rules/{rule_id}/", {"category": self.travel.id, "pattern": "grocer"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(get_matcher(self.user.id).match("Corner Grocery", Decimal("5.00")), self.travel.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.delete(f"/categorization-rules/{rule_id}/").status_code, status.HTTP_204_NO_CONTENT)
+        self.assertIsNone(get_matcher(self.user.id).match("Corner Grocery", Decimal("5.00")))
+
+    def test_rejects_invalid_regex_and_foreign_category(self):
+        other = User.objects.create_user(username="other", password="testpass")
+        foreign = BudgetCategory.objects.create(user=other, name="Theirs")
+        response = self.client.post("/categorization-rules/", {"category": self.food.id, "match_type": "regex", "pattern": "(unclosed"}, format="json")
+        self.assertIn("pattern", response.data)
+        response = self.client.post("/categorization-rules/", {"category": foreign.id, "pattern": "x"}, format="json")
+        self.assertIn("category", response.data)
+
+    def test_update_checks_pattern_against_stored_match_type(self):
+        rule = CategorizationRule.objects.create(user=self.user, category=self.food, match_type=CategorizationRule.REGEX, pattern="^air")
+        response = self.client.put(f"/categorization-rules/{rule.id}/", {"category": self.food.id, "pattern": "("}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.put(f"/categorization-rules/{rule.id}/", {"category": self.food.id, "pattern": "(a+)+$"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        rule.refresh_from_db()
+        self.assertEqual(rule.pattern, "^air")
+
+    def test_expenses_without_budget_are_categorized(self):
+        CategorizationRule.objects.create(user=self.user, category=self.food, pattern="grocer")
+        CategorizationRule.objects.create(user=self.user, category=self.travel, match_type=CategorizationRule.REGEX, pattern=r"\bair(lines?)?\b")
+        payload = [
+            {"description": "Corner Grocery", "amount": "10.00", "date": "2025-01-10"},
+            {"description": "Corner Grocery", "amount": "20.00", "date": "2025-02-10"},
+            {"description": "Delta Air Lines", "amount": "300.00", "date": "2025-02-10"},
+        ]
+        response = self.client.post("/expenses/bulk-create/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        budgets = list(Expense.objects.order_by("id").values_list("budget_id", flat=True))
+        self.assertEqual(budgets, [self.food_budget.id, self.next_food_budget.id, self.travel_budget.id])
+
+        response = self.client.post("/expenses/", {"description": "Bookshop", "amount": "5.00", "date": "2025-01-10"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("budget", response.data)
+
+    def test_import_categorizes_and_skips_unmatched_without_budget(self):
+        CategorizationRule.objects.create(user=self.user, category=self.travel, pattern="airline")
+        statement = "Date,Description,Amount\n" + "".join(
+            f"2025-01-{day:02d},{'Big Airline' if day % 2 else 'Bookshop'} {day},-{day}.00\n" for day in range(1, 11)
+        )
+        upload = SimpleUploadedFile("statement.csv", statement.encode())
+        response = self.client.post("/transactions/import/", {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data["categorized"], response.data["uncategorized"]), (5, 5))
+        self.assertEqual(set(Expense.objects.values_list("budget_id", flat=True)), {self.travel_budget.id})
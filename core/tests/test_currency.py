@@ -0,0 +1,125 @@
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.currency import ExchangeRateError, convert, load_rates
+from core.forecasting import forecast
+from core.goal_probability import goal_probabilities
+from core.models import Goal, Budget, Income, Expense, Debt, BudgetCategory, ExchangeRate
+from core.payoff import payoff_plans
+from core.rollups import monthly_report
+from core.serializers import BudgetSerializer
+
+User = get_user_model()
+
+
+class ConvertTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        load_rates([
+            (date(2025, 1, 1), "EUR", Decimal("0.5")),
+            (date(2025, 2, 1), "EUR", Decimal("0.8")),
+            (date(2025, 1, 1), "GBP", Decimal("0.25")),
+        ])
+
+    def test_uses_latest_rate_on_or_before_each_day(self):
+        amounts = [Decimal("10.00"), Decimal("10.00"), Decimal("10.00"), Decimal("10.00"), Decimal("3.33")]
+        currencies = ["EUR", "EUR", "EUR", "GBP", "USD"]
+        days = [date(2024, 12, 1), date(2025, 1, 31), date(2025, 3, 1), date(2025, 1, 15), date(2025, 1, 15)]
+        self.assertEqual(convert(amounts, currencies, days, "USD"), [
+            Decimal("20.00"), Decimal("20.00"), Decimal("12.50"), Decimal("40.00"), Decimal("3.33"),
+        ])
+        # Cross rates go through the base currency.
+        self.assertEqual(convert([Decimal("10.00")], ["GBP"], [date(2025, 1, 15)], "EUR"), [Decimal("20.00")])
+
+    def test_reloaded_rates_replace_cached_series(self):
+        self.assertEqual(convert([Decimal("8.00")], ["EUR"], [date(2025, 2, 2)], "USD"), [Decimal("10.00")])
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as statement:
+            statement.write("date,currency,rate\n2025-02-01,eur,0.4\n2025-02-01,JPY,150\n")
+            statement.flush()
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command("load_exchange_rates", statement.name, stdout=StringIO())
+        self.assertEqual(ExchangeRate.objects.count(), 4)
+        self.assertEqual(convert([Decimal("8.00")], ["EUR"], [date(2025, 2, 2)], "USD"), [Decimal("20.00")])
+
+    def test_missing_rates_raise(self):
+        with self.assertRaises(ExchangeRateError):
+            convert([Decimal("1.00")], ["CHF"], [date(2025, 1, 1)], "USD")
+
+
+class MultiCurrencySummaryTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        load_rates([(date(2025, 1, 1), "EUR", Decimal("0.5")), (date(2025, 2, 1), "EUR", Decimal("0.25"))])
+        self.user = User.objects.create_user(username="testuser", password="testpass", currency_preference="USD")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        category = BudgetCategory.objects.create(user=self.user, name="Travel")
+        self.budget = Budget.objects.create(user=self.user, category=category, allocated_amount=Decimal("100.00"), currency="USD")
+        self.euro_budget = Budget.objects.create(user=self.user, category=category, allocated_amount=Decimal("100.00"), currency="EUR")
+        Income.objects.create(user=self.user, source="Salary", amount=Decimal("1000.00"), date=date(2025, 1, 5))
+        Income.objects.create(user=self.user, source="Bonus", amount=Decimal("100.00"), currency="EUR", date=date(2025, 1, 5))
+        Income.objects.create(user=self.user, source="Bonus", amount=Decimal("100.00"), currency="EUR", date=date(2025, 2, 5))
+
+    def test_expense_takes_budget_currency(self):
+        response = self.client.post("/expenses/", {"budget": self.euro_budget.id, "amount": "10.00", "description": "Train", "date": "2025-01-10", "currency": "USD"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["currency"], "EUR")
+
+        serializer = BudgetSerializer(self.euro_budget, data={"category": self.euro_budget.category_id, "allocated_amount": "100.00", "currency": "USD"})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("currency", serializer.errors)
+
+    def test_summaries_convert_to_preferred_currency(self):
+        Expense.objects.create(budget=self.euro_budget, description="Train", amount=Decimal("10.00"), currency="EUR", date=date(2025, 2, 10))
+        Debt.objects.create(user=self.user, creditor_name="Bank", amount=Decimal("50.00"), currency="EUR", due_date=date(2026, 1, 1))
+
+        dashboard = self.client.get("/dashboard/").data
+        # Point-in-time totals use today's rate: 4 USD per EUR.
+        self.assertEqual(dashboard["spending"]["total_allocated"], Decimal("500.00"))
+        self.assertEqual(dashboard["spending"]["total_spent"], Decimal("40.00"))
+        self.assertEqual(dashboard["debts"]["total_debt"], Decimal("200.00"))
+        # Incomes and expenses convert at the rate of their month.
+        self.assertEqual(dashboard["income_expense"]["total_income"], Decimal("1600.00"))
+        self.assertEqual(dashboard["income_expense"]["total_expense"], Decimal("40.00"))
+        self.assertEqual(dashboard["income_expense"]["currency"], "USD")
+
+        report = monthly_report(self.user.id, 2, date(2025, 2, 20), "EUR")
+        self.assertEqual(report["income"], [Decimal("600.00"), Decimal("100.00")])
+
+    def test_projections_convert_to_preferred_currency(self):
+        today = date(2025, 3, 10)
+        Debt.objects.create(
+            user=self.user, creditor_name="Bank", amount=Decimal("50.00"), minimum_payment=Decimal("10.00"),
+            currency="EUR", due_date=date(2025, 3, 20),
+        )
+        Goal.objects.create(user=self.user, name="Trip", target_amount=Decimal("100.00"), currency="EUR", due_date=date(2025, 4, 9))
+
+        # Past rows convert at the rate of their day; debts and goals at today's, 4 USD per EUR.
+        result = forecast(self.user.id, months=1, today=today, currency="USD")
+        self.assertEqual(result["starting_balance"], 1600.0)
+        self.assertEqual(result["balance"][-1], 1400.0)
+        self.assertEqual(result["available"][-1], 1000.0)
+
+        plan, = payoff_plans(self.user.id, [{"strategy": "avalanche"}], today=today, currency="USD")
+        self.assertEqual((plan["months"], plan["total_paid"]), (5, 200.0))
+
+        # Months convert at their own rates: 1000 + 200 in January, 400 in February.
+        result = goal_probabilities(self.user.id, paths=500, today=today, currency="USD")
+        self.assertEqual((result["currency"], result["monthly_mean"]), ("USD", 800.0))
+        self.assertEqual(result["goals"][0]["remaining"], 400.0)
+
+        response = self.client.post("/debts/payoff-plan/", {}, format="json")
+        self.assertEqual(response.data["currency"], "USD")
+
+    def test_missing_rate_is_reported(self):
+        self.user.currency_preference = "CHF"
+        self.user.save()
+        response = self.client.get("/spending-summary/")
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
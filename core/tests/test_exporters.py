@@ -0,0 +1,82 @@
+import csv
+import json
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework import status
+from core.exporters import export_jsonl
+from core.models import Goal, Budget, Income, Expense, Debt, BudgetCategory
+
+User = get_user_model()
+
+
+class ExportTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.client.force_authenticate(self.user)
+        category = BudgetCategory.objects.create(user=self.user, name="Food")
+        budget = Budget.objects.create(user=self.user, category=category, allocated_amount=Decimal("1000.00"))
+        for i in range(5):
+            Expense.objects.create(budget=budget, description=f"Item {i}", amount=Decimal("1.50"), date=date(2025, 1, 1))
+        Income.objects.create(user=self.user, source="Salary", amount=Decimal("3000.00"), date=date(2025, 1, 1))
+        Goal.objects.create(user=self.user, name="Car", target_amount=Decimal("5000.00"), due_date=date(2026, 1, 1))
+        Debt.objects.create(user=self.user, creditor_name="Bank", amount=Decimal("900.00"), due_date=date(2026, 1, 1))
+
+        other = User.objects.create_user(username="other", password="testpass")
+        Income.objects.create(user=other, source="Hidden", amount=Decimal("1.00"), date=date(2025, 1, 1))
+
+    def export(self, file_format):
+        response = self.client.get(f"/export/?file_format={file_format}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_jsonl(self):
+        records = [json.loads(line) for line in self.export("jsonl").splitlines()]
+        tables = [record["table"] for record in records]
+        self.assertEqual(tables.count("expense"), 5)
+        self.assertEqual(set(tables), {"income", "expense", "budget", "goal", "debt"})
+        self.assertNotIn("Hidden", {record.get("source") for record in records})
+        self.assertEqual(records[0]["amount"], "3000.00")
+
+    def test_csv_has_a_header_per_table(self):
+        rows = list(csv.reader(StringIO(self.export("csv"))))
+        headers = [row for row in rows if row[0] == "table"]
+        self.assertEqual(len(headers), 5)
+        self.assertEqual(len(rows), 5 + 9)
+
+    def test_columnar_groups_rows_by_table(self):
+        groups = [json.loads(line) for line in self.export("columnar").splitlines()]
+        expense = next(group for group in groups if group["table"] == "expense")
+        self.assertEqual(expense["rows"], 5)
+        self.assertEqual(expense["columns"]["amount"], ["1.50"] * 5)
+
+    async def test_asgi_export_streams_through_an_async_iterator(self):
+        token = str(await sync_to_async(AccessToken.for_user)(self.user))
+        response = await self.async_client.get("/export/?file_format=jsonl", headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        parts = [part async for part in response.streaming_content]
+        records = [json.loads(line) for line in b"".join(parts).decode().splitlines()]
+        self.assertEqual([record["table"] for record in records].count("expense"), 5)
+        self.assertEqual(len(records), 9)
+
+    def test_unknown_format(self):
+        response = self.client.get("/export/?file_format=xml")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_nested_export_keeps_the_outer_transaction(self):
+        # TestCase wraps every test in a transaction, like ATOMIC_REQUESTS does a request.
+        with mock.patch.object(connection, "vendor", "postgresql"), CaptureQueriesContext(connection) as queries:
+            lines = list(export_jsonl(self.user))
+        self.assertEqual(len(lines), 9)
+        self.assertFalse([query for query in queries if "SET TRANSACTION" in query["sql"]])
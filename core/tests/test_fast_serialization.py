@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from core.fast_serialization import compile_fields, row_lookups, serialize_rows
+from core.models import Budget, BudgetCategory, CategorizationRule, Debt, Expense, Goal, Income
+from core.serializers import (
+    BudgetCategorySerializer, BudgetSerializer, CategorizationRuleSerializer, DebtSerializer, ExpenseSerializer,
+    GoalSerializer, IncomeSerializer,
+)
+
+User = get_user_model()
+
+LIST_ENDPOINTS = ["/goals/", "/budget/", "/income/", "/expenses/", "/debts/", "/categories/", "/categorization-rules/"]
+
+
+class FastSerializationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        food = BudgetCategory.objects.create(user=self.user, name="Food & \"Drinks\"")
+        travel = BudgetCategory.objects.create(user=self.user, name="Reisen ✈")
+        budget = Budget.objects.create(user=self.user, category=food, allocated_amount=Decimal("500.00"), spent_amount=Decimal("120.50"))
+        Budget.objects.create(user=self.user, category=travel, allocated_amount=Decimal("0.00"), currency="EUR")
+        for day in range(5):
+            Expense.objects.create(budget=budget, amount=Decimal(f"{day}.05"), description=f"Café {day}" if day % 2 else "", date=date(2025, 1, 1) + timedelta(days=day), recurring=day == 3)
+            Income.objects.create(user=self.user, source="Salary", amount=Decimal("3000.00"), date=date(2025, 1, 1) + timedelta(days=day), description=None if day % 2 else "pay")
+        Goal.objects.create(user=self.user, name="Car", target_amount=Decimal("9000.00"), current_savings=Decimal("10.10"), due_date=date(2027, 1, 1))
+        Debt.objects.create(user=self.user, creditor_name="Bank", amount=Decimal("1500.00"), due_date=date(2025, 6, 1), interest_rate=Decimal("19.99"))
+        CategorizationRule.objects.create(user=self.user, category=food, pattern="cafe", min_amount=Decimal("1.00"))
+        CategorizationRule.objects.create(user=self.user, category=travel, match_type=CategorizationRule.REGEX, pattern=r"^air")
+
+    def fetch(self, url, fast):
+        cache.clear()  # list responses are cached per version token
+        with override_settings(FAST_SERIALIZATION=fast):
+            return self.client.get(url)
+
+    def test_list_serializers_have_a_fast_path(self):
+        for serializer_class in (GoalSerializer, BudgetSerializer, IncomeSerializer, ExpenseSerializer, DebtSerializer, BudgetCategorySerializer, CategorizationRuleSerializer):
+            self.assertIsNotNone(serializer_class.get_row_fields(), serializer_class.__name__)
+
+    def test_list_responses_are_byte_identical(self):
+        for url in LIST_ENDPOINTS:
+            for query in ("", "?page_size=2"):
+                with self.subTest(url=url + query):
+                    regular = self.fetch(url + query, fast=False)
+                    fast = self.fetch(url + query, fast=True)
+                    self.assertEqual(regular.status_code, 200)
+                    self.assertEqual(fast.content, regular.content)
+                    self.assertEqual(fast.get("Link"), regular.get("Link"))
+
+    def test_following_cursor_pages_match(self):
+        link = "/expenses/?page_size=2"
+        pages = 0
+        while link:
+            regular = self.fetch(link, fast=False)
+            fast = self.fetch(link, fast=True)
+            self.assertEqual(fast.content, regular.content)
+            self.assertEqual(fast.get("Link"), regular.get("Link"))
+            link = regular.get("Link", "")[1:].split(">")[0]
+            pages += 1
+        self.assertEqual(pages, 3)
+
+    def test_rendering_matches_serializer(self):
+        row_fields = ExpenseSerializer.get_row_fields()
+        queryset = Expense.objects.order_by("id")
+        expected = JSONRenderer().render(ExpenseSerializer(queryset, many=True).data)
+        rows = queryset.values(*row_lookups(row_fields))
+        self.assertEqual(JSONRenderer().render(serialize_rows(row_fields, rows)), expected)
+
+    def test_unscaled_decimals_fall_back_to_the_field(self):
+        row_fields = BudgetSerializer.get_row_fields()
+        row = dict(Budget.objects.values(*row_lookups(row_fields)).first(), allocated_amount=Decimal("7.5"))
+        self.assertEqual(serialize_rows(row_fields, [row])[0]["allocated_amount"], "7.50")
+
+    def test_unsupported_fields_keep_the_regular_path(self):
+        class GoalWithMethodSerializer(serializers.ModelSerializer):
+            progress = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Goal
+                fields = ["id", "progress"]
+
+            def get_progress(self, goal):
+                return 0
+
+        self.assertIsNone(compile_fields(GoalWithMethodSerializer))
@@ -0,0 +1,51 @@
+from datetime import date
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.forecasting import forecast
+from core.models import Goal, Budget, Income, Expense, Debt, BudgetCategory
+
+User = get_user_model()
+
+
+class ForecastTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        category = BudgetCategory.objects.create(user=self.user, name="Rent")
+        self.budget = Budget.objects.create(user=self.user, category=category, allocated_amount=Decimal("2000.00"))
+        Income.objects.create(user=self.user, source="Bonus", amount=Decimal("1000.00"), date=date(2025, 1, 10))
+        Expense.objects.create(budget=self.budget, description="Laptop", amount=Decimal("400.00"), date=date(2025, 1, 12))
+
+    def test_starting_balance_and_flat_projection(self):
+        result = forecast(self.user.id, months=1, today=date(2025, 2, 1))
+        self.assertEqual(result["starting_balance"], 600.0)
+        self.assertEqual(result["start_date"], "2025-02-02")
+        self.assertEqual(result["end_date"], "2025-03-01")
+        self.assertEqual(set(result["balance"]), {600.0})
+
+    def test_recurring_items_debts_and_goals(self):
+        Income.objects.create(user=self.user, source="Salary", amount=Decimal("3000.00"), date=date(2025, 1, 15), recurring=True)
+        Expense.objects.create(budget=self.budget, description="Rent", amount=Decimal("1500.00"), date=date(2025, 1, 1), recurring=True)
+        Debt.objects.create(user=self.user, creditor_name="Bank", amount=Decimal("500.00"), paid_amount=Decimal("100.00"), due_date=date(2025, 2, 20))
+        Goal.objects.create(user=self.user, name="Trip", target_amount=Decimal("280.00"), current_savings=Decimal("0.00"), due_date=date(2025, 2, 28))
+
+        result = forecast(self.user.id, months=2, today=date(2025, 1, 31))
+        balance = dict(zip(range(len(result["balance"])), result["balance"]))
+        # Jan history: +1000 -400 +3000 -1500
+        self.assertEqual(result["starting_balance"], 2100.0)
+        self.assertEqual(balance[0], 600.0)       # Feb 1 rent
+        self.assertEqual(balance[14], 3600.0)     # Feb 15 salary
+        self.assertEqual(balance[19], 3200.0)     # Feb 20 debt
+        self.assertEqual(result["balance"][-1], 4700.0)    # Mar 1 rent, Mar 15 salary
+        self.assertEqual(result["available"][13], balance[13] - 140.0)  # half the goal reserved by Feb 14
+        self.assertEqual(result["available"][27], balance[27] - 280.0)  # all of it by the Feb 28 due date
+
+    def test_endpoint_validates_months(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get("/forecast/?months=0").status_code, status.HTTP_400_BAD_REQUEST)
+        response = client.get("/forecast/?months=60")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(len(response.data["balance"]), 1800)
@@ -0,0 +1,83 @@
+from datetime import date
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.goal_probability import goal_probabilities, monthly_net
+from core.models import Goal, Budget, Income, Expense, BudgetCategory
+
+User = get_user_model()
+TODAY = date(2025, 7, 10)
+
+
+class GoalProbabilityTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        category = BudgetCategory.objects.create(user=self.user, name="Food")
+        budget = Budget.objects.create(user=self.user, category=category, allocated_amount=Decimal("5000.00"))
+        for month, spent in zip(range(1, 7), (300, 500, 400, 350, 450, 400)):
+            Income.objects.create(user=self.user, source="Salary", amount=Decimal("1000.00"), date=date(2025, month, 1))
+            Expense.objects.create(budget=budget, description="Food", amount=Decimal(spent), date=date(2025, month, 15))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_monthly_net_counts_gaps_after_first_month(self):
+        Income.objects.filter(date__month=3).delete()
+        net = monthly_net(self.user.id, TODAY)
+        self.assertEqual(net.tolist(), [700.0, 500.0, -400.0, 650.0, 550.0, 600.0])
+
+    def test_probabilities_follow_history(self):
+        easy = Goal.objects.create(user=self.user, name="Easy", target_amount=Decimal("1200.00"), due_date=date(2026, 1, 31))
+        done = Goal.objects.create(user=self.user, name="Done", target_amount=Decimal("10.00"), current_savings=Decimal("10.00"), due_date=date(2026, 1, 31))
+        late = Goal.objects.create(user=self.user, name="Late", target_amount=Decimal("10.00"), due_date=date(2025, 7, 1))
+
+        result = goal_probabilities(self.user.id, paths=2000, today=TODAY)
+        self.assertEqual(result["monthly_mean"], 600.0)
+        self.assertEqual(result["history_months"], 6)
+        probability = {goal["id"]: goal["probability"] for goal in result["goals"]}
+        self.assertGreater(probability[easy.id], 0.95)
+        self.assertEqual(probability[done.id], 1.0)
+        self.assertEqual(probability[late.id], 0.0)
+
+        # Savings are shared by what each goal still needs, so a large goal crowds out the rest.
+        hard = Goal.objects.create(user=self.user, name="Hard", target_amount=Decimal("50000.00"), due_date=date(2026, 1, 31))
+        result = goal_probabilities(self.user.id, paths=2000, today=TODAY)
+        probability = {goal["id"]: goal["probability"] for goal in result["goals"]}
+        self.assertEqual(probability[hard.id], 0.0)
+        self.assertLess(probability[easy.id], 0.05)
+
+    def test_results_are_seeded_and_cached_by_inputs(self):
+        goal = Goal.objects.create(user=self.user, name="Trip", target_amount=Decimal("3500.00"), due_date=date(2026, 1, 31))
+        first = goal_probabilities(self.user.id, paths=2000, today=TODAY)
+        cache.clear()
+        self.assertEqual(goal_probabilities(self.user.id, paths=2000, today=TODAY), first)
+
+        with self.assertNumQueries(2):  # history and goals; the simulation comes from the cache
+            goal_probabilities(self.user.id, paths=2000, today=TODAY)
+
+        goal.current_savings = Decimal("3000.00")
+        goal.save()
+        changed = goal_probabilities(self.user.id, paths=2000, today=TODAY)
+        self.assertGreater(changed["goals"][0]["probability"], first["goals"][0]["probability"])
+
+    def test_worker_threads_match_serial(self):
+        for name in ("A", "B", "C"):
+            Goal.objects.create(user=self.user, name=name, target_amount=Decimal("1500.00"), due_date=date(2026, 3, 1))
+        serial = goal_probabilities(self.user.id, paths=1000, today=TODAY)
+        cache.clear()
+        with override_settings(GOAL_SIMULATION_WORKERS=2):
+            parallel = goal_probabilities(self.user.id, paths=1000, today=TODAY)
+        self.assertEqual(parallel, serial)
+
+    def test_endpoint(self):
+        Goal.objects.create(user=self.user, name="Trip", target_amount=Decimal("500.00"), due_date=date(2030, 1, 1))
+        response = self.client.get("/goals/probability/?paths=500")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["paths"], 500)
+        self.assertEqual(len(response.data["goals"]), 1)
+
+        response = self.client.get("/goals/probability/?paths=10")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
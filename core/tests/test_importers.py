@@ -0,0 +1,132 @@
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.importers import parse_amount, parse_ofx
+from core.models import Budget, Income, Expense, BudgetCategory
+
+User = get_user_model()
+
+CSV_STATEMENT = """Date,Description,Amount
+2025-01-02,Coffee Shop,-4.50
+2025-01-03,Payroll,"2,500.00"
+01/04/2025,  Grocery   Store ,(62.10)
+not-a-date,Broken row,-1.00
+"""
+
+OFX_STATEMENT = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20250105120000[-5:EST]
+<TRNAMT>-15.00
+<NAME>Book Store
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT</TRNTYPE><DTPOSTED>20250106</DTPOSTED><TRNAMT>100.00</TRNAMT><MEMO>Refund</MEMO></STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+class ImportTransactionsTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.client.force_authenticate(self.user)
+        category = BudgetCategory.objects.create(user=self.user, name="Everyday")
+        self.budget = Budget.objects.create(user=self.user, category=category, allocated_amount=Decimal("1000.00"))
+
+    def upload(self, content, name="statement.csv"):
+        statement = SimpleUploadedFile(name, content.encode())
+        return self.client.post("/transactions/import/", {"file": statement, "budget": self.budget.id}, format="multipart")
+
+    def test_csv_import_splits_expenses_and_incomes(self):
+        response = self.upload(CSV_STATEMENT)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["rows_read"], 4)
+        self.assertEqual(response.data["skipped"], 1)
+        self.assertEqual(response.data["expenses_created"], 2)
+        self.assertEqual(response.data["incomes_created"], 1)
+
+        self.assertEqual(Income.objects.get(user=self.user).amount, Decimal("2500.00"))
+        self.assertTrue(Expense.objects.filter(description="Grocery Store", amount=Decimal("62.10")).exists())
+        self.budget.refresh_from_db()
+        self.assertEqual(self.budget.spent_amount, Decimal("66.60"))
+
+    def test_reimport_is_deduplicated(self):
+        self.upload(CSV_STATEMENT)
+        response = self.upload(CSV_STATEMENT)
+        self.assertEqual(response.data["duplicates"], 3)
+        self.assertEqual(Expense.objects.count(), 2)
+        self.assertEqual(Income.objects.count(), 1)
+
+    def test_ofx_parser_handles_sgml_and_xml_tags(self):
+        rows = list(parse_ofx(OFX_STATEMENT.splitlines()))
+        self.assertEqual(rows, [
+            ("20250105120000[-5:EST]", "-15.00", "Book Store", ""),
+            ("20250106", "100.00", "Refund", ""),
+        ])
+
+    def test_management_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".ofx") as statement:
+            statement.write(OFX_STATEMENT)
+            statement.flush()
+            out = StringIO()
+            call_command("import_transactions", statement.name, user="testuser", budget=self.budget.id, stdout=out)
+        self.assertIn("rows/s", out.getvalue())
+        self.assertEqual(Expense.objects.get().amount, Decimal("15.00"))
+        self.assertEqual(Income.objects.get().source, "Refund")
+
+    def test_rejects_unknown_budget(self):
+        statement = SimpleUploadedFile("statement.csv", CSV_STATEMENT.encode())
+        response = self.client.post("/transactions/import/", {"file": statement, "budget": 9999}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_rejects_non_integer_budget(self):
+        statement = SimpleUploadedFile("statement.csv", CSV_STATEMENT.encode())
+        response = self.client.post("/transactions/import/", {"file": statement, "budget": "abc"}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_non_finite_and_oversized_amounts_are_skipped(self):
+        self.assertEqual(parse_amount("99,999,999.99"), Decimal("99999999.99"))
+        for value in ("NaN", "sNaN", "Infinity", "-inf", "100000000.00", "1e12"):
+            self.assertIsNone(parse_amount(value), value)
+        response = self.upload("Date,Description,Amount\n2025-01-02,Coffee,NaN\n2025-01-03,Yacht,-1e12\n2025-01-04,Tea,-3.00\n")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(list(Expense.objects.values_list("description", flat=True)), ["Tea"])
+
+    def test_identical_transactions_in_one_statement_are_kept(self):
+        coffees = "Date,Description,Amount\n2025-01-02,Coffee,-3.00\n2025-01-02,Coffee,-3.00\n"
+        response = self.upload(coffees)
+        self.assertEqual((response.data["expenses_created"], response.data["duplicates"]), (2, 0))
+
+        response = self.upload(coffees + "2025-01-02,Coffee,-3.00\n")
+        self.assertEqual((response.data["expenses_created"], response.data["duplicates"]), (1, 2))
+        self.assertEqual(Expense.objects.filter(description="Coffee").count(), 3)
+
+    def test_ofx_transactions_are_matched_on_fitid(self):
+        statement = "<OFX>" + "".join(
+            f"<STMTTRN><DTPOSTED>20250102<TRNAMT>-3.00<FITID>{fitid}<NAME>Coffee</STMTTRN>" for fitid in ("A1", "A2")
+        ) + "</OFX>"
+        response = self.upload(statement, name="statement.ofx")
+        self.assertEqual((response.data["expenses_created"], response.data["duplicates"]), (2, 0))
+        self.assertEqual(set(Expense.objects.values_list("external_id", flat=True)), {"A1", "A2"})
+
+        response = self.upload(statement.replace("A2", "A3"), name="statement.ofx")
+        self.assertEqual((response.data["expenses_created"], response.data["duplicates"]), (1, 1))
+
+    def test_fitids_fall_back_to_rows_imported_without_one(self):
+        self.upload("Date,Description,Amount\n2025-01-02,Coffee,-3.00\n")
+        statement = "<OFX>" + "".join(
+            f"<STMTTRN><DTPOSTED>20250102<TRNAMT>-3.00<FITID>{fitid}<NAME>Coffee</STMTTRN>" for fitid in ("B1", "B2")
+        ) + "</OFX>"
+        response = self.upload(statement, name="statement.ofx")
+        self.assertEqual((response.data["expenses_created"], response.data["duplicates"]), (1, 1))
+
+    def test_malformed_csv_is_rejected(self):
+        response = self.upload('Date,Description,Amount\n2025-01-02,"' + "x" * 200_000 + '",-3.00\n')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,56 @@
+import os
+import pstats
+import tempfile
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.metrics import Histogram, registry
+from core.models import Goal
+
+User = get_user_model()
+
+
+class HistogramTestCase(TestCase):
+    def test_quantiles_are_within_bucket_precision(self):
+        histogram = Histogram()
+        for value in range(1, 10001):
+            histogram.record(value)
+        for q in (0.5, 0.9, 0.99):
+            expected = q * 10000
+            self.assertLessEqual(abs(histogram.quantile(q) - expected) / expected, 0.125)
+        self.assertEqual(histogram.quantile(1.0), 10000)
+
+
+class MetricsEndpointTestCase(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.admin = User.objects.create_user(username="admin", password="testpass", is_staff=True)
+
+    def test_records_per_view_metrics(self):
+        Goal.objects.create(user=self.user, name="Car", target_amount=Decimal("5000.00"), due_date="2026-01-01")
+        self.client.force_authenticate(self.user)
+        self.client.get("/goals/")
+        self.client.get("/goals/")
+        self.assertEqual(self.client.get("/metrics/").status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.get("/metrics/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.content.decode()
+        self.assertIn('financial_planner_view_request_seconds_count{view="GoalListCreateView"} 2', body)
+        self.assertIn('financial_planner_view_db_queries{view="GoalListCreateView",quantile="0.5"} 1', body)
+        self.assertIn('financial_planner_view_render_seconds_sum{view="GoalListCreateView"}', body)
+
+    def test_slow_sampled_requests_dump_pstats(self):
+        self.client.force_authenticate(self.user)
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(PROFILE_SAMPLE_RATE=1.0, PROFILE_SLOW_REQUEST_MS=0, PROFILE_DIR=directory):
+                self.client.get("/goals/")
+            dumps = os.listdir(directory)
+            self.assertEqual(len(dumps), 1)
+            self.assertTrue(dumps[0].startswith("GoalListCreateView-"))
+            pstats.Stats(os.path.join(directory, dumps[0]))
@@ -0,0 +1,64 @@
+import base64
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.test import TestCase
+from core.models import Budget, Expense, BudgetCategory
+
+User = get_user_model()
+
+
+class KeysetPaginationTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.token = self.client.post("/api/token/", {"username": "testuser", "password": "testpass"}).data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+        category = BudgetCategory.objects.create(user=self.user, name="Food")
+        self.budget = Budget.objects.create(user=self.user, category=category, allocated_amount=Decimal("1000.00"))
+        # Several expenses share a date so the id tie-breaker is exercised.
+        for i in range(7):
+            Expense.objects.create(
+                budget=self.budget,
+                description=f"Item {i}",
+                amount=Decimal("10.00"),
+                date=date(2025, 1, 1) + timedelta(days=i // 3),
+            )
+
+    def test_walks_every_row_once_in_order(self):
+        seen = []
+        url = "/expenses/?page_size=3"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data), 3)
+            seen.extend(response.data)
+            link = response.headers.get("Link")
+            url = link[1:link.index(">")] if link else None
+
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len({row["id"] for row in seen}), 7)
+        keys = [(row["date"], row["id"]) for row in seen]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_last_page_has_no_link(self):
+        response = self.client.get("/expenses/?page_size=10")
+        self.assertEqual(len(response.data), 7)
+        self.assertNotIn("Link", response.headers)
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/expenses/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        null_value = base64.urlsafe_b64encode(json.dumps([None, 1]).encode()).decode()
+        response = self.client.get(f"/expenses/?cursor={null_value}")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        for raw in [b'["2025-01-01", 1e400]', b'["2025-01-01", 1.5]', b'["2025-01-01", "1"]', b'[1e400, 1]']:
+            cursor = base64.urlsafe_b64encode(raw).decode()
+            response = self.client.get(f"/expenses/?cursor={cursor}")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, raw)
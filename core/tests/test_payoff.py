@@ -0,0 +1,68 @@
+from datetime import date
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.payoff import payoff_plans
+from core.models import Debt
+
+User = get_user_model()
+
+
+class DebtPayoffPlanTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.card = Debt.objects.create(
+            user=self.user, creditor_name="Card", amount=Decimal("1000.00"), due_date=date(2026, 1, 1),
+            interest_rate=Decimal("24.00"), minimum_payment=Decimal("100.00"),
+        )
+        self.loan = Debt.objects.create(
+            user=self.user, creditor_name="Loan", amount=Decimal("400.00"), paid_amount=Decimal("100.00"),
+            due_date=date(2026, 1, 1), interest_rate=Decimal("0.00"), minimum_payment=Decimal("50.00"),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_snowball_rolls_freed_minimums_over(self):
+        Debt.objects.update(interest_rate=0)
+        plan, = payoff_plans(self.user.id, [{"strategy": "snowball", "extra_payment": 50}], today=date(2025, 1, 15))
+        # 200 a month: the loan takes 100 until month 3, then the card gets everything.
+        payoff = {debt["id"]: debt["payoff_month"] for debt in plan["debts"]}
+        self.assertEqual(payoff, {self.loan.id: 3, self.card.id: 7})
+        self.assertEqual(plan["months"], 7)
+        self.assertEqual(plan["payoff_date"], "2025-08-15")
+        self.assertEqual(plan["total_interest"], 0.0)
+        self.assertEqual(plan["total_paid"], 1300.0)
+        self.assertEqual(plan["remaining_balance"], [1100.0, 900.0, 700.0, 500.0, 300.0, 100.0, 0.0])
+
+    def test_avalanche_pays_less_interest_than_snowball(self):
+        avalanche, snowball, custom = payoff_plans(self.user.id, [
+            {"strategy": "avalanche", "extra_payment": 100},
+            {"strategy": "snowball", "extra_payment": 100},
+            {"strategy": "custom", "extra_payment": 100, "order": [self.loan.id]},
+        ])
+        self.assertTrue(avalanche["paid_off"] and snowball["paid_off"])
+        self.assertLess(avalanche["total_interest"], snowball["total_interest"])
+        self.assertEqual(custom["total_interest"], snowball["total_interest"])
+        self.assertAlmostEqual(avalanche["total_paid"], 1300 + avalanche["total_interest"], places=2)
+
+    def test_unaffordable_plan_is_reported(self):
+        Debt.objects.update(minimum_payment=0)
+        plan, = payoff_plans(self.user.id, [{"strategy": "avalanche"}], max_months=12)
+        self.assertFalse(plan["paid_off"])
+        self.assertIsNone(plan["months"])
+        self.assertEqual(len(plan["remaining_balance"]), 12)
+
+    def test_endpoint_compares_scenarios(self):
+        response = self.client.post("/debts/payoff-plan/", {
+            "scenarios": [{"strategy": "avalanche", "extra_payment": "25.00"}, {"strategy": "snowball"}],
+        }, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([plan["strategy"] for plan in response.data["scenarios"]], ["avalanche", "snowball"])
+
+        response = self.client.post("/debts/payoff-plan/", {}, format="json")
+        self.assertEqual(len(response.data["scenarios"]), 2)
+
+        response = self.client.post("/debts/payoff-plan/", {"scenarios": [{"strategy": "custom"}]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
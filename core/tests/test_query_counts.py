@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import Goal, Budget, Income, Expense, Debt, BudgetCategory, Notification
+
+User = get_user_model()
+
+ROWS = 15
+
+# Upper bound on queries per request, independent of row count: one for the JWT user
+# lookup plus one per page query. Raise a cap only together with the view change that
+# justifies it.
+QUERY_CAPS = {
+    "/goals/": 2,
+    "/budget/": 2,
+    "/income/": 2,
+    "/expenses/": 2,
+    "/debts/": 2,
+    "/categories/": 2,
+    "/notifications/": 2,
+}
+
+
+class QueryCountMixin:
+    @contextmanager
+    def assertMaxQueries(self, cap):
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        executed = len(context.captured_queries)
+        if executed > cap:
+            queries = "\n".join(query["sql"] for query in context.captured_queries)
+            self.fail(f"{executed} queries executed, cap is {cap}:\n{queries}")
+
+
+class QueryCountTestCase(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.token = self.client.post("/api/token/", {"username": "testuser", "password": "testpass"}).data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+        for i in range(ROWS):
+            category = BudgetCategory.objects.create(user=self.user, name=f"Category {i}")
+            budget = Budget.objects.create(user=self.user, category=category, allocated_amount=Decimal("100.00"))
+            Expense.objects.create(budget=budget, description=f"Expense {i}", amount=Decimal("5.00"), date=date(2025, 1, 1))
+            Income.objects.create(user=self.user, source=f"Source {i}", amount=Decimal("50.00"), date=date(2025, 1, 1))
+            Goal.objects.create(user=self.user, name=f"Goal {i}", target_amount=Decimal("500.00"), due_date=date(2026, 1, 1))
+            Debt.objects.create(user=self.user, creditor_name=f"Bank {i}", amount=Decimal("900.00"), due_date=date(2026, 1, 1))
+            Notification.objects.create(user=self.user, message=f"Notice {i}")
+
+    def test_list_endpoints_stay_under_query_cap(self):
+        for url, cap in QUERY_CAPS.items():
+            with self.subTest(url=url):
+                with self.assertMaxQueries(cap):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(len(response.data), ROWS)
+
+    def test_related_names_are_rendered(self):
+        response = self.client.get("/expenses/")
+        self.assertTrue(all(row["budget_name"].startswith("Category") for row in response.data))
+        response = self.client.get("/budget/")
+        self.assertTrue(all(row["category_name"].startswith("Category") for row in response.data))
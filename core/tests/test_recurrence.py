@@ -0,0 +1,67 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from core.models import Budget, Income, Expense, BudgetCategory
+from core.recurrence import add_months, materialize_all
+
+User = get_user_model()
+
+
+class RecurrenceTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        category = BudgetCategory.objects.create(user=self.user, name="Rent")
+        self.budget = Budget.objects.create(
+            user=self.user, category=category, allocated_amount=Decimal("2000.00"),
+            start_date=date(2025, 1, 1), end_date=date(2025, 1, 31), is_recurring=True,
+        )
+        self.salary = Income.objects.create(user=self.user, source="Salary", amount=Decimal("3000.00"), date=date(2025, 1, 31), recurring=True)
+        self.rent = Expense.objects.create(budget=self.budget, description="Rent", amount=Decimal("1500.00"), date=date(2025, 1, 1), recurring=True)
+
+    def test_add_months_clamps_to_month_end(self):
+        self.assertEqual(add_months(date(2025, 1, 31), 1), date(2025, 2, 28))
+        self.assertEqual(add_months(date(2024, 12, 15), 2), date(2025, 2, 15))
+
+    def test_materializes_up_to_horizon(self):
+        totals = materialize_all(today=date(2025, 3, 1), horizon_days=45)
+        self.assertEqual(
+            list(self.salary.occurrences.order_by("date").values_list("date", flat=True)),
+            [date(2025, 2, 28), date(2025, 3, 31)],
+        )
+        self.assertEqual(self.rent.occurrences.count(), 3)  # Feb, Mar and Apr 1st
+
+        self.assertEqual(totals["budgets_created"], 3)
+        latest = Budget.objects.filter(next_period__isnull=True, is_recurring=True).get()
+        self.assertEqual(latest.start_date, date(2025, 4, 4))
+        self.assertEqual(latest.allocated_amount, Decimal("2000.00"))
+
+        # Each occurrence is booked to the period covering its date: Jan 1-31, Feb 1-Mar 3,
+        # Mar 4-Apr 3 and Apr 4 on.
+        periods = list(Budget.objects.order_by("start_date").values_list("start_date", "spent_amount"))
+        self.assertEqual(periods, [
+            (date(2025, 1, 1), Decimal("1500.00")),
+            (date(2025, 2, 1), Decimal("3000.00")),
+            (date(2025, 3, 4), Decimal("1500.00")),
+            (date(2025, 4, 4), Decimal("0.00")),
+        ])
+        for occurrence in self.rent.occurrences.select_related("budget"):
+            self.assertTrue(occurrence.budget.start_date <= occurrence.date <= occurrence.budget.end_date)
+
+    def test_rerun_is_idempotent_and_incremental(self):
+        materialize_all(today=date(2025, 3, 1), horizon_days=45)
+        totals = materialize_all(today=date(2025, 3, 1), horizon_days=45)
+        self.assertEqual(sum(totals.values()), 0)
+
+        totals = materialize_all(today=date(2025, 4, 1), horizon_days=45)
+        self.assertEqual(totals["incomes_created"], 1)
+        self.assertEqual(totals["expenses_created"], 1)
+        self.salary.refresh_from_db()
+        self.assertEqual(self.salary.materialized_through, date(2025, 5, 16))
+
+    def test_command(self):
+        out = StringIO()
+        call_command("materialize_recurring", today=date(2025, 2, 1), horizon_days=10, chunk_size=1, stdout=out)
+        self.assertIn("Created 0 incomes, 1 expenses", out.getvalue())
@@ -0,0 +1,112 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock, skipUnless
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from core import replicas
+from core.models import Budget, BudgetCategory, Expense
+from core.versioning import bump_versions
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTestCase(TestCase):
+    # Version bumps are deferred to the commit of a transaction on "default".
+    databases = {"default"}
+
+    def setUp(self):
+        cache.clear()
+        replicas._lags.clear()
+        self.router = replicas.ReplicaRouter()
+
+    def test_reads_follow_the_request_until_it_writes(self):
+        self.assertIsNone(self.router.db_for_read(Expense))
+        token = replicas._read_alias.set("replica")
+        try:
+            # Reads inside a transaction, such as the one wrapping this test, stay on the primary.
+            self.assertIsNone(self.router.db_for_read(Expense))
+            with mock.patch.object(connection, "in_atomic_block", False):
+                self.assertEqual(self.router.db_for_read(Expense), "replica")
+            self.assertEqual(self.router.db_for_write(Expense), "default")
+            self.assertIsNone(self.router.db_for_read(Expense))
+        finally:
+            replicas._read_alias.reset(token)
+
+    def test_lagging_replicas_are_skipped(self):
+        with override_settings(REPLICA_MAX_LAG_SECONDS=5), mock.patch.object(replicas, "measure_lag", return_value=30.0) as measure:
+            self.assertIsNone(replicas.choose_replica())
+            self.assertIsNone(replicas.choose_replica())
+        measure.assert_called_once_with("replica")  # measured once per check interval
+
+    def test_version_bumps_pin_users(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_versions(1, "expenses")
+        self.assertTrue(replicas.is_pinned(1))
+        self.assertFalse(replicas.is_pinned(2))
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_versions(None, "exchange-rates")
+        self.assertTrue(replicas.is_pinned(2))
+
+    def test_token_user_id_reads_the_access_token(self):
+        user = User(id=7, username="token-user")
+        request = RequestFactory().get("/expenses/", HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        self.assertEqual(replicas.token_user_id(request), "7")
+        self.assertIsNone(replicas.token_user_id(RequestFactory().get("/expenses/", HTTP_AUTHORIZATION="Bearer nonsense")))
+        self.assertIsNone(replicas.token_user_id(RequestFactory().get("/expenses/")))
+        self.assertIsNone(replicas.token_user_id(RequestFactory().get("/expenses/", HTTP_AUTHORIZATION="Bearer")))
+        self.assertIsNone(replicas.token_user_id(RequestFactory().get("/expenses/", HTTP_AUTHORIZATION="Bearer a b")))
+
+    def test_malformed_authorization_is_left_to_the_view(self):
+        response = self.client.get("/expenses/", HTTP_AUTHORIZATION="Bearer")
+        self.assertEqual(response.status_code, 401)
+
+
+@skipUnless("replica" in settings.DATABASES, "needs a second database alias named 'replica'")
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingTestCase(TransactionTestCase):
+    """
+    The two aliases are separate databases here, so rows written only to "replica"
+    show which database a request read from.
+    """
+    # Django checks the aliases while setting up the run, before the class is skipped.
+    databases = {"default", "replica"} if "replica" in settings.DATABASES else {"default"}
+
+    def setUp(self):
+        cache.clear()
+        replicas._lags.clear()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        replica_user = User.objects.db_manager("replica").create_user(id=self.user.id, username="testuser", password="testpass")
+        category = BudgetCategory.objects.using("replica").create(user=replica_user, name="Food")
+        budget = Budget.objects.using("replica").create(user=replica_user, category=category, allocated_amount=Decimal("100.00"))
+        Expense.objects.using("replica").create(budget=budget, amount=Decimal("5.00"), description="Only on the replica", date=date(2025, 1, 1))
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def descriptions(self):
+        cache.clear()  # drop the cached list response
+        return [expense["description"] for expense in self.client.get("/expenses/").data]
+
+    def test_safe_requests_read_from_the_replica(self):
+        self.assertEqual(self.descriptions(), ["Only on the replica"])
+
+    def test_writes_pin_the_user_to_the_primary(self):
+        response = self.client.post("/categories/", {"name": "Travel"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(BudgetCategory.objects.using("default").filter(user=self.user).count(), 1)
+        self.assertTrue(replicas.is_pinned(self.user.id))
+        response = self.client.get("/expenses/")
+        self.assertEqual(response.data, [])
+
+    def test_lagging_replica_falls_back_to_the_primary(self):
+        with mock.patch.object(replicas, "measure_lag", return_value=60.0):
+            self.assertEqual(self.descriptions(), [])
+
+    def test_no_replicas_read_from_the_primary(self):
+        with override_settings(DATABASE_REPLICAS=[]):
+            self.assertEqual(self.descriptions(), [])
@@ -0,0 +1,114 @@
+from datetime import date
+from decimal import Decimal
+from importlib import import_module
+from types import SimpleNamespace
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import Budget, Income, Expense, BudgetCategory, MonthlyRollup
+from core.recurrence import materialize_users
+from core.rollups import monthly_report, rebuild_rollups
+
+User = get_user_model()
+
+
+def rollup_rows(user):
+    return sorted(
+        MonthlyRollup.objects.filter(user=user).exclude(count=0)
+        .values_list("kind", "category_id", "month", "total", "count")
+    )
+
+
+class MonthlyRollupTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.food = BudgetCategory.objects.create(user=self.user, name="Food")
+        self.rent = BudgetCategory.objects.create(user=self.user, name="Rent")
+        self.budget = Budget.objects.create(user=self.user, category=self.food, allocated_amount=Decimal("1000.00"))
+        self.rent_budget = Budget.objects.create(user=self.user, category=self.rent, allocated_amount=Decimal("2000.00"))
+
+    def assertMatchesRebuild(self):
+        incremental = rollup_rows(self.user)
+        rebuild_rollups([self.user.id])
+        self.assertEqual(incremental, rollup_rows(self.user))
+
+    def test_writes_keep_rollups_in_step(self):
+        lunch = Expense.objects.create(budget=self.budget, description="Lunch", amount=Decimal("12.50"), date=date(2025, 1, 5))
+        Expense.objects.create(budget=self.budget, description="Dinner", amount=Decimal("30.00"), date=date(2025, 1, 20))
+        salary = Income.objects.create(user=self.user, source="Salary", amount=Decimal("3000.00"), date=date(2025, 1, 1))
+        self.assertEqual(rollup_rows(self.user), [
+            ("expense", self.food.id, date(2025, 1, 1), Decimal("42.50"), 2),
+            ("income", None, date(2025, 1, 1), Decimal("3000.00"), 1),
+        ])
+
+        lunch.date, lunch.budget, lunch.amount = date(2025, 2, 3), self.rent_budget, Decimal("15.00")
+        lunch.save()
+        salary.amount = Decimal("3100.00")
+        salary.save()
+        self.assertMatchesRebuild()
+
+        Expense.objects.filter(pk=lunch.pk).delete()
+        salary.delete()
+        self.assertEqual(rollup_rows(self.user), [("expense", self.food.id, date(2025, 1, 1), Decimal("30.00"), 1)])
+
+    def test_budget_category_change_moves_totals(self):
+        Expense.objects.create(budget=self.budget, description="Lunch", amount=Decimal("12.50"), date=date(2025, 1, 5))
+        budget = Budget.objects.get(pk=self.budget.pk)
+        budget.category = self.rent
+        budget.save()
+        self.assertEqual(rollup_rows(self.user), [("expense", self.rent.id, date(2025, 1, 1), Decimal("12.50"), 1)])
+
+    def test_bulk_paths_and_cascading_deletes(self):
+        Expense.objects.create(budget=self.budget, description="Gym", amount=Decimal("40.00"), date=date(2025, 1, 3), recurring=True)
+        Income.objects.create(user=self.user, source="Salary", amount=Decimal("3000.00"), date=date(2025, 1, 1), recurring=True)
+        materialize_users([self.user.id], date(2025, 3, 15), horizon_days=0)
+        self.assertMatchesRebuild()
+        self.assertEqual(MonthlyRollup.objects.filter(user=self.user, kind="expense").count(), 3)
+
+        self.user.delete()
+        self.assertFalse(MonthlyRollup.objects.exists())
+
+    def test_report_reads_only_rollups(self):
+        for month in (1, 2, 3):
+            Expense.objects.create(budget=self.budget, description="Food", amount=Decimal("100.00") * month, date=date(2025, month, 10))
+            Income.objects.create(user=self.user, source="Salary", amount=Decimal("1000.00"), date=date(2025, month, 1))
+        Expense.objects.create(budget=self.rent_budget, description="Rent", amount=Decimal("800.00"), date=date(2025, 3, 1))
+        Expense.objects.create(budget=self.rent_budget, description="Old", amount=Decimal("800.00"), date=date(2024, 1, 1))
+
+        with self.assertNumQueries(1):
+            report = monthly_report(self.user.id, 3, date(2025, 3, 20), "USD")
+        self.assertEqual(report["months"], ["2025-01", "2025-02", "2025-03"])
+        self.assertEqual(report["income"], [Decimal("1000.00")] * 3)
+        self.assertEqual(report["expense"], [Decimal("100.00"), Decimal("200.00"), Decimal("1100.00")])
+        self.assertEqual(report["net"], [Decimal("900.00"), Decimal("800.00"), Decimal("-100.00")])
+        self.assertEqual([category["name"] for category in report["categories"]], ["Food", "Rent"])
+        self.assertEqual(report["categories"][1]["counts"], [0, 0, 1])
+
+    def test_migration_backfills_existing_rows(self):
+        Expense.objects.create(budget=self.budget, description="Lunch", amount=Decimal("12.50"), date=date(2025, 1, 5))
+        Income.objects.create(user=self.user, source="Salary", amount=Decimal("3000.00"), date=date(2025, 2, 1))
+        expected = rollup_rows(self.user)
+        MonthlyRollup.objects.all().delete()  # as before the rollups existed
+
+        migration = import_module("core.migrations.0011_backfill_monthly_rollups")
+        migration.backfill_rollups(apps, SimpleNamespace(connection=connection))
+        self.assertEqual(rollup_rows(self.user), expected)
+
+    def test_rebuild_command_and_endpoint(self):
+        Expense.objects.create(budget=self.budget, description="Lunch", amount=Decimal("12.50"), date=date.today())
+        expected = rollup_rows(self.user)
+        MonthlyRollup.objects.all().delete()
+        call_command("rebuild_rollups", stdout=open("/dev/null", "w"))
+        self.assertEqual(rollup_rows(self.user), expected)
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get("/reports/monthly/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["months"]), 24)
+        self.assertEqual(response.data["expense"][-1], Decimal("12.50"))
+        self.assertEqual(client.get("/reports/monthly/?months=0").status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,72 @@
+import base64
+from datetime import date
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import Budget, Income, Expense, Debt, BudgetCategory
+from core.search import InvertedIndex, search
+
+User = get_user_model()
+
+
+class InvertedIndexTestCase(TestCase):
+    def test_ranks_exact_tokens_above_prefixes_and_requires_every_term(self):
+        index = InvertedIndex([
+            (1, 1, "Amazon Amazon Prime", Decimal("1"), date(2025, 1, 1)),
+            (1, 2, "Amazonia tours", Decimal("1"), date(2025, 1, 1)),
+            (2, 3, "Refund from amazon", Decimal("1"), date(2025, 1, 1)),
+        ])
+        self.assertEqual(index.search("amazon"), {(1, 1): 2.0, (1, 2): 0.5, (2, 3): 1.0})
+        self.assertEqual(index.search("amazon prime"), {(1, 1): 3.0})
+        self.assertEqual(index.search("ebay"), {})
+
+
+class SearchTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        category = BudgetCategory.objects.create(user=self.user, name="Shopping")
+        budget = Budget.objects.create(user=self.user, category=category, allocated_amount=Decimal("500.00"))
+        self.expenses = [
+            Expense.objects.create(budget=budget, description=f"Amazon order {index}", amount=Decimal("10.00"), date=date(2025, 1, index + 1))
+            for index in range(5)
+        ]
+        self.income = Income.objects.create(user=self.user, source="Amazon", description="Refund amazon", amount=Decimal("20.00"), date=date(2025, 2, 1))
+        self.debt = Debt.objects.create(user=self.user, creditor_name="Amazon Credit", amount=Decimal("300.00"), due_date=date(2025, 3, 1))
+        Expense.objects.create(budget=budget, description="Grocery store", amount=Decimal("5.00"), date=date(2025, 1, 1))
+        other = User.objects.create_user(username="other", password="testpass")
+        Debt.objects.create(user=other, creditor_name="Amazon", amount=Decimal("1.00"), due_date=date(2025, 3, 1))
+
+    def test_pages_through_ranked_results(self):
+        response = self.client.get("/search/", {"q": "amazon", "page_size": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first = response.data[0]
+        self.assertEqual((first["kind"], first["id"], first["text"]), ("income", self.income.id, "Amazon Refund amazon"))
+        seen = [(row["kind"], row["id"]) for row in response.data]
+        while "Link" in response:
+            next_url = response["Link"].split(";")[0].strip("<>")
+            response = self.client.get(next_url)
+            seen += [(row["kind"], row["id"]) for row in response.data]
+        expected = {("income", self.income.id), ("debt", self.debt.id)} | {("expense", expense.id) for expense in self.expenses}
+        self.assertEqual(len(seen), len(expected))
+        self.assertEqual(set(seen), expected)
+
+    def test_index_follows_writes(self):
+        self.assertEqual(search(self.user.id, "grocery")[0][0]["text"], "Grocery store")
+        self.expenses[0].description = "Grocery market"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.expenses[0].save()
+        self.assertEqual(len(search(self.user.id, "grocery")[0]), 2)
+
+    def test_rejects_missing_query_and_bad_cursor(self):
+        self.assertEqual(self.client.get("/search/").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get("/search/", {"q": "amazon", "cursor": "!!"}).status_code, status.HTTP_400_BAD_REQUEST)
+        for raw in [b"[1.0, 1, 1e400]", b"[1e400, 1, 1]", b"[NaN, 1, 1]", b'[1.0, "1", 1]']:
+            cursor = base64.urlsafe_b64encode(raw).decode()
+            response = self.client.get("/search/", {"q": "amazon", "cursor": cursor})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, raw)
@@ -0,0 +1,62 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import Budget, Expense, BudgetCategory
+
+User = get_user_model()
+
+
+class SpentAmountTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.client.force_authenticate(self.user)
+        category = BudgetCategory.objects.create(user=self.user, name="Food")
+        self.budget = Budget.objects.create(user=self.user, category=category, allocated_amount=Decimal("1000.00"))
+        self.other = Budget.objects.create(user=self.user, category=category, allocated_amount=Decimal("500.00"))
+
+    def spent(self, budget):
+        budget.refresh_from_db(fields=["spent_amount"])
+        return budget.spent_amount
+
+    def test_create_update_delete(self):
+        expense = Expense.objects.create(budget=self.budget, description="Groceries", amount=Decimal("40.00"), date=date(2025, 1, 1))
+        self.assertEqual(self.spent(self.budget), Decimal("40.00"))
+
+        expense.amount = Decimal("25.50")
+        expense.save()
+        self.assertEqual(self.spent(self.budget), Decimal("25.50"))
+
+        expense = Expense.objects.only("id").get(pk=expense.pk)
+        expense.budget = self.other
+        expense.save()
+        self.assertEqual(self.spent(self.budget), Decimal("0.00"))
+        self.assertEqual(self.spent(self.other), Decimal("25.50"))
+
+        expense.delete()
+        self.assertEqual(self.spent(self.other), Decimal("0.00"))
+
+    def test_bulk_endpoint_updates_each_budget_once(self):
+        payload = [
+            {"budget": self.budget.id, "amount": "10.00", "description": "A", "date": "2025-01-01"},
+            {"budget": self.budget.id, "amount": "15.00", "description": "B", "date": "2025-01-02"},
+            {"budget": self.other.id, "amount": "7.25", "description": "C", "date": "2025-01-03"},
+        ]
+        response = self.client.post("/expenses/bulk-create/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.spent(self.budget), Decimal("25.00"))
+        self.assertEqual(self.spent(self.other), Decimal("7.25"))
+
+    def test_reconcile_command(self):
+        Expense.objects.create(budget=self.budget, description="Groceries", amount=Decimal("40.00"), date=date(2025, 1, 1))
+        Budget.objects.filter(pk=self.budget.pk).update(spent_amount=Decimal("999.00"))
+        Budget.objects.filter(pk=self.other.pk).update(spent_amount=Decimal("1.00"))
+
+        call_command("reconcile_spent_amounts", chunk_size=1, stdout=StringIO())
+        self.assertEqual(self.spent(self.budget), Decimal("40.00"))
+        self.assertEqual(self.spent(self.other), Decimal("0.00"))
@@ -0,0 +1,87 @@
+from datetime import date
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import Goal, Budget, Income, Expense, Debt, BudgetCategory, Notification
+
+User = get_user_model()
+
+
+class SpendingSummaryCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.client.force_authenticate(self.user)
+        self.category = BudgetCategory.objects.create(user=self.user, name="Food")
+        self.budget = Budget.objects.create(
+            user=self.user, category=self.category, allocated_amount=Decimal("1000.00"), spent_amount=Decimal("200.00")
+        )
+
+    def test_summary_is_aggregated(self):
+        Budget.objects.create(user=self.user, category=self.category, allocated_amount=Decimal("500.00"), spent_amount=Decimal("50.00"))
+        response = self.client.get("/spending-summary/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total_allocated"], Decimal("1500.00"))
+        self.assertEqual(response.data["total_spent"], Decimal("250.00"))
+        self.assertEqual(response.data["remaining_budget"], Decimal("1250.00"))
+
+    def test_repeated_hits_are_served_from_cache(self):
+        self.client.get("/spending-summary/")
+        with self.assertNumQueries(0):
+            response = self.client.get("/spending-summary/")
+        self.assertEqual(response.data["remaining_budget"], Decimal("800.00"))
+
+    def test_budget_and_expense_writes_invalidate(self):
+        self.client.get("/spending-summary/")
+        self.budget.allocated_amount = Decimal("2000.00")
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.budget.save()
+            # Until the write commits, readers keep the totals they can see.
+            self.assertEqual(self.client.get("/spending-summary/").data["total_allocated"], Decimal("1000.00"))
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get("/spending-summary/").data["total_allocated"], Decimal("2000.00"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Expense.objects.create(budget=self.budget, description="Groceries", amount=Decimal("10.00"), date=date(2025, 1, 1))
+        with self.assertNumQueries(1):
+            self.client.get("/spending-summary/")
+
+
+class DashboardTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.client.force_authenticate(self.user)
+        category = BudgetCategory.objects.create(user=self.user, name="Food")
+        budget = Budget.objects.create(user=self.user, category=category, allocated_amount=Decimal("1000.00"))
+        Expense.objects.create(budget=budget, description="Groceries", amount=Decimal("40.00"), date=date(2025, 1, 1))
+        Income.objects.create(user=self.user, source="Salary", amount=Decimal("3000.00"), date=date(2025, 1, 1))
+        Debt.objects.create(user=self.user, creditor_name="Bank", amount=Decimal("900.00"), paid_amount=Decimal("100.00"), due_date=date(2026, 1, 1))
+        Goal.objects.create(user=self.user, name="Car", target_amount=Decimal("5000.00"), due_date=date(2026, 1, 1))
+        Notification.objects.create(user=self.user, message="Welcome")
+
+    def test_dashboard_combines_summaries(self):
+        with self.assertNumQueries(5):
+            response = self.client.get("/dashboard/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["spending"]["total_allocated"], Decimal("1000.00"))
+        self.assertEqual(response.data["income_expense"]["balance"], Decimal("2960.00"))
+        self.assertEqual(response.data["debts"]["remaining_debt"], Decimal("800.00"))
+        self.assertEqual(len(response.data["goals"]), 1)
+        self.assertEqual(len(response.data["notifications"]), 1)
+
+    def test_unchanged_dashboard_returns_304(self):
+        etag = self.client.get("/dashboard/").headers["ETag"]
+        response = self.client.get("/dashboard/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.create(user=self.user, message="Budget exceeded")
+        response = self.client.get("/dashboard/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,152 @@
+import base64
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import Goal, Budget, Expense, BudgetCategory, Notification, Tombstone, TombstoneWatermark
+from core.sync import SYNC_RESOURCES, prune_tombstones, sync, sync_resource
+
+User = get_user_model()
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class SyncTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.category = BudgetCategory.objects.create(user=self.user, name="Food")
+        self.budget = Budget.objects.create(user=self.user, category=self.category, allocated_amount=Decimal("500.00"))
+        self.expense = Expense.objects.create(budget=self.budget, description="Lunch", amount=Decimal("12.00"), date=date(2025, 1, 1))
+        self.goal = Goal.objects.create(user=self.user, name="Car", target_amount=Decimal("5000.00"), due_date=date(2026, 1, 1))
+        self.notification = Notification.objects.create(user=self.user, message="Welcome")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def cursors(self, response):
+        return {name: changes["cursor"] for name, changes in response.data.items()}
+
+    def test_cold_start_then_only_changes(self):
+        response = self.client.get("/sync/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), set(SYNC_RESOURCES))
+        self.assertEqual([row["id"] for row in response.data["expenses"]["updated"]], [self.expense.id])
+        self.assertEqual(len(response.data["notifications"]["updated"]), 1)
+
+        cursors = self.cursors(response)
+        response = self.client.get("/sync/", cursors)
+        self.assertTrue(all(not changes["updated"] and not changes["deleted"] for changes in response.data.values()))
+
+        self.goal.current_savings = Decimal("100.00")
+        self.goal.save()
+        Expense.objects.create(budget=self.budget, description="Dinner", amount=Decimal("30.00"), date=date(2025, 1, 2))
+        expense_id = self.expense.id
+        self.expense.delete()
+        self.notification.is_read = True
+        self.notification.save()
+
+        changes = sync(self.user.id, cursors)
+        self.assertEqual([row["current_savings"] for row in changes["goals"]["updated"]], ["100.00"])
+        self.assertEqual([row["description"] for row in changes["expenses"]["updated"]], ["Dinner"])
+        self.assertEqual(changes["expenses"]["deleted"], [expense_id])
+        # spent_amount moves through F() updates, which still bump updated_at.
+        self.assertEqual([row["spent_amount"] for row in changes["budgets"]["updated"]], ["30.00"])
+        self.assertEqual([row["is_read"] for row in changes["notifications"]["updated"]], [True])
+        self.assertEqual(changes["debts"], {**changes["debts"], "updated": [], "deleted": []})
+
+    def test_pages_through_rows_with_equal_timestamps(self):
+        for index in range(4):
+            Goal.objects.create(user=self.user, name=f"Goal {index}", target_amount=Decimal("10.00"), due_date=date(2026, 1, 1))
+        Goal.objects.update(updated_at=timezone.now())
+        horizon = timezone.now()
+
+        seen, cursor = [], None
+        for _ in range(3):
+            page = sync_resource(self.user.id, "goals", cursor, 0, horizon, page_size=2)
+            seen.extend(row["id"] for row in page["updated"])
+            cursor = page["cursor"]
+            if not page["has_more"]:
+                break
+        self.assertEqual(seen, sorted(Goal.objects.values_list("id", flat=True)))
+
+    def test_pruned_tombstones_force_a_reset(self):
+        cursors = self.cursors(self.client.get("/sync/"))
+        self.goal.delete()
+        Goal.objects.create(user=self.user, name="Bike", target_amount=Decimal("300.00"), due_date=date(2026, 1, 1))
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=100))
+        self.assertEqual(prune_tombstones(timezone.now() - timedelta(days=90)), 1)
+        self.assertFalse(Tombstone.objects.exists())
+
+        changes = sync(self.user.id, cursors)
+        self.assertTrue(changes["goals"]["reset"])
+        self.assertEqual([row["name"] for row in changes["goals"]["updated"]], ["Bike"])
+        self.assertFalse(changes["expenses"]["reset"])  # nothing of theirs was pruned
+
+        # The cursor after the reset is past the pruned deletions, as is a new client's.
+        self.assertFalse(sync(self.user.id, self.cursors(self.client.get("/sync/")))["goals"]["reset"])
+        self.assertFalse(sync(self.user.id, {"goals": changes["goals"]["cursor"]})["goals"]["reset"])
+
+    def test_pruning_records_a_watermark_per_user_and_resource(self):
+        other = User.objects.create_user(username="other", password="testpass")
+        self.goal.delete()
+        Goal.objects.create(user=other, name="Boat", target_amount=Decimal("1.00"), due_date=date(2026, 1, 1)).delete()
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=100))
+        prune_tombstones(timezone.now() - timedelta(days=90))
+        self.assertEqual(
+            set(TombstoneWatermark.objects.values_list("user_id", "model")), {(self.user.id, "goals"), (other.id, "goals")}
+        )
+
+    def test_deleting_a_user_keeps_tombstones_consistent(self):
+        expense_id = self.expense.id
+        self.user.delete()
+        self.assertTrue(Tombstone.objects.filter(model="expenses", object_id=expense_id).exists())
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/sync/", {"goals": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        for value in ([None, 1e400, 0], [None, 1, 1.5]):
+            cursor = base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+            response = self.client.get("/sync/", {"goals": cursor})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(SYNC_SETTLE_SECONDS=60)
+class SyncSettleWindowTestCase(TestCase):
+    """Writes commit after their timestamps are taken, so recent changes are sent until they settle."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.other = User.objects.create_user(username="other", password="testpass")
+
+    def goal(self, name, seconds_ago, user=None):
+        goal = Goal.objects.create(user=user or self.user, name=name, target_amount=Decimal("10.00"), due_date=date(2026, 1, 1))
+        Goal.objects.filter(pk=goal.pk).update(updated_at=timezone.now() - timedelta(seconds=seconds_ago))
+        return goal
+
+    def test_rows_committed_late_with_older_timestamps_are_sent(self):
+        self.goal("Old", 600)
+        self.goal("New", 0)
+        changes = sync(self.user.id, {})["goals"]
+        self.assertEqual([row["name"] for row in changes["updated"]], ["Old", "New"])
+
+        # Timestamped before "New" but committed after the sync above read the table.
+        self.goal("Late", 30)
+        changes = sync(self.user.id, {"goals": changes["cursor"]})["goals"]
+        self.assertEqual([row["name"] for row in changes["updated"]], ["Late", "New"])
+
+    def test_tombstones_committed_late_with_lower_ids_are_sent(self):
+        cursor = sync(self.user.id, {})["goals"]["cursor"]
+        placeholder = Tombstone.objects.create(user=self.other, model="goals", object_id=1)
+        Tombstone.objects.create(user=self.other, model="goals", object_id=2)
+        placeholder.delete()
+        cursor = sync(self.user.id, {"goals": cursor})["goals"]["cursor"]
+
+        # A deletion whose tombstone id was taken before the other user's, but committed later.
+        Tombstone.objects.create(id=placeholder.id, user=self.user, model="goals", object_id=42)
+        changes = sync(self.user.id, {"goals": cursor})["goals"]
+        self.assertEqual(changes["deleted"], [42])
+        # Still inside the window, so it is sent again rather than skipped for good.
+        self.assertEqual(sync(self.user.id, {"goals": changes["cursor"]})["goals"]["deleted"], [42])
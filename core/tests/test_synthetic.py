@@ -0,0 +1,62 @@
+import json
+import tempfile
+from io import StringIO
+from django.core.management import CommandError, call_command
+from django.db.models import Sum
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from core.models import Budget, Income, Expense, Notification, Tombstone
+from core.synthetic import delete_synthetic_users, generate_dataset
+
+User = get_user_model()
+
+
+@override_settings(DEBUG=True)
+class SyntheticDataTestCase(TestCase):
+    def test_generates_requested_mix(self):
+        owners = generate_dataset(1000, users=5, seed=1)
+        self.assertEqual(len(owners), 5)
+        self.assertEqual(Expense.objects.count(), 600)
+        self.assertEqual(Income.objects.count(), 250)
+        self.assertEqual(Notification.objects.count(), 150)
+        spent = Budget.objects.aggregate(total=Sum("spent_amount"))["total"]
+        self.assertEqual(spent, Expense.objects.aggregate(total=Sum("amount"))["total"])
+
+    def test_same_seed_same_data(self):
+        generate_dataset(100, users=2, seed=7)
+        first = list(Expense.objects.order_by("id").values_list("amount", "description", "date"))
+        Expense.objects.all().delete()
+        generate_dataset(100, users=2, seed=7)
+        second = list(Expense.objects.order_by("id").values_list("amount", "description", "date"))
+        self.assertEqual(first, second)
+
+    def test_benchmark_api_writes_json(self):
+        with tempfile.NamedTemporaryFile(suffix=".json") as output:
+            call_command("benchmark_api", scales="50,100", requests=2, output=output.name, stdout=StringIO())
+            results = json.load(open(output.name))
+        self.assertEqual([scale["rows"] for scale in results["scales"]], [50, 100])
+        expenses = results["scales"][1]["endpoints"]["/expenses/"]
+        self.assertEqual(expenses["status"], 200)
+        self.assertLessEqual(expenses["p50_ms"], expenses["p99_ms"])
+
+    @override_settings(DEBUG=False)
+    def test_loading_refuses_without_debug(self):
+        for command in ("benchmark_indexes", "benchmark_api"):
+            with self.assertRaisesMessage(CommandError, "only runs with DEBUG on"):
+                call_command(command, stdout=StringIO())
+        with self.assertRaises(ImproperlyConfigured):
+            generate_dataset(10, users=1)
+        self.assertFalse(User.objects.exists())
+
+    def test_delete_synthetic_users(self):
+        real = User.objects.create_user(username="realuser", password="testpass")
+        generate_dataset(100, users=3, seed=2)
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("delete_synthetic_users", batch_size=2, stdout=out)
+        self.assertIn("Deleted 3 synthetic users", out.getvalue())
+        self.assertEqual(list(User.objects.all()), [real])
+        self.assertFalse(Expense.objects.exists() or Income.objects.exists() or Budget.objects.exists())
+        self.assertFalse(Tombstone.objects.exists())
+        self.assertEqual(delete_synthetic_users(), 0)
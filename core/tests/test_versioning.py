@@ -0,0 +1,80 @@
+from datetime import date
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.checks import check_shared_cache
+from core.models import Goal, Budget, Expense, BudgetCategory
+
+User = get_user_model()
+
+
+class ConditionalGetTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.category = BudgetCategory.objects.create(user=self.user, name="Food")
+        self.budget = Budget.objects.create(user=self.user, category=self.category, allocated_amount=Decimal("500.00"))
+        Goal.objects.create(user=self.user, name="Car", target_amount=Decimal("5000.00"), due_date=date(2026, 1, 1))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertNotModified(self, url, etag):
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.headers["ETag"], etag)
+
+    def test_unchanged_lists_answer_304_without_queries(self):
+        for url in ("/goals/", "/budget/", "/spending-summary/"):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotModified(url, response.headers["ETag"])
+
+    def test_versions_change_when_the_write_commits(self):
+        goals_etag = self.client.get("/goals/").headers["ETag"]
+        with self.captureOnCommitCallbacks() as callbacks:
+            Goal.objects.create(user=self.user, name="Boat", target_amount=Decimal("100.00"), due_date=date(2026, 1, 1))
+            self.assertNotModified("/goals/", goals_etag)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get("/goals/", HTTP_IF_NONE_MATCH=goals_etag).status_code, status.HTTP_200_OK)
+
+    def test_shared_cache_is_a_deploy_requirement(self):
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}):
+            self.assertEqual([error.id for error in check_shared_cache(None)], ["core.W001"])
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://localhost:6379"}}):
+            self.assertEqual(check_shared_cache(None), [])
+
+    def test_writes_change_the_etag(self):
+        goals_etag = self.client.get("/goals/").headers["ETag"]
+        budget_etag = self.client.get("/budget/").headers["ETag"]
+        summary_etag = self.client.get("/spending-summary/").headers["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Expense.objects.create(budget=self.budget, description="Lunch", amount=Decimal("12.00"), date=date(2025, 1, 1))
+        self.assertEqual(self.client.get("/budget/", HTTP_IF_NONE_MATCH=budget_etag).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get("/spending-summary/", HTTP_IF_NONE_MATCH=summary_etag).status_code, status.HTTP_200_OK)
+        self.assertNotModified("/goals/", goals_etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/goals/bulk-create/", [
+                {"name": "Trip", "target_amount": "100.00", "due_date": "2026-01-01"},
+            ], format="json")
+        response = self.client.get("/goals/", HTTP_IF_NONE_MATCH=goals_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+
+    def test_etag_depends_on_query_user_and_lost_versions(self):
+        etag = self.client.get("/goals/").headers["ETag"]
+        self.assertNotEqual(self.client.get("/goals/?page_size=1").headers["ETag"], etag)
+
+        other = User.objects.create_user(username="other", password="testpass")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get("/goals/", HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(self.user)
+        cache.clear()
+        self.assertEqual(self.client.get("/goals/", HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
@@ -0,0 +1,95 @@
+import hashlib
+import uuid
+from functools import wraps
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework import status
+from rest_framework.response import Response
+from .replicas import pin_users
+
+VERSION_KEY = "version:{resource}:{user_id}"
+# Resources shared by every user, versioned once rather than per user.
+GLOBAL_RESOURCES = {"exchange-rates"}
+# Versions only need to outlive the ETags clients hold; a lost one is simply re-seeded.
+VERSION_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def version_keys(user_id, resources):
+    return [
+        VERSION_KEY.format(resource=resource, user_id="all" if resource in GLOBAL_RESOURCES else user_id)
+        for resource in resources
+    ]
+
+
+def get_versions(user_id, resources):
+    """
+    Current version token of each resource, in one cache round trip when all are present.
+
+    Missing tokens are seeded with random values rather than counters, so a version
+    lost to eviction never comes back as one a client has already seen.
+    """
+    keys = version_keys(user_id, resources)
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, uuid.uuid4().hex, VERSION_TIMEOUT)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key, "") for key in keys]
+
+
+def bump_versions(user_id, *resources):
+    bump_user_versions([user_id], *resources)
+
+
+def bump_user_versions(user_ids, *resources):
+    """
+    bump_versions() for many users in one cache round trip.
+
+    Inside a transaction the bump waits for the commit: a request served in between
+    would otherwise pair the new versions with the old rows and hand out an ETag that
+    stays valid after the commit. The users also read from the primary for a while,
+    so a response cached under the new versions is never built from a replica that
+    has not replayed the write yet.
+    """
+    keys = [key for user_id in user_ids for key in version_keys(user_id, resources)]
+    pinned = {"all" if resource in GLOBAL_RESOURCES else user_id for user_id in user_ids for resource in resources}
+
+    def bump():
+        cache.set_many({key: uuid.uuid4().hex for key in keys}, VERSION_TIMEOUT)
+        pin_users(pinned)
+
+    transaction.on_commit(bump)
+
+
+def resource_etag(request, resources):
+    versions = get_versions(request.user.id, resources)
+    # Pages, filters and representations of the same resource need different tags.
+    parts = [str(request.user.id), request.get_full_path(), request.META.get("HTTP_ACCEPT", ""), *versions]
+    return f'"{hashlib.sha1("|".join(parts).encode()).hexdigest()}"'
+
+
+def versioned(*resources):
+    """
+    Answer a GET with 304 Not Modified when the client's ETag matches the current
+    versions of `resources`, before the view runs any query.
+
+    The versions are read before the view builds its response, so a write racing with
+    the request leaves an ETag that is already stale rather than one that hides it.
+    """
+
+    def decorator(get):
+        @wraps(get)
+        def wrapper(view, request, *args, **kwargs):
+            etag = resource_etag(request, resources)
+            if get_conditional_response(request, etag=etag) is not None:
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+            response = get(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                response["ETag"] = etag
+            return response
+
+        return wrapper
+
+    return decorator
@@ -1,16 +1,44 @@
-from .models import Goal, Budget, Income, Expense, Debt, BudgetCategory, Notification
+from .models import Goal, Budget, Income, Expense, Debt, BudgetCategory, Notification, CategorizationRule
 from .serializers import UserSerializer
 from .serializers import GoalSerializer, BudgetSerializer, IncomeSerializer, ExpenseSerializer, DebtSerializer, BudgetCategorySerializer
+from .serializers import CategorizationRuleSerializer
+from .serializers import PayoffPlanSerializer
+from .pagination import KeysetPagination
+from .importers import import_transactions, detect_format, ImportFormatError
+from .exporters import EXPORTERS, EXPORT_FORMATS, stream_async
+from .metrics import registry
+from .forecasting import forecast, MAX_FORECAST_MONTHS
+from .payoff import payoff_plans
+from .rollups import monthly_report, MAX_REPORT_MONTHS
+from .currency import user_currency
+from .sync import sync, SYNC_RESOURCES
+from .search import search, SEARCH_PAGE_SIZE, MAX_SEARCH_PAGE_SIZE, MAX_QUERY_LENGTH
+from .versioning import versioned, bump_versions
+from .broker import get_broker, notification_channel, notification_payload
+from .goal_probability import goal_probabilities, DEFAULT_PATHS, MAX_PATHS
+from .summaries import get_spending_summary, compute_income_expense_summary, compute_debt_summary, build_dashboard
 from rest_framework.views import APIView
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
-from rest_framework.permissions import IsAuthenticated, AllowAny
-from django.db.models import Sum
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.utils.urls import replace_query_param
 from rest_framework import status
 from rest_framework import viewsets
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+import asyncio
+import io
+import json
+from collections import deque
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views import View
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models.functions import Now
 
 
 class RegisterView(APIView):
@@ -59,10 +87,12 @@ class LoginView(APIView):
 class GoalListCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @versioned("goals")
     def get(self, request):
-        goals = Goal.objects.filter(user=request.user)
-        serializer = GoalSerializer(goals, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        paginator = KeysetPagination(ordering_field="created_at")
+        queryset = GoalSerializer.optimize_queryset(Goal.objects.filter(user=request.user), extra_fields=[paginator.ordering_field])
+        data = GoalSerializer.paginated_data(queryset, paginator, request)
+        return paginator.get_paginated_response(data)
 
     def post(self, request):
         serializer = GoalSerializer(data=request.data)
@@ -126,17 +156,19 @@ class BulkGoalCreateView(APIView):
     def post(self, request):
         serializer = GoalSerializer(data=request.data, many=True)  # many=True to handle list of goals
         if serializer.is_valid():
-            serializer.save(user=request.user)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            goals = serializer.save(user=request.user)
+            return Response([goal.id for goal in goals], status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 class BudgetListCreateView(APIView): 
     permission_classes = [IsAuthenticated]
 
+    @versioned("budgets")
     def get(self, request):
-        budgets = Budget.objects.filter(user=request.user)
-        serializer = BudgetSerializer(budgets, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        paginator = KeysetPagination(ordering_field="created_at")
+        queryset = BudgetSerializer.optimize_queryset(Budget.objects.filter(user=request.user), extra_fields=[paginator.ordering_field])
+        data = BudgetSerializer.paginated_data(queryset, paginator, request)
+        return paginator.get_paginated_response(data)
 
     def post(self, request):
         serializer = BudgetSerializer(data=request.data)
@@ -157,7 +189,7 @@ class BudgetAllocationView(APIView):
         allocated_amount = request.data.get("allocated_amount")
         if allocated_amount is not None:
             budget.allocated_amount = allocated_amount
-            budget.save()
+            budget.save(update_fields=["allocated_amount", "updated_at"])
             return Response({"message": "Budget updated successfully"}, status=status.HTTP_200_OK)
         return Response({"error": "Allocated amount required"}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -165,43 +197,116 @@ class BudgetAllocationView(APIView):
 class SpendingSummaryView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @versioned("spending", "exchange-rates")
     def get(self, request):
-        budgets = Budget.objects.filter(user=request.user)
-        total_allocated = sum(budget.allocated_amount for budget in budgets)
-        total_spent = sum(budget.spent_amount for budget in budgets)
-        remaining_budget = total_allocated - total_spent
-
-        summary = {
-            "total_allocated": total_allocated,
-            "total_spent": total_spent,
-            "remaining_budget": remaining_budget
-        }
+        summary = get_spending_summary(request.user.id, user_currency(request.user))
         return Response(summary, status=status.HTTP_200_OK)
 
 
 class IncomeExpenseSummaryView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @versioned("incomes", "expenses", "exchange-rates")
     def get(self, request):
-        total_income = Income.objects.filter(user=request.user).aggregate(total_income=Sum('amount'))['total_income'] or 0
-        total_expense = Expense.objects.filter(budget__user=request.user).aggregate(total_expense=Sum('amount'))['total_expense'] or 0
-        balance = total_income - total_expense
-
-        summary = {
-            "total_income": total_income,
-            "total_expense": total_expense,
-            "balance": balance
-        }
+        summary = compute_income_expense_summary(request.user.id, user_currency(request.user))
         return Response(summary, status=status.HTTP_200_OK)
 
 
+class DashboardView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @versioned("spending", "incomes", "expenses", "debts", "goals", "notifications", "exchange-rates")
+    def get(self, request):
+        return Response(build_dashboard(request.user.id, user_currency(request.user)), status=status.HTTP_200_OK)
+
+
+class ForecastView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            months = int(request.query_params.get("months", 12))
+        except ValueError:
+            return Response({"error": "months must be a whole number"}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= months <= MAX_FORECAST_MONTHS:
+            return Response({"error": f"months must be between 1 and {MAX_FORECAST_MONTHS}"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(forecast(request.user.id, months, currency=user_currency(request.user)), status=status.HTTP_200_OK)
+
+
+class GoalProbabilityView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            paths = int(request.query_params.get("paths", DEFAULT_PATHS))
+        except ValueError:
+            return Response({"error": "paths must be a whole number"}, status=status.HTTP_400_BAD_REQUEST)
+        if not 100 <= paths <= MAX_PATHS:
+            return Response({"error": f"paths must be between 100 and {MAX_PATHS}"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(goal_probabilities(request.user.id, paths, currency=user_currency(request.user)), status=status.HTTP_200_OK)
+
+
+class MonthlyReportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            months = int(request.query_params.get("months", 24))
+        except ValueError:
+            return Response({"error": "months must be a whole number"}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= months <= MAX_REPORT_MONTHS:
+            return Response({"error": f"months must be between 1 and {MAX_REPORT_MONTHS}"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(monthly_report(request.user.id, months, date.today(), user_currency(request.user)), status=status.HTTP_200_OK)
+
+
+class SyncView(APIView):
+    """
+    Changes since the client's cursors: `?goals=<cursor>&expenses=<cursor>...`. Resources
+    without a cursor are sent in full.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        cursors = {name: request.query_params[name] for name in SYNC_RESOURCES if request.query_params.get(name)}
+        return Response(sync(request.user.id, cursors), status=status.HTTP_200_OK)
+
+
+class SearchView(APIView):
+    """
+    Expenses, incomes and debts matching `?q=`, best match first. Like the list views, the
+    body is a plain list and the next page is linked in the `Link` header.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @versioned("expenses", "incomes", "debts")
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"error": "q is required"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(query) > MAX_QUERY_LENGTH:
+            return Response({"error": f"q must be at most {MAX_QUERY_LENGTH} characters"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            page_size = int(request.query_params.get("page_size", SEARCH_PAGE_SIZE))
+        except ValueError:
+            return Response({"error": "page_size must be a whole number"}, status=status.HTTP_400_BAD_REQUEST)
+        page_size = max(1, min(page_size, MAX_SEARCH_PAGE_SIZE))
+
+        results, next_cursor = search(request.user.id, query, request.query_params.get("cursor"), page_size)
+        headers = {}
+        if next_cursor:
+            headers["Link"] = f'<{replace_query_param(request.build_absolute_uri(), "cursor", next_cursor)}>; rel="next"'
+        return Response(results, status=status.HTTP_200_OK, headers=headers)
+
+
 class IncomeListCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @versioned("incomes")
     def get(self, request):
-        incomes = Income.objects.filter(user=request.user)
-        serializer = IncomeSerializer(incomes, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        paginator = KeysetPagination(ordering_field="date")
+        queryset = IncomeSerializer.optimize_queryset(Income.objects.filter(user=request.user), extra_fields=[paginator.ordering_field])
+        data = IncomeSerializer.paginated_data(queryset, paginator, request)
+        return paginator.get_paginated_response(data)
 
     def post(self, request):
         serializer = IncomeSerializer(data=request.data)
@@ -214,14 +319,15 @@ class IncomeListCreateView(APIView):
 class ExpenseListCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @versioned("expenses")
     def get(self, request):
-        expenses = Expense.objects.filter(budget__user=request.user)
-        print(expenses)
-        serializer = ExpenseSerializer(expenses, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        paginator = KeysetPagination(ordering_field="date")
+        queryset = ExpenseSerializer.optimize_queryset(Expense.objects.filter(budget__user=request.user), extra_fields=[paginator.ordering_field])
+        data = ExpenseSerializer.paginated_data(queryset, paginator, request)
+        return paginator.get_paginated_response(data)
 
     def post(self, request):
-        serializer = ExpenseSerializer(data=request.data)
+        serializer = ExpenseSerializer(data=request.data, context={"request": request})
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -232,20 +338,71 @@ class BulkExpenseCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        serializer = ExpenseSerializer(data=request.data, many=True)
+        serializer = ExpenseSerializer(data=request.data, many=True, context={"request": request})
         if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            expenses = serializer.save()
+            return Response([expense.id for expense in expenses], status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class ImportTransactionsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"error": "A statement file is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Without a budget, expenses no categorization rule matches are skipped.
+        budget = None
+        if request.data.get("budget"):
+            try:
+                budget_id = int(request.data.get("budget"))
+            except (TypeError, ValueError):
+                return Response({"error": "budget must be an integer id"}, status=status.HTTP_400_BAD_REQUEST)
+            budget = Budget.objects.filter(id=budget_id, user=request.user).first()
+            if not budget:
+                return Response({"error": "Budget not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        file_format = request.data.get("format") or detect_format(upload.name)
+        if file_format not in ("csv", "ofx"):
+            return Response({"error": "Format must be csv or ofx"}, status=status.HTTP_400_BAD_REQUEST)
+
+        lines = io.TextIOWrapper(upload.file, encoding="utf-8-sig", errors="replace", newline="")
+        try:
+            result = import_transactions(lines, file_format, request.user, budget)
+        except ImportFormatError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_201_CREATED)
+
+
+class ExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        file_format = request.query_params.get("file_format", "csv")
+        if file_format not in EXPORTERS:
+            return Response({"error": f"file_format must be one of {', '.join(EXPORTERS)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        content_type, extension = EXPORT_FORMATS[file_format]
+        parts = EXPORTERS[file_format](request.user)
+        if isinstance(request._request, ASGIRequest):
+            # Handed a sync generator, an ASGI response reads all of it before sending.
+            parts = stream_async(parts)
+        response = StreamingHttpResponse(parts, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="financial-history.{extension}"'
+        return response
+
+
 class DebtListCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @versioned("debts")
     def get(self, request):
-        debts = Debt.objects.filter(user=request.user)
-        serializer = DebtSerializer(debts, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        paginator = KeysetPagination(ordering_field="created_at")
+        queryset = DebtSerializer.optimize_queryset(Debt.objects.filter(user=request.user), extra_fields=[paginator.ordering_field])
+        data = DebtSerializer.paginated_data(queryset, paginator, request)
+        return paginator.get_paginated_response(data)
 
     def post(self, request):
         serializer = DebtSerializer(data=request.data)
@@ -262,34 +419,43 @@ class DebtPayoffView(APIView):
         if not debt:
             return Response({"error": "Debt not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        debt.paid_off = True
-        debt.save()
+        debt.paid_amount = debt.amount
+        debt.save(update_fields=["paid_amount", "updated_at"])
         return Response({"message": "Debt marked as paid off"}, status=status.HTTP_200_OK)
 
 
+class DebtPayoffPlanView(APIView):
+    permission_classes = [IsAuthenticated]
+    default_scenarios = [{"strategy": "avalanche"}, {"strategy": "snowball"}]
+
+    def post(self, request):
+        serializer = PayoffPlanSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        scenarios = serializer.validated_data.get("scenarios") or self.default_scenarios
+        currency = user_currency(request.user)
+        plans = payoff_plans(request.user.id, scenarios, serializer.validated_data["max_months"], currency=currency)
+        return Response({"currency": currency, "scenarios": plans}, status=status.HTTP_200_OK)
+
+
 class DebtSummaryView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @versioned("debts", "exchange-rates")
     def get(self, request):
-        total_debt = Debt.objects.filter(user=request.user).aggregate(total_debt=Sum('amount'))['total_debt'] or 0
-        total_paid = Debt.objects.filter(user=request.user, paid_off=True).aggregate(total_paid=Sum('amount'))['total_paid'] or 0
-        remaining_debt = total_debt - total_paid
-
-        summary = {
-            "total_debt": total_debt,
-            "total_paid": total_paid,
-            "remaining_debt": remaining_debt
-        }
+        summary = compute_debt_summary(request.user.id, user_currency(request.user))
         return Response(summary, status=status.HTTP_200_OK)
 
 
 class BudgetCategoryListCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @versioned("categories")
     def get(self, request):
-        categories = BudgetCategory.objects.filter(user=request.user)
-        serializer = BudgetCategorySerializer(categories, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        paginator = KeysetPagination(ordering_field="created_at")
+        queryset = BudgetCategorySerializer.optimize_queryset(BudgetCategory.objects.filter(user=request.user), extra_fields=[paginator.ordering_field])
+        data = BudgetCategorySerializer.paginated_data(queryset, paginator, request)
+        return paginator.get_paginated_response(data)
 
     def post(self, request):
         serializer = BudgetCategorySerializer(data=request.data)
@@ -314,15 +480,142 @@ class BudgetCategoryUpdateView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class CategorizationRuleListCreateView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @versioned("rules")
+    def get(self, request):
+        paginator = KeysetPagination(ordering_field="created_at")
+        queryset = CategorizationRuleSerializer.optimize_queryset(CategorizationRule.objects.filter(user=request.user), extra_fields=[paginator.ordering_field])
+        data = CategorizationRuleSerializer.paginated_data(queryset, paginator, request)
+        return paginator.get_paginated_response(data)
+
+    def post(self, request):
+        serializer = CategorizationRuleSerializer(data=request.data, context={"request": request})
+        if serializer.is_valid():
+            serializer.save(user=request.user)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class CategorizationRuleDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def put(self, request, rule_id):
+        rule = CategorizationRule.objects.filter(id=rule_id, user=request.user).first()
+        if not rule:
+            return Response({"error": "Rule not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = CategorizationRuleSerializer(rule, data=request.data, context={"request": request})
+        if serializer.is_valid():
+            serializer.save(user=request.user)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def delete(self, request, rule_id):
+        rule = CategorizationRule.objects.filter(id=rule_id, user=request.user).first()
+        if not rule:
+            return Response({"error": "Rule not found"}, status=status.HTTP_404_NOT_FOUND)
+        rule.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class NotificationListView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @versioned("notifications")
     def get(self, request):
         notifications = Notification.objects.filter(user=request.user, is_read=False)
         data = [{"id": n.id, "message": n.message, "created_at": n.created_at} for n in notifications]
         return Response(data, status=status.HTTP_200_OK)
 
 
+class NotificationStreamView(View):
+    """
+    Server-sent events carrying the user's new notifications as they are created.
+
+    Each connection is a coroutine waiting on a broker queue, so it needs an ASGI server.
+    EventSource cannot set headers, so the access token may also be passed as ?token=.
+    The unread backlog is sent first.
+
+    Notifications are published in commit order, not id order, so a connection tracks
+    the ids it has sent rather than the highest one. Each event id is "floor:ids": every
+    notification up to `floor` and the listed ids above it have been sent, so a
+    reconnecting client's Last-Event-ID resumes with exactly what it missed.
+    """
+    heartbeat_seconds = 15
+    backlog_size = 100
+    sent_window = 1000  # ids remembered per connection to drop repeats
+    resume_ids = 32  # sent ids listed in each event id; older ones are folded into the floor
+
+    async def get(self, request):
+        user = await sync_to_async(self.authenticate)(request)
+        if user is None:
+            return JsonResponse({"detail": "Authentication credentials were not provided or are invalid."}, status=401)
+        floor, seen = self.parse_event_id(request.headers.get("Last-Event-ID", ""))
+        response = StreamingHttpResponse(self.events(user.id, floor, seen), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def authenticate(self, request):
+        authentication = JWTAuthentication()
+        header = authentication.get_header(request)
+        try:
+            raw_token = authentication.get_raw_token(header) if header else request.GET.get("token", "").encode()
+            if not raw_token:
+                return None
+            return authentication.get_user(authentication.get_validated_token(raw_token))
+        except (InvalidToken, AuthenticationFailed):
+            return None
+
+    @classmethod
+    def parse_event_id(cls, value):
+        """(floor, ids above it) from a Last-Event-ID; a bare id is a floor."""
+        floor, _, ids = value.partition(":")
+        try:
+            floor, ids = int(floor or 0), sorted(int(sent_id) for sent_id in ids.split(",") if sent_id)
+        except ValueError:
+            return 0, set()
+        return floor, set(ids[-cls.resume_ids:])  # event ids never list more
+
+    async def events(self, user_id, floor=0, seen=()):
+        resumed_from = floor
+        sent = set(seen)
+        order = deque(sorted(sent), maxlen=self.sent_window)
+
+        def event(message):
+            nonlocal floor
+            if len(order) == order.maxlen:
+                sent.discard(order[0])
+            order.append(message["id"])
+            sent.add(message["id"])
+            listed = sorted(sent_id for sent_id in sent if sent_id > floor)
+            if len(listed) > self.resume_ids:
+                floor = listed[-self.resume_ids - 1]
+                listed = listed[-self.resume_ids:]
+            event_id = f"{floor}:{','.join(map(str, listed))}"
+            return f"id: {event_id}\nevent: notification\ndata: {json.dumps(message)}\n\n"
+
+        # Subscribe before reading the backlog so nothing created in between is lost.
+        async with get_broker().subscribe(notification_channel(user_id)) as queue:
+            backlog = (
+                Notification.objects.filter(user_id=user_id, is_read=False, id__gt=floor)
+                .exclude(id__in=sent).order_by("-id")
+            )
+            for notification in reversed([n async for n in backlog[:self.backlog_size]]):
+                yield event(notification_payload(notification))
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                # Late commits below the floor this connection advanced are still sent.
+                if message["id"] > resumed_from and message["id"] not in sent:
+                    yield event(message)
+
+
 class NotificationMarkReadView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -333,6 +626,14 @@ class NotificationMarkReadView(APIView):
 
         notifications = Notification.objects.filter(id__in=notification_ids, user=request.user, is_read=False)
         if notifications.exists():
-            notifications.update(is_read=True)
+            notifications.update(is_read=True, updated_at=Now())
+            bump_versions(request.user.id, "notifications")
             return Response({"message": "Notifications marked as read"}, status=status.HTTP_200_OK)
         return Response({"error": "No notifications found to mark as read"}, status=status.HTTP_404_NOT_FOUND)
+
+
+class MetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4")
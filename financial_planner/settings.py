@@ -58,9 +58,13 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': 100,
 }
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
+    'core.replicas.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -72,6 +76,36 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
 ]
 
+# Request profiling: fraction of requests run under cProfile, and the duration above
+# which a sampled request's pstats are written to PROFILE_DIR.
+PROFILE_SAMPLE_RATE = 0.0
+PROFILE_SLOW_REQUEST_MS = 500
+PROFILE_DIR = BASE_DIR / 'profiles'
+
+# Threads used to simulate goal probabilities in parallel; 1 simulates them one after another.
+GOAL_SIMULATION_WORKERS = 1
+
+# Render list pages from values() rows with precompiled field extractors instead of model
+# instances and serializer fields (see core.fast_serialization). The JSON is identical.
+FAST_SERIALIZATION = False
+
+# Currency exchange rates are quoted against (see core.currency and load_exchange_rates).
+BASE_CURRENCY = "USD"
+
+# Deleted-row markers for /sync/ are pruned after this many days; clients that have not
+# synced since are sent a full copy.
+SYNC_TOMBSTONE_RETENTION_DAYS = 90
+
+# Sync cursors stay this many seconds behind the clock, so rows and tombstones whose
+# timestamps were taken before a slow transaction committed are still sent. Must exceed
+# the longest write transaction; changes inside the window are sent again on later syncs.
+SYNC_SETTLE_SECONDS = 300
+
+# Fan-out for /notifications/stream/. LocalBroker only reaches connections served by the
+# same process; with several ASGI workers use core.broker.RedisBroker with {"url": ...}.
+NOTIFICATION_BROKER = 'core.broker.LocalBroker'
+NOTIFICATION_BROKER_OPTIONS = {}
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",  
 ]
@@ -98,6 +132,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'financial_planner.wsgi.application'
+ASGI_APPLICATION = 'financial_planner.asgi.application'
 
 
 # Database
@@ -114,6 +149,25 @@ DATABASES = {
     }
 }
 
+# Version tokens (core.versioning), cached summaries and replica pins have to be seen by
+# every worker process, so production needs a shared cache such as
+# django.core.cache.backends.redis.RedisCache; `check --deploy` warns otherwise.
+# The in-process cache below only suits a single development server.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Aliases in DATABASES that are streaming replicas of default. Safe requests read from
+# one of them unless its lag exceeds REPLICA_MAX_LAG_SECONDS or the user wrote within
+# the last REPLICA_PIN_SECONDS (see core.replicas). Empty reads everything from default.
+DATABASE_REPLICAS = []
+REPLICA_MAX_LAG_SECONDS = 5
+REPLICA_PIN_SECONDS = 10
+REPLICA_LAG_CHECK_SECONDS = 1
+DATABASE_ROUTERS = ['core.replicas.ReplicaRouter']
+
 
 
 # Password validation
@@ -9,12 +9,24 @@ from core.views import (
     BudgetListCreateView,
     GoalListCreateView,
     SpendingSummaryView,
+    DashboardView,
+    ForecastView,
+    MonthlyReportView,
+    SyncView,
+    SearchView,
     BulkGoalCreateView, 
+    GoalProbabilityView,
     IncomeListCreateView,
     ExpenseListCreateView,
-    DebtListCreateView,
+    BulkExpenseCreateView,
+    ImportTransactionsView,
+    ExportView,
+    DebtListCreateView, DebtPayoffPlanView,
     BudgetCategoryListCreateView,
+    CategorizationRuleListCreateView, CategorizationRuleDetailView,
     NotificationListView,
+    NotificationStreamView,
+    MetricsView,
     LoginView,
     RegisterView
 )
@@ -28,10 +40,24 @@ urlpatterns = [
     path('budget/', BudgetListCreateView.as_view(), name='budget-list-create'),
     path('goals/', GoalListCreateView.as_view(), name='goal-list-create'),
     path('goals/bulk-create/', BulkGoalCreateView.as_view(), name='bulk-goal-create'),
+    path('goals/probability/', GoalProbabilityView.as_view(), name='goal-probability'),
     path('spending-summary/', SpendingSummaryView.as_view(), name='spending-summary'),
+    path('dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('forecast/', ForecastView.as_view(), name='forecast'),
+    path('reports/monthly/', MonthlyReportView.as_view(), name='monthly-report'),
+    path('sync/', SyncView.as_view(), name='sync'),
+    path('search/', SearchView.as_view(), name='search'),
     path('income/', IncomeListCreateView.as_view(), name='income-list-create'),
     path('expenses/', ExpenseListCreateView.as_view(), name='expense-list-create'),
+    path('expenses/bulk-create/', BulkExpenseCreateView.as_view(), name='bulk-expense-create'),
+    path('transactions/import/', ImportTransactionsView.as_view(), name='transaction-import'),
+    path('export/', ExportView.as_view(), name='export'),
     path('debts/', DebtListCreateView.as_view(), name='debt-list-create'),
+    path('debts/payoff-plan/', DebtPayoffPlanView.as_view(), name='debt-payoff-plan'),
     path('categories/', BudgetCategoryListCreateView.as_view(), name='category-list-create'),
+    path('categorization-rules/', CategorizationRuleListCreateView.as_view(), name='categorization-rule-list-create'),
+    path('categorization-rules/<int:rule_id>/', CategorizationRuleDetailView.as_view(), name='categorization-rule-detail'),
     path('notifications/', NotificationListView.as_view(), name='notification-list'),
+    path('notifications/stream/', NotificationStreamView.as_view(), name='notification-stream'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
 ]